@@ -0,0 +1,111 @@
+"""Daily attendance records
+
+Revision ID: add_attendance
+Revises: add_cache_versions
+Create Date: 2025-08-26
+
+attendance_records is LIST-partitioned on academic_year_id like enrollments
+(app/services/partitions.py keeps one partition per year). The primary key
+(classroom_id, attendance_date, student_id, academic_year_id) is the upsert
+target for a section's daily submission and starts with the columns the
+section/day read filters on.
+
+Section rosters are cached in-process and versioned per section: row-level
+triggers bump cache_versions['section_rosters:<classroom id>'] for the
+classrooms whose enrollments, teacher assignments or year/active flag a
+write touched, so enrollment writes in different sections don't queue on one
+counter or stale each other's rosters (and gradebooks). Changing an academic
+year's dates bumps every section.
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_attendance'
+down_revision = 'add_cache_versions'
+branch_labels = None
+depends_on = None
+
+# (table, trigger events, classroom id column) feeding the section roster cache
+SECTION_ROSTER_SOURCES = (
+    ('enrollments', 'INSERT OR UPDATE OR DELETE', 'classroom_id'),
+    ('classroom_teacher_assignments', 'INSERT OR UPDATE OR DELETE', 'classroom_id'),
+    ('classrooms', 'INSERT OR UPDATE OF academic_year_id, is_active OR DELETE', 'id'),
+)
+
+
+def _partition_name(table, year_id, short_name):
+    # Keep in sync with app/services/partitions.py
+    slug = re.sub(r"[^a-z0-9]+", "_", (short_name or "").lower()).strip("_")
+    return f"{table}_y{slug}_{year_id.hex[:8]}"
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    op.execute("""
+        CREATE TABLE attendance_records (
+            classroom_id uuid NOT NULL REFERENCES classrooms(id) ON DELETE CASCADE,
+            attendance_date date NOT NULL,
+            student_id uuid NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+            academic_year_id uuid NOT NULL REFERENCES academic_years(id),
+            status varchar(10) NOT NULL CHECK (status IN ('PRESENT', 'ABSENT', 'TARDY', 'EXCUSED')),
+            minutes_late integer,
+            note varchar(200),
+            recorded_by uuid REFERENCES users(id) ON DELETE SET NULL,
+            recorded_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (classroom_id, attendance_date, student_id, academic_year_id)
+        ) PARTITION BY LIST (academic_year_id)
+    """)
+    op.create_index('ix_attendance_student_year', 'attendance_records',
+                    ['student_id', 'academic_year_id', 'attendance_date'])
+
+    op.execute("CREATE TABLE attendance_records_default PARTITION OF attendance_records DEFAULT")
+    years = conn.execute(sa.text("SELECT id, short_name FROM academic_years")).fetchall()
+    for year_id, short_name in years:
+        name = _partition_name('attendance_records', year_id, short_name)
+        op.execute(f"CREATE TABLE {name} PARTITION OF attendance_records FOR VALUES IN ('{year_id}')")
+
+    op.execute("INSERT INTO cache_versions (name) SELECT 'section_rosters:' || id FROM classrooms")
+    # Bumps '<TG_ARGV[0]>:<key>' for the key column TG_ARGV[1] of the old and new row
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_row_cache_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            ids uuid[] := ARRAY[]::uuid[];
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                ids := ids || (to_jsonb(OLD) ->> TG_ARGV[1])::uuid;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                ids := ids || (to_jsonb(NEW) ->> TG_ARGV[1])::uuid;
+            END IF;
+            PERFORM bump_keyed_cache_versions(TG_ARGV[0], ids);
+            RETURN NULL;
+        END
+        $$
+    """)
+    for table, events, key in SECTION_ROSTER_SOURCES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_section_rosters_version
+            AFTER {events} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION bump_row_cache_version('section_rosters', '{key}')
+        """)
+    op.execute("""
+        CREATE TRIGGER trg_academic_years_section_rosters_version
+        AFTER UPDATE OF start_date, end_date ON academic_years
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('section_rosters')
+    """)
+
+
+def downgrade():
+    for table, *_ in SECTION_ROSTER_SOURCES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_section_rosters_version ON {table}")
+    op.execute("DROP TRIGGER IF EXISTS trg_academic_years_section_rosters_version ON academic_years")
+    op.execute("DROP FUNCTION IF EXISTS bump_row_cache_version()")
+    op.execute("DELETE FROM cache_versions WHERE name LIKE 'section_rosters:%'")
+    # Dropping the parent drops every attached partition with it
+    op.drop_table('attendance_records')
@@ -0,0 +1,55 @@
+"""Attendance rollup counters on student academic records
+
+Revision ID: add_attendance_rollups
+Revises: add_attendance
+Create Date: 2025-08-27
+
+Per-status counters maintained incrementally by attendance submissions
+(app/services/attendance.py) next to the attendance_rate they produce, with
+an index that turns chronic-absence lists into a range scan.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_attendance_rollups'
+down_revision = 'add_attendance'
+branch_labels = None
+depends_on = None
+
+COUNTERS = ('attendance_present', 'attendance_absent', 'attendance_tardy', 'attendance_excused')
+
+
+def upgrade():
+    for column in COUNTERS:
+        op.add_column('student_academic_records',
+                      sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_academic_records_attendance_rate', 'student_academic_records',
+                    ['academic_year_id', 'school_id', 'attendance_rate'])
+
+    op.execute("""
+        UPDATE student_academic_records sar
+        SET attendance_present = c.present,
+            attendance_absent = c.absent,
+            attendance_tardy = c.tardy,
+            attendance_excused = c.excused,
+            attendance_rate = round(100.0 * (c.present + c.tardy) / (c.present + c.absent + c.tardy + c.excused), 2)
+        FROM (
+            SELECT student_id, academic_year_id,
+                   count(*) FILTER (WHERE status = 'PRESENT') AS present,
+                   count(*) FILTER (WHERE status = 'ABSENT') AS absent,
+                   count(*) FILTER (WHERE status = 'TARDY') AS tardy,
+                   count(*) FILTER (WHERE status = 'EXCUSED') AS excused
+            FROM attendance_records
+            GROUP BY student_id, academic_year_id
+        ) c
+        WHERE sar.student_id = c.student_id
+          AND sar.academic_year_id = c.academic_year_id
+          AND sar.is_active
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_academic_records_attendance_rate', table_name='student_academic_records')
+    for column in COUNTERS:
+        op.drop_column('student_academic_records', column)
@@ -0,0 +1,120 @@
+"""Cache version counters bumped by triggers
+
+Revision ID: add_cache_versions
+Revises: add_jobs
+Create Date: 2025-08-25
+
+In-process caches (app/services/emergency_contacts.py) compare a counter in
+cache_versions before serving, so a write from any process or script
+invalidates them everywhere. The emergency contact index is versioned per
+school ('emergency_contacts:<school id>'): row-level triggers resolve each
+written row to the schools whose active-year students it shows up under and
+bump only those, so a write at one school neither stales nor locks the
+others. Updates only bump when they set a column the cache reads, so logins
+(last_login_at), attendance rollups and GPA write-backs on
+student_academic_records don't churn it. Activating an academic year changes
+every school's roster and bumps them all.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_cache_versions'
+down_revision = 'add_jobs'
+branch_labels = None
+depends_on = None
+
+# (table, trigger events, key column, what the key is) feeding the emergency
+# contact index; the trigger resolves the key to the schools it affects
+EMERGENCY_CONTACT_SOURCES = (
+    ('parent_student_relationships', 'INSERT OR UPDATE OR DELETE', 'student_id', 'student'),
+    ('parents', 'INSERT OR UPDATE OR DELETE', 'id', 'parent'),
+    ('student_academic_records',
+     'INSERT OR UPDATE OF student_id, school_id, academic_year_id, grade_level, is_active OR DELETE',
+     'school_id', 'school'),
+    ('students', 'UPDATE OF first_name, last_name, student_id, is_active OR DELETE', 'id', 'student'),
+    ('users', 'UPDATE OF first_name, last_name, email OR DELETE', 'id', 'user'),
+)
+
+
+def upgrade():
+    op.create_table('cache_versions',
+        sa.Column('name', sa.String(64), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    op.execute("INSERT INTO cache_versions (name) SELECT 'emergency_contacts:' || id FROM schools")
+
+    # Bumps a cache's counter and every per-key counter under it ('<name>:...')
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_cache_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE cache_versions SET version = version + 1
+            WHERE name = TG_ARGV[0] OR name LIKE TG_ARGV[0] || ':%';
+            RETURN NULL;
+        END
+        $$
+    """)
+    # Per-key counters are created on first write; keys are locked in order
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_keyed_cache_versions(cache text, keys uuid[]) RETURNS void
+        LANGUAGE sql AS $$
+            INSERT INTO cache_versions (name, version)
+            SELECT cache || ':' || k, 1
+            FROM (SELECT DISTINCT k FROM unnest(keys) AS k WHERE k IS NOT NULL) AS ks
+            ORDER BY k
+            ON CONFLICT (name) DO UPDATE SET version = cache_versions.version + 1
+        $$
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_emergency_contacts_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            ids uuid[] := ARRAY[]::uuid[];
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                ids := ids || (to_jsonb(OLD) ->> TG_ARGV[0])::uuid;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                ids := ids || (to_jsonb(NEW) ->> TG_ARGV[0])::uuid;
+            END IF;
+            -- TG_ARGV[1] rather than TG_TABLE_NAME, which names the partition
+            IF TG_ARGV[1] = 'user' THEN
+                ids := ARRAY(SELECT id FROM parents WHERE user_id = ANY(ids));
+            END IF;
+            IF TG_ARGV[1] IN ('user', 'parent') THEN
+                ids := ARRAY(SELECT student_id FROM parent_student_relationships WHERE parent_id = ANY(ids));
+            END IF;
+            IF TG_ARGV[1] <> 'school' THEN
+                ids := ARRAY(
+                    SELECT r.school_id FROM student_academic_records r
+                    JOIN academic_years y ON y.id = r.academic_year_id AND y.is_active
+                    WHERE r.student_id = ANY(ids)
+                );
+            END IF;
+            PERFORM bump_keyed_cache_versions('emergency_contacts', ids);
+            RETURN NULL;
+        END
+        $$
+    """)
+    for table, events, key, kind in EMERGENCY_CONTACT_SOURCES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_emergency_contacts_version
+            AFTER {events} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION bump_emergency_contacts_version('{key}', '{kind}')
+        """)
+    op.execute("""
+        CREATE TRIGGER trg_academic_years_emergency_contacts_version
+        AFTER UPDATE OF is_active ON academic_years
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('emergency_contacts')
+    """)
+
+
+def downgrade():
+    for table, *_ in EMERGENCY_CONTACT_SOURCES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_emergency_contacts_version ON {table}")
+    op.execute("DROP TRIGGER IF EXISTS trg_academic_years_emergency_contacts_version ON academic_years")
+    op.execute("DROP FUNCTION IF EXISTS bump_emergency_contacts_version()")
+    op.execute("DROP FUNCTION IF EXISTS bump_keyed_cache_versions(text, uuid[])")
+    op.execute("DROP FUNCTION IF EXISTS bump_cache_version()")
+    op.drop_table('cache_versions')
@@ -0,0 +1,26 @@
+"""Indexes for delta sync and change event pruning
+
+Revision ID: add_change_event_sync_indexes
+Revises: add_change_events
+Create Date: 2025-09-02
+
+Delta-sync requests (app/services/sync.py) look up one entity's events from
+a transaction id onwards; the pruner deletes events by age.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_change_event_sync_indexes'
+down_revision = 'add_change_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_change_events_entity_txid', 'change_events', ['entity', 'txid'])
+    op.create_index('ix_change_events_created_at', 'change_events', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_change_events_created_at', table_name='change_events')
+    op.drop_index('ix_change_events_entity_txid', table_name='change_events')
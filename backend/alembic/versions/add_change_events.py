@@ -0,0 +1,150 @@
+"""Change event outbox with LISTEN/NOTIFY
+
+Revision ID: add_change_events
+Revises: add_school_scope_indexes
+Create Date: 2025-09-01
+
+Statement-level triggers on the tracked tables insert a change_events row
+per written row in the writing transaction (see app/change_feed.py), so
+ORM flushes, Core insert()/update() and raw SQL (bulk homerooms, rollover,
+year activation, attendance) are all recorded. Updates that leave a row's
+compared columns alone record nothing; a row that moved to another owner or
+school is recorded under both the old and the new one.
+
+A statement-level trigger on change_events sends one NOTIFY per insert
+statement carrying the transaction id and the id range it wrote; Postgres
+delivers it only on commit, so each API worker's listener fetches exactly
+the committed events and evicts what they touch from its caches.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = 'add_change_events'
+down_revision = 'add_school_scope_indexes'
+branch_labels = None
+depends_on = None
+
+CHANNEL = 'change_events'  # keep in sync with app/change_feed.py
+
+# Table -> (key, owner, school, compared columns) as SQL over a row `r`.
+# Composite keys are joined by ':'. Updates that change none of the compared
+# columns (the whole row when None) are not recorded.
+TRACKED = {
+    'academic_years': ("r.id", "NULL", "NULL", None),
+    'classrooms': ("r.id", "NULL", "r.school_id", None),
+    'classroom_teacher_assignments': ("r.id", "r.classroom_id", "NULL", None),
+    'enrollments': ("r.id", "r.classroom_id", "NULL", None),
+    'rooms': ("r.id", "NULL", "r.school_id", None),
+    'schools': ("r.id", "NULL", "r.id", None),
+    'students': ("r.id", "NULL", "NULL", None),
+    # not the attendance and GPA rollups, rewritten on every submission
+    'student_academic_records': (
+        "r.id", "r.student_id", "r.school_id",
+        "r.student_id, r.school_id, r.academic_year_id, r.grade_level, r.program_type, r.promotion_status, "
+        "r.enrollment_date, r.withdrawal_date, r.withdrawal_reason, r.is_active",
+    ),
+    'subjects': ("r.id", "NULL", "NULL", None),
+    # not last_login_at / last_used_at, written on every login
+    'users': ("r.id", "NULL", "NULL", "r.email, r.first_name, r.last_name, r.is_active, r.permissions"),
+    'user_roles': ("r.user_id || ':' || r.role || ':' || r.school_id", "r.user_id", "r.school_id", "r.is_active, r.permissions"),
+}
+EVENTS = ('insert', 'update', 'delete')
+
+
+def _literal(sql):
+    return "'" + sql.replace("'", "''") + "'"
+
+
+def upgrade():
+    op.create_table('change_events',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=False), primary_key=True),
+        sa.Column('txid', sa.BigInteger(), nullable=False, server_default=sa.text('txid_current()')),
+        sa.Column('entity', sa.String(50), nullable=False),
+        sa.Column('entity_id', sa.String(100), nullable=False),
+        sa.Column('op', sa.String(10), nullable=False),
+        sa.Column('owner_id', sa.String(100), nullable=True),
+        sa.Column('school_id', UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+    )
+    op.create_index('ix_change_events_entity', 'change_events', ['entity', 'id'])
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_change_events() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('{CHANNEL}', json_build_object(
+                'txid', txid_current(), 'first', min(id), 'last', max(id)
+            )::text)
+            FROM inserted
+            HAVING count(*) > 0;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_change_events_notify
+        AFTER INSERT ON change_events
+        REFERENCING NEW TABLE AS inserted
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_change_events()
+    """)
+
+    # TG_ARGV: the TRACKED entry of the table. Transition tables rule out
+    # UPDATE OF column lists, so updates compare old and new rows instead.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_change_events() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            projection text := format(
+                'SELECT (%s)::text AS k, (%s)::text AS owner_id, (%s)::uuid AS school_id, (%s)::text AS cmp FROM ',
+                TG_ARGV[0], TG_ARGV[1], TG_ARGV[2], COALESCE('ROW(' || TG_ARGV[3] || ')', 'r')
+            );
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                EXECUTE format($sql$
+                    INSERT INTO change_events (entity, entity_id, op, owner_id, school_id)
+                    SELECT %1$L, n.k, 'update', n.owner_id, n.school_id
+                    FROM (%2$s) n LEFT JOIN (%3$s) o ON o.k = n.k
+                    WHERE o.k IS NULL OR o.cmp IS DISTINCT FROM n.cmp
+                    UNION
+                    SELECT %1$L, o.k, 'update', o.owner_id, o.school_id
+                    FROM (%3$s) o LEFT JOIN (%2$s) n ON n.k = o.k
+                    WHERE n.k IS NULL OR (o.owner_id, o.school_id) IS DISTINCT FROM (n.owner_id, n.school_id)
+                $sql$, TG_TABLE_NAME, projection || 'new_rows r', projection || 'old_rows r');
+            ELSE
+                EXECUTE format($sql$
+                    INSERT INTO change_events (entity, entity_id, op, owner_id, school_id)
+                    SELECT %L, k, %L, owner_id, school_id FROM (%s) t
+                $sql$, TG_TABLE_NAME, lower(TG_OP),
+                    projection || CASE TG_OP WHEN 'INSERT' THEN 'new_rows r' ELSE 'old_rows r' END);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for table, entry in TRACKED.items():
+        args = ", ".join(_literal(arg) for arg in entry if arg is not None)
+        for event in EVENTS:
+            transition = {
+                'insert': "NEW TABLE AS new_rows",
+                'update': "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+                'delete': "OLD TABLE AS old_rows",
+            }[event]
+            op.execute(f"""
+                CREATE TRIGGER trg_{table}_change_events_{event}
+                AFTER {event.upper()} ON {table}
+                REFERENCING {transition}
+                FOR EACH STATEMENT EXECUTE FUNCTION record_change_events({args})
+            """)
+
+
+def downgrade():
+    for table in TRACKED:
+        for event in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_change_events_{event} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS record_change_events()")
+    op.execute("DROP TRIGGER IF EXISTS trg_change_events_notify ON change_events")
+    op.execute("DROP FUNCTION IF EXISTS notify_change_events()")
+    op.drop_index('ix_change_events_entity', table_name='change_events')
+    op.drop_table('change_events')
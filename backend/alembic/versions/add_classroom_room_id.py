@@ -0,0 +1,26 @@
+"""Add room assignment to classrooms
+
+Revision ID: add_classroom_room_id
+Revises: phase_a_foundation_corrected
+Create Date: 2025-08-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = 'add_classroom_room_id'
+down_revision = 'phase_a_foundation_corrected'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('classrooms', sa.Column('room_id', UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key('fk_classrooms_room', 'classrooms', 'rooms', ['room_id'], ['id'], ondelete='SET NULL')
+    op.create_index('ix_classrooms_room_id', 'classrooms', ['room_id'])
+
+def downgrade():
+    op.drop_index('ix_classrooms_room_id', table_name='classrooms')
+    op.drop_constraint('fk_classrooms_room', 'classrooms', type_='foreignkey')
+    op.drop_column('classrooms', 'room_id')
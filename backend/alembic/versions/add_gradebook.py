@@ -0,0 +1,71 @@
+"""Gradebook: weighted categories, assignments and scores
+
+Revision ID: add_gradebook
+Revises: add_attendance_rollups
+Create Date: 2025-08-28
+
+gradebook_versions holds one counter per section, bumped in the same
+transaction as every gradebook write, so app/services/gradebook.py can tell
+whether its cached matrix for a section is current with one primary-key read.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = 'add_gradebook'
+down_revision = 'add_attendance_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('grade_categories',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('classroom_id', UUID(as_uuid=True), sa.ForeignKey('classrooms.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('name', sa.String(50), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False, server_default='0'),
+        sa.UniqueConstraint('classroom_id', 'name', name='uq_grade_categories_classroom_name'),
+        sa.CheckConstraint('weight >= 0', name='ck_grade_categories_weight'),
+    )
+
+    op.create_table('assignments',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('classroom_id', UUID(as_uuid=True), sa.ForeignKey('classrooms.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('category_id', UUID(as_uuid=True), sa.ForeignKey('grade_categories.id'), nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('points_possible', sa.Float(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+        sa.Column('created_by', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.CheckConstraint('points_possible > 0', name='ck_assignments_points_possible'),
+    )
+    op.create_index('ix_assignments_classroom', 'assignments', ['classroom_id', 'due_date'])
+
+    op.create_table('assignment_scores',
+        sa.Column('assignment_id', UUID(as_uuid=True), sa.ForeignKey('assignments.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('student_id', UUID(as_uuid=True), sa.ForeignKey('students.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('points', sa.Float(), nullable=True),
+        sa.Column('is_excused', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+        sa.Column('is_missing', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+        sa.Column('graded_by', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.CheckConstraint('points IS NULL OR points >= 0', name='ck_assignment_scores_points'),
+    )
+    op.create_index('ix_assignment_scores_student', 'assignment_scores', ['student_id'])
+
+    op.create_table('gradebook_versions',
+        sa.Column('classroom_id', UUID(as_uuid=True), sa.ForeignKey('classrooms.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade():
+    op.drop_table('gradebook_versions')
+    op.drop_index('ix_assignment_scores_student', table_name='assignment_scores')
+    op.drop_table('assignment_scores')
+    op.drop_index('ix_assignments_classroom', table_name='assignments')
+    op.drop_table('assignments')
+    op.drop_table('grade_categories')
@@ -0,0 +1,59 @@
+"""Background job table
+
+Revision ID: add_jobs
+Revises: add_role_permissions
+Create Date: 2025-08-24
+
+Postgres-backed queue for app/jobs.py. Runners claim queued rows with
+SELECT ... FOR UPDATE SKIP LOCKED, so the partial index on queued rows is the
+only thing the claim query needs to touch.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+# revision identifiers, used by Alembic.
+revision = 'add_jobs'
+down_revision = 'add_role_permissions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('params', JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('progress_done', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('progress_total', sa.Integer(), nullable=True),
+        sa.Column('progress_message', sa.String(200), nullable=True),
+        sa.Column('result', JSONB, nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('worker_id', sa.String(100), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_by', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')",
+            name='ck_jobs_status',
+        ),
+    )
+    op.create_index('ix_jobs_queued', 'jobs', ['run_after', 'created_at'],
+                    postgresql_where=sa.text("status = 'queued'"))
+    op.create_index('ix_jobs_running_heartbeat', 'jobs', ['heartbeat_at'],
+                    postgresql_where=sa.text("status = 'running'"))
+    op.create_index('ix_jobs_created_by', 'jobs', ['created_by', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_created_by', table_name='jobs')
+    op.drop_index('ix_jobs_running_heartbeat', table_name='jobs')
+    op.drop_index('ix_jobs_queued', table_name='jobs')
+    op.drop_table('jobs')
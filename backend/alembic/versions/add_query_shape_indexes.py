@@ -0,0 +1,65 @@
+"""Composite, partial and trigram indexes for hot router queries
+
+Revision ID: add_query_shape_indexes
+Revises: partition_enrollments_by_year
+Create Date: 2025-08-20
+
+Each index follows a query in deps.py, dashboard.py, classrooms.py or rooms.py.
+Almost every query filters on is_active = true, so most indexes are partial
+on it and skip inactive history entirely. Checked by scripts/check_query_plans.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_query_shape_indexes'
+down_revision = 'partition_enrollments_by_year'
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text('is_active')
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # deps.require_admin / require_role: user_id = ? AND is_active
+    op.create_index('ix_user_roles_user_active', 'user_roles', ['user_id', 'role'], postgresql_where=ACTIVE)
+    # dashboard colleagues/admins: school_id IN (...) AND role ILIKE ... AND is_active
+    op.create_index('ix_user_roles_school_role_active', 'user_roles', ['school_id', 'role'], postgresql_where=ACTIVE)
+    # admin.list_teachers / dashboard: role ILIKE '%teacher%' (leading wildcard needs trigrams)
+    op.create_index(
+        'ix_user_roles_role_trgm', 'user_roles', ['role'],
+        postgresql_using='gin', postgresql_ops={'role': 'gin_trgm_ops'}, postgresql_where=ACTIVE,
+    )
+
+    # list_classrooms enrollment counts / teacher_overview roster (created on every partition)
+    op.create_index('ix_enrollments_classroom_active', 'enrollments', ['classroom_id', 'student_id'], postgresql_where=ACTIVE)
+
+    # list_classrooms / homeroom bulk create: academic_year_id = ? AND grade_level = ?
+    op.create_index('ix_classrooms_year_grade', 'classrooms', ['academic_year_id', 'grade_level'])
+    # rooms "in use" subqueries: room_id IS NOT NULL AND is_active
+    op.create_index(
+        'ix_classrooms_room_active', 'classrooms', ['room_id'],
+        postgresql_where=sa.text('is_active AND room_id IS NOT NULL'),
+    )
+
+    # room code uniqueness checks and per-school listings
+    op.create_index('ix_rooms_school_code_active', 'rooms', ['school_id', 'room_code'], postgresql_where=ACTIVE)
+
+    # teacher -> classrooms lookups
+    op.create_index(
+        'ix_cta_teacher_classroom_active', 'classroom_teacher_assignments',
+        ['teacher_user_id', 'classroom_id'], postgresql_where=ACTIVE,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_cta_teacher_classroom_active', table_name='classroom_teacher_assignments')
+    op.drop_index('ix_rooms_school_code_active', table_name='rooms')
+    op.drop_index('ix_classrooms_room_active', table_name='classrooms')
+    op.drop_index('ix_classrooms_year_grade', table_name='classrooms')
+    op.drop_index('ix_enrollments_classroom_active', table_name='enrollments')
+    op.drop_index('ix_user_roles_role_trgm', table_name='user_roles')
+    op.drop_index('ix_user_roles_school_role_active', table_name='user_roles')
+    op.drop_index('ix_user_roles_user_active', table_name='user_roles')
@@ -0,0 +1,112 @@
+"""Permission bitmask for user roles
+
+Revision ID: add_role_permissions
+Revises: add_query_shape_indexes
+Create Date: 2025-08-21
+
+user_roles.permissions holds the bits for the role name (see app/permissions.py)
+and users.permissions the OR of a user's active roles. Triggers keep both in
+sync for writes that bypass the ORM (scripts, manual SQL).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_role_permissions'
+down_revision = 'add_query_shape_indexes'
+branch_labels = None
+depends_on = None
+
+# Permission bits, frozen from app/permissions.py
+TEACHER, ADMIN, PARENT = 1, 2, 4
+
+
+def upgrade():
+    op.add_column('user_roles', sa.Column('permissions', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('permissions', sa.Integer(), nullable=False, server_default='0'))
+
+    # Same substring rules as app.permissions.permissions_for_role
+    op.execute("""
+        CREATE OR REPLACE FUNCTION role_permissions(role text) RETURNS integer
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT (CASE WHEN lower(role) LIKE '%teacher%' THEN 1 ELSE 0 END)
+                 | (CASE WHEN lower(role) LIKE '%admin%' THEN 2 ELSE 0 END)
+                 | (CASE WHEN lower(role) LIKE '%parent%' THEN 4 ELSE 0 END)
+                 | (CASE WHEN lower(role) LIKE '%student%' THEN 8 ELSE 0 END)
+        $$
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_roles_set_permissions() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.permissions := role_permissions(NEW.role);
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_user_roles_set_permissions
+        BEFORE INSERT OR UPDATE OF role ON user_roles
+        FOR EACH ROW EXECUTE FUNCTION user_roles_set_permissions()
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_user_permissions() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                UPDATE users SET permissions = COALESCE(
+                    (SELECT bit_or(permissions) FROM user_roles WHERE user_id = OLD.user_id AND is_active), 0)
+                WHERE id = OLD.user_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                UPDATE users SET permissions = COALESCE(
+                    (SELECT bit_or(permissions) FROM user_roles WHERE user_id = NEW.user_id AND is_active), 0)
+                WHERE id = NEW.user_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_user_roles_refresh_user_permissions
+        AFTER INSERT OR UPDATE OR DELETE ON user_roles
+        FOR EACH ROW EXECUTE FUNCTION refresh_user_permissions()
+    """)
+
+    # Backfill
+    op.execute("UPDATE user_roles SET permissions = role_permissions(role)")
+    op.execute("""
+        UPDATE users u SET permissions = COALESCE(
+            (SELECT bit_or(ur.permissions) FROM user_roles ur WHERE ur.user_id = u.id AND ur.is_active), 0)
+    """)
+
+    # Role lookups by school (dashboard colleagues/admins, admin.list_teachers).
+    # The predicates must match app.permissions.has_permission exactly.
+    for name, bit in (('teachers', TEACHER), ('admins', ADMIN), ('parents', PARENT)):
+        op.create_index(
+            f'ix_user_roles_{name}', 'user_roles', ['school_id', 'user_id'],
+            postgresql_where=sa.text(f'is_active AND (permissions & {bit}) <> 0'),
+        )
+
+    # Role names are no longer pattern-matched
+    op.drop_index('ix_user_roles_role_trgm', table_name='user_roles')
+
+
+def downgrade():
+    op.create_index(
+        'ix_user_roles_role_trgm', 'user_roles', ['role'],
+        postgresql_using='gin', postgresql_ops={'role': 'gin_trgm_ops'}, postgresql_where=sa.text('is_active'),
+    )
+    for name in ('parents', 'admins', 'teachers'):
+        op.drop_index(f'ix_user_roles_{name}', table_name='user_roles')
+
+    op.execute("DROP TRIGGER IF EXISTS trg_user_roles_refresh_user_permissions ON user_roles")
+    op.execute("DROP TRIGGER IF EXISTS trg_user_roles_set_permissions ON user_roles")
+    op.execute("DROP FUNCTION IF EXISTS refresh_user_permissions()")
+    op.execute("DROP FUNCTION IF EXISTS user_roles_set_permissions()")
+    op.execute("DROP FUNCTION IF EXISTS role_permissions(text)")
+
+    op.drop_column('users', 'permissions')
+    op.drop_column('user_roles', 'permissions')
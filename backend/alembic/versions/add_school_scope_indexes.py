@@ -0,0 +1,27 @@
+"""Indexes for school-scoped requests
+
+Revision ID: add_school_scope_indexes
+Revises: add_teacher_student_access
+Create Date: 2025-08-31
+
+With a request scoped to a school (app/tenancy.py), student queries are
+limited to students with an academic record at that school; this index
+answers that semi-join. Rooms and user roles already lead with school_id.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_school_scope_indexes'
+down_revision = 'add_teacher_student_access'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_academic_records_school_student', 'student_academic_records', ['school_id', 'student_id'])
+    op.create_index('ix_special_needs_tag_library_school', 'special_needs_tag_library', ['school_id'])
+
+
+def downgrade():
+    op.drop_index('ix_special_needs_tag_library_school', table_name='special_needs_tag_library')
+    op.drop_index('ix_academic_records_school_student', table_name='student_academic_records')
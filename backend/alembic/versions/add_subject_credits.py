@@ -0,0 +1,27 @@
+"""Subject credit values for GPA and credits earned
+
+Revision ID: add_subject_credits
+Revises: add_gradebook
+Create Date: 2025-08-29
+
+The gpa_recompute job (app/services/gpa.py) weights each section's grade
+points by its subject's credits and awards them for a passing grade.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_subject_credits'
+down_revision = 'add_gradebook'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('subjects', sa.Column('credits', sa.Float(), nullable=False, server_default='1'))
+    op.create_check_constraint('ck_subjects_credits', 'subjects', 'credits >= 0')
+
+
+def downgrade():
+    op.drop_constraint('ck_subjects_credits', 'subjects', type_='check')
+    op.drop_column('subjects', 'credits')
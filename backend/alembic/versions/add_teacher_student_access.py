@@ -0,0 +1,150 @@
+"""Teacher -> student access projection
+
+Revision ID: add_teacher_student_access
+Revises: add_subject_credits
+Create Date: 2025-08-30
+
+teacher_student_access has a row per (teacher, student, section) where the
+teacher's assignment, the student's enrollment and the section are all
+active, so "does this teacher teach this student" is one primary-key prefix
+lookup and a teacher's students are an index range scan.
+
+Row triggers rebuild the affected rows from the source tables on every
+write: per (section, student) for enrollments, per section for teacher
+assignments and classroom activation. Rebuilding rather than patching keeps
+each trigger trivially correct whatever combination of columns changed.
+A rebuild takes a transaction-level advisory lock on its section first, so
+an enrollment and a teacher assignment written concurrently to the same
+section rebuild one after the other and the second sees the first's rows
+(each statement reads the latest commits under READ COMMITTED) instead of
+both missing the (teacher, student) pair.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = 'add_teacher_student_access'
+down_revision = 'add_subject_credits'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('teacher_student_access',
+        sa.Column('teacher_user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('student_id', UUID(as_uuid=True), sa.ForeignKey('students.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('classroom_id', UUID(as_uuid=True), sa.ForeignKey('classrooms.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('academic_year_id', UUID(as_uuid=True), sa.ForeignKey('academic_years.id'), nullable=False),
+    )
+    op.create_index('ix_teacher_student_access_classroom', 'teacher_student_access', ['classroom_id', 'student_id'])
+
+    # NULL p_student_id rebuilds the whole section
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_teacher_student_access(p_classroom_id uuid, p_student_id uuid)
+        RETURNS void LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtextextended('teacher_student_access:' || p_classroom_id::text, 0));
+
+            DELETE FROM teacher_student_access
+            WHERE classroom_id = p_classroom_id
+              AND (p_student_id IS NULL OR student_id = p_student_id);
+
+            INSERT INTO teacher_student_access (teacher_user_id, student_id, classroom_id, academic_year_id)
+            SELECT DISTINCT cta.teacher_user_id, e.student_id, e.classroom_id, e.academic_year_id
+            FROM enrollments e
+            JOIN classrooms c ON c.id = e.classroom_id AND c.is_active
+            JOIN classroom_teacher_assignments cta ON cta.classroom_id = e.classroom_id AND cta.is_active
+            WHERE e.classroom_id = p_classroom_id
+              AND (p_student_id IS NULL OR e.student_id = p_student_id)
+              AND e.academic_year_id = c.academic_year_id
+              AND e.is_active
+              AND e.enrollment_status = 'ACTIVE'
+            ON CONFLICT DO NOTHING;
+        END
+        $$
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION enrollments_teacher_student_access() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM refresh_teacher_student_access(OLD.classroom_id, OLD.student_id);
+            END IF;
+            IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE'
+                    AND (NEW.classroom_id, NEW.student_id) IS DISTINCT FROM (OLD.classroom_id, OLD.student_id)) THEN
+                PERFORM refresh_teacher_student_access(NEW.classroom_id, NEW.student_id);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_enrollments_teacher_student_access
+        AFTER INSERT OR UPDATE OF student_id, classroom_id, academic_year_id, is_active, enrollment_status OR DELETE
+        ON enrollments
+        FOR EACH ROW EXECUTE FUNCTION enrollments_teacher_student_access()
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION assignments_teacher_student_access() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM refresh_teacher_student_access(OLD.classroom_id, NULL);
+            END IF;
+            IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.classroom_id IS DISTINCT FROM OLD.classroom_id) THEN
+                PERFORM refresh_teacher_student_access(NEW.classroom_id, NULL);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_classroom_teacher_assignments_teacher_student_access
+        AFTER INSERT OR UPDATE OF classroom_id, teacher_user_id, is_active OR DELETE
+        ON classroom_teacher_assignments
+        FOR EACH ROW EXECUTE FUNCTION assignments_teacher_student_access()
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION classrooms_teacher_student_access() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM refresh_teacher_student_access(NEW.id, NULL);
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_classrooms_teacher_student_access
+        AFTER UPDATE OF is_active, academic_year_id ON classrooms
+        FOR EACH ROW WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active
+                           OR OLD.academic_year_id IS DISTINCT FROM NEW.academic_year_id)
+        EXECUTE FUNCTION classrooms_teacher_student_access()
+    """)
+
+    # Backfill
+    op.execute("""
+        INSERT INTO teacher_student_access (teacher_user_id, student_id, classroom_id, academic_year_id)
+        SELECT DISTINCT cta.teacher_user_id, e.student_id, e.classroom_id, e.academic_year_id
+        FROM enrollments e
+        JOIN classrooms c ON c.id = e.classroom_id AND c.is_active
+        JOIN classroom_teacher_assignments cta ON cta.classroom_id = e.classroom_id AND cta.is_active
+        WHERE e.academic_year_id = c.academic_year_id
+          AND e.is_active
+          AND e.enrollment_status = 'ACTIVE'
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_classrooms_teacher_student_access ON classrooms")
+    op.execute("DROP TRIGGER IF EXISTS trg_classroom_teacher_assignments_teacher_student_access ON classroom_teacher_assignments")
+    op.execute("DROP TRIGGER IF EXISTS trg_enrollments_teacher_student_access ON enrollments")
+    op.execute("DROP FUNCTION IF EXISTS classrooms_teacher_student_access()")
+    op.execute("DROP FUNCTION IF EXISTS assignments_teacher_student_access()")
+    op.execute("DROP FUNCTION IF EXISTS enrollments_teacher_student_access()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_teacher_student_access(uuid, uuid)")
+    op.drop_index('ix_teacher_student_access_classroom', table_name='teacher_student_access')
+    op.drop_table('teacher_student_access')
@@ -0,0 +1,211 @@
+"""Partition enrollments and student academic records by academic year
+
+Revision ID: partition_enrollments_by_year
+Revises: add_classroom_room_id
+Create Date: 2025-08-19
+
+Both tables become LIST-partitioned on academic_year_id (one partition per
+academic year plus a default). enrollments gains academic_year_id, copied
+from its classroom, and is rebuilt with the columns the Enrollment model maps.
+Primary keys become (id, academic_year_id) since Postgres requires the
+partition key in every unique constraint; for the same reason a student is
+enrolled once per classroom via (classroom_id, student_id, academic_year_id),
+a classroom belonging to a single year. Legacy rows that enrolled a student in
+the same classroom more than once are deduplicated: the active, most recently
+updated row is kept and the others are moved to enrollments_duplicates_archive
+rather than dropped, so they can be reviewed; downgrade restores them.
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = 'partition_enrollments_by_year'
+down_revision = 'add_classroom_room_id'
+branch_labels = None
+depends_on = None
+
+TABLES = ('enrollments', 'student_academic_records')
+
+
+def _partition_name(table, year_id, short_name):
+    # Keep in sync with app/services/partitions.py
+    slug = re.sub(r"[^a-z0-9]+", "_", (short_name or "").lower()).strip("_")
+    return f"{table}_y{slug}_{year_id.hex[:8]}"
+
+
+def _create_enrollments():
+    op.execute("""
+        CREATE TABLE enrollments (
+            id uuid NOT NULL,
+            student_id uuid NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+            classroom_id uuid NOT NULL REFERENCES classrooms(id) ON DELETE CASCADE,
+            academic_year_id uuid NOT NULL REFERENCES academic_years(id),
+            school_year_id uuid REFERENCES school_years(id) ON DELETE SET NULL,
+            enrollment_date date NOT NULL DEFAULT CURRENT_DATE,
+            withdrawal_date date,
+            enrollment_status varchar(20) NOT NULL DEFAULT 'ACTIVE',
+            withdrawal_reason varchar(100),
+            is_audit_only boolean NOT NULL DEFAULT false,
+            requires_accommodation boolean NOT NULL DEFAULT false,
+            enrolled_by uuid REFERENCES users(id),
+            is_active boolean NOT NULL DEFAULT true,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, academic_year_id),
+            CONSTRAINT uq_classroom_student_year UNIQUE (classroom_id, student_id, academic_year_id)
+        ) PARTITION BY LIST (academic_year_id)
+    """)
+    op.create_index('ix_enrollments_classroom_id', 'enrollments', ['classroom_id'])
+    op.create_index('ix_enrollments_student_id', 'enrollments', ['student_id'])
+    # Backs the ON DELETE SET NULL from school_years, which would otherwise scan every partition
+    op.create_index('ix_enrollments_school_year_id', 'enrollments', ['school_year_id'])
+
+
+def _create_academic_records():
+    op.execute("""
+        CREATE TABLE student_academic_records (
+            id uuid NOT NULL,
+            student_id uuid NOT NULL REFERENCES students(id),
+            academic_year_id uuid NOT NULL REFERENCES academic_years(id),
+            school_id uuid NOT NULL REFERENCES schools(id),
+            grade_level varchar(10) NOT NULL,
+            program_type varchar(20) NOT NULL DEFAULT 'GENERAL',
+            promotion_status varchar(20) NOT NULL,
+            final_gpa double precision,
+            attendance_rate double precision,
+            credits_earned double precision,
+            enrollment_date date NOT NULL,
+            withdrawal_date date,
+            withdrawal_reason varchar(50),
+            is_active boolean NOT NULL DEFAULT true,
+            PRIMARY KEY (id, academic_year_id)
+        ) PARTITION BY LIST (academic_year_id)
+    """)
+    op.create_index('ix_academic_records_student_year', 'student_academic_records', ['student_id', 'academic_year_id'])
+    op.create_index('ix_academic_records_school_grade', 'student_academic_records', ['school_id', 'grade_level'])
+
+
+def _create_partitions(conn):
+    years = conn.execute(sa.text("SELECT id, short_name FROM academic_years")).fetchall()
+    for table in TABLES:
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        for year_id, short_name in years:
+            name = _partition_name(table, year_id, short_name)
+            op.execute(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES IN ('{year_id}')")
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # Legacy names move with the old tables so the new ones can reuse them
+    op.rename_table('enrollments', 'enrollments_unpartitioned')
+    op.execute("ALTER INDEX ix_enrollments_classroom_id RENAME TO ix_enrollments_unpartitioned_classroom_id")
+    op.execute("ALTER INDEX ix_enrollments_student_id RENAME TO ix_enrollments_unpartitioned_student_id")
+    op.execute("ALTER INDEX IF EXISTS ix_enrollments_school_year_id RENAME TO ix_enrollments_unpartitioned_school_year_id")
+    op.execute("ALTER INDEX enrollments_pkey RENAME TO enrollments_unpartitioned_pkey")
+    op.execute("ALTER INDEX IF EXISTS uq_classroom_student_year RENAME TO uq_unpartitioned_classroom_student_year")
+    op.rename_table('student_academic_records', 'student_academic_records_unpartitioned')
+    op.execute("ALTER INDEX ix_academic_records_student_year RENAME TO ix_academic_records_unpartitioned_student_year")
+    op.execute("ALTER INDEX ix_academic_records_school_grade RENAME TO ix_academic_records_unpartitioned_school_grade")
+    op.execute("ALTER INDEX student_academic_records_pkey RENAME TO student_academic_records_unpartitioned_pkey")
+
+    _create_enrollments()
+    _create_academic_records()
+    _create_partitions(conn)
+
+    op.execute("""
+        INSERT INTO enrollments (
+            id, student_id, classroom_id, academic_year_id, school_year_id,
+            enrollment_date, enrollment_status, is_active, created_at, updated_at
+        )
+        SELECT DISTINCT ON (e.classroom_id, e.student_id)
+               e.id, e.student_id, e.classroom_id, c.academic_year_id, e.school_year_id,
+               e.created_at::date,
+               CASE WHEN e.is_active THEN 'ACTIVE' ELSE 'WITHDRAWN' END,
+               e.is_active, e.created_at, e.updated_at
+        FROM enrollments_unpartitioned e
+        JOIN classrooms c ON c.id = e.classroom_id
+        ORDER BY e.classroom_id, e.student_id, e.is_active DESC, e.updated_at DESC
+    """)
+    op.execute("""
+        CREATE TABLE enrollments_duplicates_archive AS
+        SELECT e.*, now() AS archived_at
+        FROM enrollments_unpartitioned e
+        WHERE NOT EXISTS (SELECT 1 FROM enrollments k WHERE k.id = e.id)
+    """)
+    op.execute("INSERT INTO student_academic_records SELECT * FROM student_academic_records_unpartitioned")
+
+    op.drop_table('enrollments_unpartitioned')
+    op.drop_table('student_academic_records_unpartitioned')
+
+
+def downgrade():
+    op.rename_table('enrollments', 'enrollments_partitioned')
+    op.execute("ALTER INDEX ix_enrollments_classroom_id RENAME TO ix_enrollments_partitioned_classroom_id")
+    op.execute("ALTER INDEX ix_enrollments_student_id RENAME TO ix_enrollments_partitioned_student_id")
+    op.execute("ALTER INDEX ix_enrollments_school_year_id RENAME TO ix_enrollments_partitioned_school_year_id")
+    op.execute("ALTER INDEX enrollments_pkey RENAME TO enrollments_partitioned_pkey")
+    op.execute("ALTER INDEX uq_classroom_student_year RENAME TO uq_partitioned_classroom_student_year")
+    op.rename_table('student_academic_records', 'student_academic_records_partitioned')
+    op.execute("ALTER INDEX ix_academic_records_student_year RENAME TO ix_academic_records_partitioned_student_year")
+    op.execute("ALTER INDEX ix_academic_records_school_grade RENAME TO ix_academic_records_partitioned_school_grade")
+    op.execute("ALTER INDEX student_academic_records_pkey RENAME TO student_academic_records_partitioned_pkey")
+
+    op.create_table(
+        'enrollments',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column('classroom_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('student_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('school_year_id', UUID(as_uuid=True), nullable=True),
+        sa.ForeignKeyConstraint(['classroom_id'], ['classrooms.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['school_year_id'], ['school_years.id'], ondelete='SET NULL'),
+        sa.UniqueConstraint('classroom_id', 'student_id', 'school_year_id', name='uq_classroom_student_year'),
+    )
+    op.create_index('ix_enrollments_classroom_id', 'enrollments', ['classroom_id'])
+    op.create_index('ix_enrollments_student_id', 'enrollments', ['student_id'])
+    op.create_index('ix_enrollments_school_year_id', 'enrollments', ['school_year_id'])
+    op.execute("""
+        INSERT INTO enrollments (id, classroom_id, student_id, is_active, created_at, updated_at, school_year_id)
+        SELECT DISTINCT ON (classroom_id, student_id, school_year_id)
+               id, classroom_id, student_id, is_active, created_at, updated_at, school_year_id
+        FROM enrollments_partitioned
+        ORDER BY classroom_id, student_id, school_year_id, is_active DESC, created_at DESC
+    """)
+    op.execute("""
+        INSERT INTO enrollments (id, classroom_id, student_id, is_active, created_at, updated_at, school_year_id)
+        SELECT id, classroom_id, student_id, is_active, created_at, updated_at, school_year_id
+        FROM enrollments_duplicates_archive
+        ON CONFLICT DO NOTHING
+    """)
+    op.drop_table('enrollments_duplicates_archive')
+
+    op.create_table('student_academic_records',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('student_id', UUID(as_uuid=True), sa.ForeignKey('students.id'), nullable=False),
+        sa.Column('academic_year_id', UUID(as_uuid=True), sa.ForeignKey('academic_years.id'), nullable=False),
+        sa.Column('school_id', UUID(as_uuid=True), sa.ForeignKey('schools.id'), nullable=False),
+        sa.Column('grade_level', sa.String(10), nullable=False),
+        sa.Column('program_type', sa.String(20), nullable=False, server_default='GENERAL'),
+        sa.Column('promotion_status', sa.String(20), nullable=False),
+        sa.Column('final_gpa', sa.Float(), nullable=True),
+        sa.Column('attendance_rate', sa.Float(), nullable=True),
+        sa.Column('credits_earned', sa.Float(), nullable=True),
+        sa.Column('enrollment_date', sa.Date(), nullable=False),
+        sa.Column('withdrawal_date', sa.Date(), nullable=True),
+        sa.Column('withdrawal_reason', sa.String(50), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+    )
+    op.create_index('ix_academic_records_student_year', 'student_academic_records', ['student_id', 'academic_year_id'])
+    op.create_index('ix_academic_records_school_grade', 'student_academic_records', ['school_id', 'grade_level'])
+    op.execute("INSERT INTO student_academic_records SELECT * FROM student_academic_records_partitioned")
+
+    # Dropping the parents drops every attached partition with them
+    op.drop_table('enrollments_partitioned')
+    op.drop_table('student_academic_records_partitioned')
@@ -0,0 +1,123 @@
+# backend/app/change_feed.py
+"""
+Change feed: a transactional outbox broadcast over LISTEN/NOTIFY.
+
+Recording: statement-level triggers on the tracked tables (listed in the
+add_change_events migration) insert a change_events row for every row
+inserted, updated or deleted, in the writing transaction, whatever wrote it:
+ORM flushes, Core insert()/update() and text() SQL alike. A trigger on
+change_events NOTIFYs CHANNEL with the transaction id and id range; Postgres
+delivers notifications only on commit, in commit order.
+
+Each event names the table (entity), the row (entity_id; composite keys
+joined by ':'), the row it belongs to (owner_id, e.g. an enrollment's
+classroom) and its school when it has one.
+
+Listening: each API process runs FEED.run(), which holds one connection
+LISTENing on CHANNEL, fetches each committed batch of events and hands it to
+subscribers (caches evicting keys, live streams). If the connection drops,
+events may have been missed, so subscribers get None - "anything may have
+changed" - once it is back.
+"""
+
+import asyncio
+import json
+import logging
+from collections import namedtuple
+
+from sqlalchemy import text
+
+from .db import get_engine
+
+logger = logging.getLogger("sis.change_feed")
+
+CHANNEL = "change_events"  # keep in sync with the add_change_events migration
+QUEUE_SIZE = 10_000  # notifications waiting to be fetched before the listener resyncs
+
+
+Change = namedtuple("Change", "id entity entity_id op owner_id school_id")
+
+
+FETCH_SQL = text("""
+    SELECT id, entity, entity_id, op, owner_id, school_id FROM change_events
+    WHERE id BETWEEN :first AND :last AND txid = :txid
+    ORDER BY id
+""")
+
+
+class ChangeFeed:
+    def __init__(self):
+        self._subscribers = set()
+
+    def subscribe(self, callback):
+        """
+        Call `callback(changes)` with each committed batch of Change tuples,
+        or with None after a gap. Returns a function that unsubscribes.
+        """
+        self._subscribers.add(callback)
+        return lambda: self._subscribers.discard(callback)
+
+    def publish(self, changes):
+        for callback in list(self._subscribers):
+            try:
+                callback(changes)
+            except Exception:
+                logger.exception("change feed subscriber failed")
+
+    async def _fetch(self, payload):
+        batch = json.loads(payload)
+        async with get_engine().connect() as conn:
+            rows = await conn.execute(FETCH_SQL, batch)
+            return [Change(*row) for row in rows]
+
+    async def _listen(self, keepalive, resync):
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        overflowed = False
+
+        def on_notify(connection, pid, channel, payload):
+            nonlocal overflowed
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                overflowed = True
+
+        async with get_engine().connect() as conn:
+            raw = (await conn.get_raw_connection()).driver_connection
+            await raw.add_listener(CHANNEL, on_notify)
+            logger.info("listening for change events")
+            if resync:
+                self.publish(None)  # events may have committed while we were not listening
+            try:
+                while True:
+                    try:
+                        payload = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                    except asyncio.TimeoutError:
+                        await raw.execute("SELECT 1")  # raises if the connection is gone
+                        continue
+                    if overflowed:
+                        # fell too far behind to know what changed
+                        while not queue.empty():
+                            queue.get_nowait()
+                        overflowed = False
+                        self.publish(None)
+                        continue
+                    self.publish(await self._fetch(payload))
+            finally:
+                if not raw.is_closed():
+                    await raw.remove_listener(CHANNEL, on_notify)
+
+    async def run(self, retry_interval=5.0, keepalive=30.0):
+        """LISTEN and dispatch until cancelled, reconnecting after failures"""
+        resync = False
+        while True:
+            try:
+                await self._listen(keepalive, resync)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("change feed listener failed; reconnecting")
+            resync = True
+            await asyncio.sleep(retry_interval)
+
+
+FEED = ChangeFeed()
@@ -15,6 +15,44 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 60
     default_timezone: str = "America/Chicago"
 
+    # Connection pool per engine; size for the morning attendance burst
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 10.0  # seconds a request waits for a connection
+
+    # Per-request SQL instrumentation (see app/instrumentation.py)
+    sql_instrumentation: bool = True
+    query_budget: int = 50
+    enforce_query_budget: bool = False  # dev/test: fail requests over budget
+    n_plus_one_threshold: int = 5
+
+    bcrypt_workers: int = 4
+
+    # Background jobs (see app/jobs.py); run in the API process unless a
+    # dedicated scripts/run_job_worker.py handles the queue
+    job_runner_in_process: bool = True
+    job_concurrency: int = 2
+    job_poll_interval: float = 1.0
+    job_heartbeat_interval: float = 10.0
+    job_stale_after: int = 120  # seconds without a heartbeat before a job is reclaimed
+    job_retry_backoff: float = 30.0  # seconds, doubled per attempt
+
+    # orjson responses; list endpoints skip response_model re-validation (see app/read_models.py)
+    fast_json: bool = False
+
+    # Seconds between background refreshes of the emergency contact index; 0 disables
+    emergency_contacts_refresh_interval: float = 5.0
+
+    # Read replicas for get_read_db endpoints (see app/replicas.py); comma-separated URLs
+    replica_urls: str = ""
+    replica_max_lag_seconds: float = 5.0  # replicas further behind are skipped
+    replica_check_interval: float = 5.0
+
+    # LISTEN for committed change events and evict cached rows (see app/change_feed.py)
+    change_feed_enabled: bool = True
+    # Seconds between deletions of change events older than any sync token (see app/services/sync.py); 0 disables
+    change_events_prune_interval: float = 3600.0
+
     @validator('default_timezone')
     def tz_us_only(cls, v):
         if v not in US_TZS:
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from .config import get_settings
+from .instrumentation import install_query_listeners
 
 class Base(DeclarativeBase):
     pass
@@ -12,7 +13,13 @@ def get_engine():
     global _engine, _session_factory
     if _engine is None:
         settings = get_settings()
-        _engine = create_async_engine(settings.database_url, future=True, echo=False)
+        _engine = create_async_engine(
+            settings.database_url, future=True, echo=False,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+        install_query_listeners(_engine)
     return _engine
 
 def get_sessionmaker():
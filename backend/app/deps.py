@@ -1,11 +1,18 @@
-from fastapi import Depends, HTTPException, status
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from .db import get_session
+from .replicas import get_read_session
 from .security import decode_access_token
 from .models.user import User
 from .models.user_role import UserRole
+from .models.user_role_preference import UserRolePreference
+from .permissions import Permission, permissions_for_role
+from .services.access import can_access_student
+from .tenancy import scope_to_school, SCOPE_HEADER, DISTRICT_SCOPE
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -14,51 +21,88 @@ async def get_db(session: AsyncSession = Depends(get_session)) -> AsyncSession:
     return session
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme),
+async def get_read_db(session: AsyncSession = Depends(get_read_session)) -> AsyncSession:
+    """Session for read-only endpoints: a replica when one is usable, else the primary"""
+    return session
+
+
+def _requested_school(request):
+    try:
+        return UUID(request.query_params["school_id"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def _has_role_at(session, user_id, school_id):
+    result = await session.execute(
+        select(UserRole.user_id).where(
+            UserRole.user_id == user_id,
+            UserRole.school_id == school_id,
+            UserRole.is_active.is_(True),
+        ).limit(1)
+    )
+    return result.first() is not None
+
+
+async def get_current_user(request: Request,
+                           token: str = Depends(oauth2_scheme),
                            session: AsyncSession = Depends(get_db)) -> User:
     email = decode_access_token(token)
     if not email:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    result = await session.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
-    if not user or not user.is_active:
+    result = await session.execute(
+        select(User, UserRolePreference.school_id)
+        .outerjoin(UserRolePreference, UserRolePreference.user_id == User.id)
+        .where(User.email == email)
+    )
+    row = result.one_or_none()
+    if not row or not row.User.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
+    user = row.User
+
+    # The rest of the request sees only the user's active school, or the
+    # school it names in ?school_id= if the user belongs there (app/tenancy.py)
+    district_wide = (
+        request.headers.get(SCOPE_HEADER, "").lower() == DISTRICT_SCOPE
+        and user.permissions & Permission.ADMIN
+    )
+    school_id = row.school_id
+    requested = _requested_school(request)
+    if requested is not None and requested != school_id:
+        if user.permissions & Permission.ADMIN or await _has_role_at(session, user.id, requested):
+            school_id = requested
+    if school_id is not None and not district_wide:
+        scope_to_school(school_id)
     return user
 
 
-async def require_admin(user: User = Depends(get_current_user), 
-                       session: AsyncSession = Depends(get_db)) -> User:
-    # Check if user has any admin role - be more flexible with role names
-    result = await session.execute(
-        select(UserRole).where(
-            UserRole.user_id == user.id,
-            UserRole.is_active == True
-        )
-    )
-    user_roles = result.scalars().all()
-    
-    # Check if any role contains 'admin' in the name
-    admin_roles = [role for role in user_roles if 'admin' in role.role.lower()]
-    
-    if not admin_roles:
-        # For debugging, let's also check if the user has any roles at all
-        if not user_roles:
-            print(f"User {user.email} has no roles assigned")
-        else:
-            print(f"User {user.email} has roles: {[r.role for r in user_roles]}")
+async def require_admin(user: User = Depends(get_current_user)) -> User:
+    # users.permissions is the OR of the user's active roles, so no role query is needed
+    if not user.permissions & Permission.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required")
-    
     return user
 
 
 def require_role(*required_roles: str):
-    async def _inner(user: User = Depends(get_current_user), session: AsyncSession = Depends(get_db)) -> User:
-        result = await session.execute(
-            select(UserRole).where(UserRole.user_id == user.id, UserRole.is_active == True)
-        )
-        roles = [r.role.lower() for r in result.scalars().all()]
-        if required_roles:
-            if not any(any(req.lower() in role for role in roles) for req in required_roles):
-                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Required role missing")
+    required = Permission.NONE
+    for role in required_roles:
+        required |= permissions_for_role(role)
+
+    async def _inner(user: User = Depends(get_current_user)) -> User:
+        if required_roles and not user.permissions & required:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Required role missing")
         return user
     return _inner
+
+
+async def require_student_access(student_id: str,
+                                 user: User = Depends(get_current_user),
+                                 session: AsyncSession = Depends(get_db)) -> User:
+    """For routes with a {student_id}: admins, the student's teachers and their parents only"""
+    try:
+        student_uuid = UUID(student_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid student ID format")
+    if not await can_access_student(session, user, student_uuid):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized for this student")
+    return user
@@ -0,0 +1,161 @@
+# backend/app/instrumentation.py
+"""
+Per-request SQL instrumentation.
+
+Engine events record every statement executed while a request is in flight
+(statement count, DB time, and normalized statement fingerprints). The
+middleware reports them as a Server-Timing header and a structured log line,
+and flags fingerprints repeated often enough to look like an N+1 pattern.
+With enforce_query_budget on (dev/test), a request that runs more statements
+than query_budget fails with a 500 listing the offending queries.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from .config import get_settings
+
+logger = logging.getLogger("sis.sql")
+
+_current: ContextVar[Optional["RequestStats"]] = ContextVar("sql_request_stats", default=None)
+
+_PARAM = re.compile(r"\$\d+(::\w+(\[\])?)?|%\(\w+\)s|\?")
+_IN_LIST = re.compile(r"IN \(\?(?:, \?)*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement):
+    """Normalize a statement so executions differing only in parameters compare equal"""
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (?)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class RequestStats:
+    """SQL activity of one request"""
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement, elapsed):
+        self.statements += 1
+        self.db_time += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold):
+        """Fingerprints executed at least `threshold` times, most frequent first"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
+
+
+def current_stats():
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - context._query_started)
+
+
+def install_query_listeners(engine):
+    """Attach the timing hooks to an (async) engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryInstrumentationMiddleware:
+    """ASGI middleware collecting RequestStats for each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        settings = get_settings()
+        if scope["type"] != "http" or not settings.sql_instrumentation:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        swallow = False
+
+        async def send_wrapper(message):
+            nonlocal swallow
+            if swallow:
+                return
+            if message["type"] == "http.response.start":
+                repeated = stats.repeated(settings.n_plus_one_threshold)
+                self._log(scope, message["status"], stats, repeated, time.perf_counter() - started)
+
+                if settings.enforce_query_budget and stats.statements > settings.query_budget:
+                    swallow = True
+                    await self._send_budget_error(send, stats, repeated, settings.query_budget)
+                    return
+
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self._server_timing(stats).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+
+    @staticmethod
+    def _server_timing(stats):
+        return f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} queries"'
+
+    @staticmethod
+    def _log(scope, status, stats, repeated, elapsed):
+        record = {
+            "event": "request_sql",
+            "method": scope.get("method"),
+            "path": scope.get("path"),
+            "status": status,
+            "statements": stats.statements,
+            "db_ms": round(stats.db_time * 1000, 1),
+            "total_ms": round(elapsed * 1000, 1),
+        }
+        if repeated:
+            record["repeated"] = [{"sql": sql[:200], "count": count} for sql, count in repeated]
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+
+    @staticmethod
+    async def _send_budget_error(send, stats, repeated, budget):
+        body = json.dumps({
+            "detail": f"Query budget exceeded: {stats.statements} statements (budget {budget})",
+            "repeated": [{"sql": sql, "count": count} for sql, count in repeated],
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 500,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"server-timing", QueryInstrumentationMiddleware._server_timing(stats).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,128 @@
+# backend/app/job_handlers.py
+"""
+Job handlers. Importing this module registers them with app.jobs; the API
+process and scripts/run_job_worker.py both import it before starting a runner.
+"""
+
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from .jobs import job_handler, JobError
+from .models.academic_year import AcademicYear
+from .models.student_academic_record import StudentAcademicRecord
+from .services.attendance import reconcile_rollups
+from .services.gpa import recompute_school
+from .services.partitions import attach_year_partitions
+from .services.rollover import run_rollover
+
+
+@job_handler("academic_year_rollover", max_concurrency=1)
+async def academic_year_rollover(ctx, source_year_id, target_year_id, activate_target=False):
+    """Same steps as POST /academic-years/{id}/rollover, reporting each one as progress"""
+    session = ctx.session
+    source_year = await session.get(AcademicYear, UUID(source_year_id))
+    target_year = await session.get(AcademicYear, UUID(target_year_id))
+    if not source_year or not target_year:
+        raise JobError("Academic year not found")
+
+    await attach_year_partitions(session, target_year)
+    await session.commit()
+
+    async def progress(step, index, total):
+        await ctx.progress(index, total, step)
+
+    counts = await run_rollover(session, source_year, target_year, progress=progress)
+
+    if activate_target:
+        await session.execute(update(AcademicYear).values(is_active=False))
+        await session.execute(
+            update(AcademicYear).where(AcademicYear.id == target_year.id).values(is_active=True)
+        )
+        await session.commit()
+
+    await ctx.progress(len(counts), len(counts), "done")
+    return {
+        "source_year": source_year.name,
+        "target_year": target_year.name,
+        "steps": counts,
+        "target_activated": activate_target,
+    }
+
+
+@job_handler("attendance_reconcile", max_concurrency=1)
+async def attendance_reconcile(ctx, academic_year_id=None):
+    """Recompute attendance counters from the raw records, one school at a time (run nightly)"""
+    session = ctx.session
+    if academic_year_id:
+        year_id = UUID(academic_year_id)
+    else:
+        year_id = (await session.execute(
+            select(AcademicYear.id).where(AcademicYear.is_active == True)
+        )).scalar_one_or_none()
+        if year_id is None:
+            raise JobError("No active academic year")
+
+    school_ids = (await session.execute(
+        select(StudentAcademicRecord.school_id)
+        .where(StudentAcademicRecord.academic_year_id == year_id)
+        .distinct()
+    )).scalars().all()
+
+    corrected = {}
+    for index, school_id in enumerate(school_ids):
+        await ctx.progress(index, len(school_ids), f"school {school_id}")
+        fixed = await reconcile_rollups(session, year_id, school_id)
+        await session.commit()
+        if fixed:
+            corrected[str(school_id)] = len(fixed)
+
+    await ctx.progress(len(school_ids), len(school_ids), "done")
+    return {
+        "academic_year_id": str(year_id),
+        "schools": len(school_ids),
+        "students_corrected": sum(corrected.values()),
+        "corrected_by_school": corrected,
+    }
+
+
+@job_handler("gpa_recompute", max_concurrency=1)
+async def gpa_recompute(ctx, academic_year_id=None):
+    """
+    Recompute final GPA and credits earned from the gradebook, one school per
+    transaction. Progress counts finished schools, so a retried job resumes
+    after the last one it committed.
+    """
+    session = ctx.session
+    if academic_year_id:
+        year_id = UUID(academic_year_id)
+    else:
+        year_id = (await session.execute(
+            select(AcademicYear.id).where(AcademicYear.is_active == True)
+        )).scalar_one_or_none()
+        if year_id is None:
+            raise JobError("No active academic year")
+
+    school_ids = (await session.execute(
+        select(StudentAcademicRecord.school_id)
+        .where(StudentAcademicRecord.academic_year_id == year_id)
+        .distinct()
+        .order_by(StudentAcademicRecord.school_id)
+    )).scalars().all()
+
+    graded = changed = 0
+    for index in range(ctx.resume_at, len(school_ids)):
+        school_id = school_ids[index]
+        school_graded, school_changed = await recompute_school(session, year_id, school_id)
+        await session.commit()
+        graded += school_graded
+        changed += school_changed
+        await ctx.progress(index + 1, len(school_ids), f"school {school_id}: {school_graded} students")
+
+    return {
+        "academic_year_id": str(year_id),
+        "schools": len(school_ids),
+        "resumed_at_school": ctx.resume_at,
+        "students_graded": graded,
+        "records_changed": changed,
+    }
@@ -0,0 +1,324 @@
+# backend/app/jobs.py
+"""
+Background jobs.
+
+Jobs are rows in the `jobs` table. enqueue() adds one; a JobRunner claims
+queued rows with SELECT ... FOR UPDATE SKIP LOCKED, so runners in the API
+process and in scripts/run_job_worker.py can share one queue without ever
+running a job twice.
+
+Handlers are async functions registered with @job_handler(kind) (see
+app/job_handlers.py). They receive a JobContext holding a session of their
+own plus progress() for reporting; while a job runs, the runner heartbeats
+its row and cancels the handler task if cancellation was requested. A
+handler that raises is retried with exponential backoff until max_attempts,
+unless it raised JobError, which fails the job immediately.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import traceback
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, func, and_, or_
+
+from .config import get_settings
+from .db import get_sessionmaker
+from .models.job import Job
+
+logger = logging.getLogger("sis.jobs")
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+HANDLERS = {}
+
+
+class JobError(Exception):
+    """Raised by a handler for failures a retry cannot fix"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job has been cancelled"""
+
+
+def job_handler(kind, max_concurrency=None):
+    """Register an async handler `(ctx, **params) -> result dict` for a job kind"""
+    def register(fn):
+        HANDLERS[kind] = (fn, max_concurrency)
+        return fn
+    return register
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+async def enqueue(session, kind, params=None, created_by=None, max_attempts=3):
+    """Add a job to the queue; the caller commits"""
+    if kind not in HANDLERS:
+        raise ValueError(f"No handler registered for job kind '{kind}'")
+    job = Job(kind=kind, params=params or {}, created_by=created_by, max_attempts=max_attempts)
+    session.add(job)
+    await session.flush()
+    return job
+
+
+async def request_cancel(session, job):
+    """Cancel a queued job outright, or flag a running one for its runner; the caller commits"""
+    if job.status == QUEUED:
+        job.status = CANCELLED
+        job.finished_at = _utcnow()
+    elif job.status == RUNNING:
+        job.cancel_requested = True
+    return job
+
+
+async def requeue(session, job):
+    """
+    Put a failed or cancelled job back on the queue with a fresh attempt
+    budget; its recorded progress is kept for resumable handlers. The caller commits.
+    """
+    job.status = QUEUED
+    job.attempts = 0
+    job.cancel_requested = False
+    job.error = None
+    job.result = None
+    job.run_after = _utcnow()
+    job.finished_at = None
+    return job
+
+
+class JobContext:
+    """
+    What a handler gets: its params, a session, and progress reporting.
+
+    resume_at is the progress the job had recorded when this attempt started
+    (0 on a first run). A handler that reports progress after committing each
+    unit of work can skip that many units when a retry or reclaim reruns it.
+    """
+
+    def __init__(self, job_id, params, session, session_factory, resume_at=0):
+        self.job_id = job_id
+        self.params = params
+        self.session = session
+        self.resume_at = resume_at
+        self._session_factory = session_factory
+
+    async def progress(self, done, total=None, message=None):
+        """Record progress (in its own transaction) and stop here if the job was cancelled"""
+        values = {"progress_done": done, "heartbeat_at": _utcnow()}
+        if total is not None:
+            values["progress_total"] = total
+        if message is not None:
+            values["progress_message"] = message[:200]
+        async with self._session_factory() as session:
+            cancel_requested = (await session.execute(
+                update(Job).where(Job.id == self.job_id).values(**values).returning(Job.cancel_requested)
+            )).scalar_one()
+            await session.commit()
+        if cancel_requested:
+            raise JobCancelled()
+
+
+class JobRunner:
+    """
+    Polls the jobs table and runs up to `concurrency` jobs at a time.
+
+    Handlers registered with max_concurrency are additionally limited to that
+    many running jobs across all runners. Running jobs whose heartbeat is older
+    than job_stale_after seconds (their runner died) are reclaimed.
+    """
+
+    def __init__(self, session_factory=None, concurrency=None, poll_interval=None, worker_id=None):
+        settings = get_settings()
+        self.session_factory = session_factory or get_sessionmaker()
+        self.concurrency = concurrency or settings.job_concurrency
+        self.poll_interval = poll_interval or settings.job_poll_interval
+        self.heartbeat_interval = settings.job_heartbeat_interval
+        self.stale_after = timedelta(seconds=settings.job_stale_after)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = set()
+        self._stopping = asyncio.Event()
+        self._loop_task = None
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def start(self):
+        self._loop_task = asyncio.create_task(self.run())
+
+    async def stop(self, timeout=30):
+        """Stop claiming work and wait for running jobs (cancelling them after `timeout`)"""
+        self._stopping.set()
+        if self._loop_task:
+            await self._loop_task
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def run(self):
+        logger.info("job runner %s started (concurrency %s)", self.worker_id, self.concurrency)
+        while not self._stopping.is_set():
+            claimed = None
+            if len(self._tasks) < self.concurrency:
+                try:
+                    claimed = await self.claim_next()
+                except Exception:
+                    logger.exception("job claim failed")
+            if claimed is not None:
+                task = asyncio.create_task(self._execute(*claimed))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # -- claiming -----------------------------------------------------------
+
+    async def claim_next(self):
+        """Lock and mark the next runnable job as ours; returns (id, kind, params, resume_at) or None"""
+        if not HANDLERS:
+            return None
+        now = _utcnow()
+        async with self.session_factory() as session:
+            saturated = []
+            limited = {kind: limit for kind, (_, limit) in HANDLERS.items() if limit}
+            if limited:
+                running = dict((await session.execute(
+                    select(Job.kind, func.count())
+                    .where(Job.status == RUNNING, Job.kind.in_(limited), Job.heartbeat_at >= now - self.stale_after)
+                    .group_by(Job.kind)
+                )).all())
+                saturated = [kind for kind, limit in limited.items() if running.get(kind, 0) >= limit]
+
+            job = (await session.execute(
+                select(Job)
+                .where(
+                    Job.kind.in_(list(HANDLERS)),
+                    Job.kind.notin_(saturated),
+                    or_(
+                        and_(Job.status == QUEUED, Job.run_after <= now),
+                        and_(Job.status == RUNNING, Job.heartbeat_at < now - self.stale_after),
+                    ),
+                )
+                .order_by(Job.run_after, Job.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )).scalar_one_or_none()
+            if job is None:
+                return None
+
+            if job.status == RUNNING:
+                logger.warning("reclaiming job %s from unresponsive worker %s", job.id, job.worker_id)
+                if job.cancel_requested:
+                    job.status = CANCELLED
+                    job.finished_at = now
+                    await session.commit()
+                    return None
+            job.attempts += 1
+            if job.attempts > job.max_attempts:
+                job.status = FAILED
+                job.error = f"Worker {job.worker_id} stopped responding and no attempts remain"
+                job.finished_at = now
+                await session.commit()
+                return None
+
+            job.status = RUNNING
+            job.worker_id = self.worker_id
+            job.started_at = now
+            job.heartbeat_at = now
+            claimed = (job.id, job.kind, dict(job.params or {}), job.progress_done)
+            await session.commit()
+            return claimed
+
+    # -- execution ----------------------------------------------------------
+
+    async def _execute(self, job_id, kind, params, resume_at):
+        handler, _ = HANDLERS[kind]
+        async with self.session_factory() as session:
+            ctx = JobContext(job_id, params, session, self.session_factory, resume_at)
+            work = asyncio.create_task(handler(ctx, **params))
+            heartbeat = asyncio.create_task(self._heartbeat(job_id, work))
+            try:
+                result = await work
+            except JobCancelled:
+                await session.rollback()
+                await self._finish(job_id, status=CANCELLED)
+                logger.info("job %s (%s) cancelled", job_id, kind)
+            except asyncio.CancelledError:
+                await session.rollback()
+                if work.cancelled() and heartbeat.done():
+                    # the heartbeat saw cancel_requested and stopped the handler
+                    await self._finish(job_id, status=CANCELLED)
+                    logger.info("job %s (%s) cancelled", job_id, kind)
+                else:
+                    # runner shutdown: hand the job back without spending an attempt
+                    await self._release(job_id)
+                    logger.info("job %s (%s) interrupted by shutdown, requeued", job_id, kind)
+            except JobError as exc:
+                await session.rollback()
+                await self._finish(job_id, status=FAILED, error=str(exc))
+                logger.warning("job %s (%s) failed: %s", job_id, kind, exc)
+            except Exception:
+                await session.rollback()
+                await self._retry_or_fail(job_id, traceback.format_exc())
+                logger.exception("job %s (%s) raised", job_id, kind)
+            else:
+                await self._finish(job_id, status=SUCCEEDED, result=result)
+                logger.info("job %s (%s) succeeded", job_id, kind)
+            finally:
+                heartbeat.cancel()
+
+    async def _heartbeat(self, job_id, work):
+        """Keep the job's heartbeat fresh and cancel `work` once cancellation is requested"""
+        while not work.done():
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as session:
+                    cancel_requested = (await session.execute(
+                        update(Job).where(Job.id == job_id).values(heartbeat_at=_utcnow()).returning(Job.cancel_requested)
+                    )).scalar_one()
+                    await session.commit()
+            except Exception:
+                logger.exception("heartbeat failed for job %s", job_id)
+                continue
+            if cancel_requested:
+                work.cancel()
+                return
+
+    async def _finish(self, job_id, status, result=None, error=None):
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job).where(Job.id == job_id).values(
+                    status=status, result=result, error=error, finished_at=_utcnow(), heartbeat_at=None,
+                )
+            )
+            await session.commit()
+
+    async def _release(self, job_id):
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job).where(Job.id == job_id).values(
+                    status=QUEUED, attempts=Job.attempts - 1, worker_id=None, heartbeat_at=None,
+                )
+            )
+            await session.commit()
+
+    async def _retry_or_fail(self, job_id, error):
+        async with self.session_factory() as session:
+            job = await session.get(Job, job_id)
+            job.error = error
+            job.heartbeat_at = None
+            if job.attempts < job.max_attempts and not job.cancel_requested:
+                job.status = QUEUED
+                job.run_after = _utcnow() + timedelta(seconds=get_settings().job_retry_backoff * 2 ** (job.attempts - 1))
+            else:
+                job.status = FAILED
+                job.finished_at = _utcnow()
+            await session.commit()
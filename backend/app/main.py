@@ -1,10 +1,24 @@
 # backend/app/main.py - Correct version with prefixes added in include_router
 
-from fastapi import FastAPI, Depends
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+from .config import get_settings
 from .db import get_session
+from .instrumentation import QueryInstrumentationMiddleware
+from .jobs import JobRunner
+from .services.emergency_contacts import run_refresher
+from .services.sync import run_pruner
+from .change_feed import FEED
+from .services.dashboard_events import HUB
+from . import job_handlers  # noqa: F401 - registers job handlers
+from .metrics import MetricsMiddleware, REGISTRY
+from .replicas import ReadYourWritesMiddleware, get_replicas
 from .routers import auth as auth_router
 from .routers import schools as schools_router
 from .routers import admin as admin_router
@@ -16,8 +30,47 @@ from .routers import subjects as subjects_router
 from .routers import rooms as rooms_router
 from .routers import special_needs as special_needs_router
 from .routers import parents as parents_router
+from .routers import exports as exports_router
+from .routers import jobs as jobs_router
+from .routers import attendance as attendance_router
+from .routers import gradebook as gradebook_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    runner = JobRunner() if settings.job_runner_in_process else None
+    if runner:
+        runner.start()
+    refresher = None
+    if settings.emergency_contacts_refresh_interval > 0:
+        refresher = asyncio.create_task(run_refresher(settings.emergency_contacts_refresh_interval))
+    listener = dashboard_events = None
+    if settings.change_feed_enabled:
+        listener = asyncio.create_task(FEED.run())
+        dashboard_events = asyncio.create_task(HUB.run())
+    pruner = None
+    if settings.change_events_prune_interval > 0:
+        pruner = asyncio.create_task(run_pruner(settings.change_events_prune_interval))
+    replicas = get_replicas()
+    monitor = None
+    if replicas:
+        await replicas.check_all()
+        monitor = asyncio.create_task(replicas.monitor())
+    yield
+    for task in (refresher, listener, dashboard_events, pruner, monitor):
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    if replicas:
+        await replicas.dispose()
+    if runner:
+        await runner.stop()
 
-app = FastAPI(title="SIS API - Phase A")
+app = FastAPI(
+    title="SIS API - Phase A",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if get_settings().fast_json else JSONResponse,
+)
 
 # Fixed CORS middleware
 app.add_middleware(
@@ -31,13 +84,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryInstrumentationMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+
 @app.get("/health") 
 async def health(session: AsyncSession = Depends(get_session)):
     await session.execute(text("SELECT 1"))
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Include routers with prefixes added HERE (not in router definitions)
 app.include_router(auth_router.router, prefix="/auth")
 app.include_router(schools_router.router, prefix="/schools")
@@ -49,4 +111,8 @@ app.include_router(academic_years_router.router, prefix="/academic-years")
 app.include_router(subjects_router.router, prefix="/subjects")
 app.include_router(rooms_router.router, prefix="/rooms")
 app.include_router(special_needs_router.router, prefix="/special-needs")
-app.include_router(parents_router.router, prefix="/parents")
\ No newline at end of file
+app.include_router(parents_router.router, prefix="/parents")
+app.include_router(exports_router.router, prefix="/exports")
+app.include_router(jobs_router.router, prefix="/jobs")
+app.include_router(attendance_router.router, prefix="/attendance")
+app.include_router(gradebook_router.router, prefix="/gradebook")
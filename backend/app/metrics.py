@@ -0,0 +1,220 @@
+# backend/app/metrics.py
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain dicts keyed by label values, so
+recording a request costs a few dict updates. Everything is rendered on
+scrape by GET /metrics. Histogram buckets are stored non-cumulatively and
+summed at render time.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from . import db
+from .instrumentation import current_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+
+    def inc(self, *label_values, amount=1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for values, count in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labels, values)} {_format_value(count)}"
+
+
+class Gauge:
+    """A settable gauge, or a callback gauge read at scrape time when `collect` is given"""
+
+    def __init__(self, name, help, labels=(), collect=None):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.collect = collect
+        self._values = {}
+        self._lock = threading.Lock()  # updated from worker threads (bcrypt)
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value, *label_values):
+        self._values[label_values] = value
+
+    def render(self):
+        values = self._values
+        if self.collect is not None:
+            values = self.collect()
+            if values is None:
+                return
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for label_values, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *label_values):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labels + ("le",), label_values + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(series[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    "sis_http_requests_total", "HTTP requests by route and status", ("method", "route", "status")))
+LATENCY = REGISTRY.register(Histogram(
+    "sis_http_request_duration_seconds", "HTTP request latency by route", ("method", "route")))
+EXCEPTIONS = REGISTRY.register(Counter(
+    "sis_http_exceptions_total", "Unhandled exceptions by route", ("method", "route", "exception")))
+IN_PROGRESS = REGISTRY.register(Gauge(
+    "sis_http_requests_in_progress", "HTTP requests currently being served", ("method",)))
+DB_STATEMENTS = REGISTRY.register(Counter(
+    "sis_db_statements_total", "SQL statements executed by route", ("route",)))
+DB_TIME = REGISTRY.register(Counter(
+    "sis_db_time_seconds_total", "Time spent in SQL statements by route", ("route",)))
+BCRYPT_QUEUE = REGISTRY.register(Gauge(
+    "sis_bcrypt_queue_depth", "Password hash/verify calls waiting for or running on the bcrypt pool"))
+
+
+def _pool_stats():
+    engine = db._engine
+    if engine is None:
+        return None
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return {
+        ("size",): pool.size(),
+        ("checked_out",): pool.checkedout(),
+        ("checked_in",): pool.checkedin(),
+        ("overflow",): max(pool.overflow(), 0),
+    }
+
+
+DB_POOL = REGISTRY.register(Gauge(
+    "sis_db_pool_connections", "Database connection pool state", ("state",), collect=_pool_stats))
+
+
+def _replica_lag():
+    from . import replicas  # replicas -> security -> metrics
+    pool = replicas._pool
+    if pool is None:
+        return None
+    # -1 while a replica is unreachable or has not replayed anything yet
+    return {(r.name,): r.lag if r.healthy and r.lag is not None else -1 for r in pool.replicas}
+
+
+REPLICA_LAG = REGISTRY.register(Gauge(
+    "sis_db_replica_lag_seconds", "Replication lag per read replica as of its last check", ("replica",),
+    collect=_replica_lag))
+
+
+def route_label(scope):
+    """Route template (e.g. /classrooms/{classroom_id}) to keep label cardinality bounded"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route throughput, latency and errors"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            EXCEPTIONS.inc(method, route_label(scope), type(exc).__name__)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            route = route_label(scope)
+            IN_PROGRESS.dec(method)
+            REQUESTS.inc(method, route, str(status))
+            LATENCY.observe(elapsed, method, route)
+            stats = current_stats()
+            if stats is not None:
+                DB_STATEMENTS.inc(route, amount=stats.statements)
+                DB_TIME.inc(route, amount=stats.db_time)
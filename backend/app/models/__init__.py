@@ -18,3 +18,9 @@ from .student_special_need import StudentSpecialNeed
 from .parent import Parent
 from .parent_student_relationship import ParentStudentRelationship
 from .enrollment import Enrollment
+from .job import Job
+from .cache_version import CacheVersion
+from .attendance import AttendanceRecord
+from .gradebook import GradeCategory, Assignment, AssignmentScore, GradebookVersion
+from .teacher_student_access import TeacherStudentAccess
+from .change_event import ChangeEvent
@@ -0,0 +1,35 @@
+# backend/app/models/attendance.py
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import date, datetime
+from typing import Optional
+import uuid
+from .base import Base
+
+
+class AttendanceRecord(Base):
+    """One student's attendance in one section on one day"""
+    __tablename__ = "attendance_records"
+
+    # Natural key: a section submits its whole roster for a day, and resubmitting upserts
+    classroom_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("classrooms.id"), primary_key=True)
+    attendance_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    student_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("students.id"), primary_key=True)
+    # Copy of classroom.academic_year_id - the table is partitioned on it
+    academic_year_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("academic_years.id"), primary_key=True)
+
+    status: Mapped[str] = mapped_column(String(10), nullable=False)  # "PRESENT", "ABSENT", "TARDY", "EXCUSED"
+    minutes_late: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    note: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+
+    recorded_by: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_attendance_student_year", "student_id", "academic_year_id", "attendance_date"),
+    )
+
+    def __repr__(self):
+        return f"<AttendanceRecord {self.student_id} {self.attendance_date} {self.status}>"
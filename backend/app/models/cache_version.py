@@ -0,0 +1,15 @@
+# backend/app/models/cache_version.py
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, BigInteger
+from .base import Base
+
+
+class CacheVersion(Base):
+    """Counter bumped by triggers whenever a cache's source tables change"""
+    __tablename__ = "cache_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)  # "emergency_contacts:<school id>"
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CacheVersion {self.name}={self.version}>"
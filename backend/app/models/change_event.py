@@ -0,0 +1,36 @@
+# backend/app/models/change_event.py
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, BigInteger, DateTime, Identity, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from typing import Optional
+import uuid
+from .base import Base
+
+
+class ChangeEvent(Base):
+    """
+    Outbox row for one written row of a tracked table, inserted by the
+    table's triggers in the writing transaction (see app/change_feed.py). A
+    trigger NOTIFYs listeners when the transaction commits; ids increase
+    monotonically.
+    """
+    __tablename__ = "change_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    txid: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("txid_current()"))
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)  # table name, e.g. "rooms"
+    entity_id: Mapped[str] = mapped_column(String(100), nullable=False)  # primary key; composite keys joined by ":"
+    op: Mapped[str] = mapped_column(String(10), nullable=False)  # "insert", "update", "delete"
+    owner_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # row it belongs to, e.g. an enrollment's classroom
+    school_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)  # when the row belongs to one school
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=text("now()"))
+
+    __table_args__ = (
+        Index("ix_change_events_entity", "entity", "id"),
+        Index("ix_change_events_entity_txid", "entity", "txid"),  # delta sync (app/services/sync.py)
+        Index("ix_change_events_created_at", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<ChangeEvent {self.id} {self.op} {self.entity}:{self.entity_id}>"
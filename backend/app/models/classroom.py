@@ -1,8 +1,9 @@
 # backend/app/models/classroom.py
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, Boolean, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
+from typing import Optional
 import uuid
 from .base import Base
 
@@ -19,12 +20,17 @@ class Classroom(Base):
     grade_level: Mapped[str] = mapped_column(String(10), nullable=False)  # "K", "1", "2"..."8", "MULTI"
     classroom_type: Mapped[str] = mapped_column(String(20), nullable=False, default="CORE")  # "CORE", "ENRICHMENT", "SPECIAL"
     
-    # Academic Year Association
+    # School and Academic Year Association
+    school_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
     academic_year_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("academic_years.id"), nullable=False)
     
     # Optional Capacity Limit
     max_students: Mapped[int] = mapped_column(Integer, nullable=True)
     
+    # Room Assignment (null until a room is assigned)
+    room_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("rooms.id", ondelete="SET NULL"), nullable=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    
     # Relationships
     subject = relationship("Subject", back_populates="classrooms")
     academic_year = relationship("AcademicYear", back_populates="classrooms")
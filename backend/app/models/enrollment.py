@@ -15,6 +15,8 @@ class Enrollment(Base):
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     student_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("students.id"), nullable=False)
     classroom_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("classrooms.id"), nullable=False)
+    # Copy of classroom.academic_year_id - the table is partitioned on it, so filter on it directly
+    academic_year_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("academic_years.id"), primary_key=True)
     
     # Enrollment Timeline
     enrollment_date: Mapped[date] = mapped_column(Date, nullable=False, default=date.today)
@@ -48,8 +50,7 @@ class Enrollment(Base):
         query = session.query(cls).filter(cls.student_id == student_id)
         
         if academic_year_id:
-            from .classroom import Classroom
-            query = query.join(Classroom).filter(Classroom.academic_year_id == academic_year_id)
+            query = query.filter(cls.academic_year_id == academic_year_id)
         
         if active_only:
             query = query.filter(cls.is_active == True)
@@ -73,7 +74,7 @@ class Enrollment(Base):
         return session.query(cls).join(Classroom).join(ClassroomTeacherAssignment).filter(
             ClassroomTeacherAssignment.teacher_user_id == teacher_user_id,
             ClassroomTeacherAssignment.is_active == True,
-            Classroom.academic_year_id == academic_year_id,
+            cls.academic_year_id == academic_year_id,
             cls.is_active == True,
             cls.enrollment_status == "ACTIVE"
         ).all()
@@ -0,0 +1,74 @@
+# backend/app/models/gradebook.py
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, BigInteger, Float, Boolean, Date, DateTime, ForeignKey, Index, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import date, datetime
+from typing import Optional
+import uuid
+from .base import Base
+
+
+class GradeCategory(Base):
+    """Weighted group of assignments in a section ("Homework 20%", "Tests 50%")"""
+    __tablename__ = "grade_categories"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    classroom_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("classrooms.id", ondelete="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(50), nullable=False)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)  # relative; normalized over categories with graded work
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("classroom_id", "name", name="uq_grade_categories_classroom_name"),
+    )
+
+    def __repr__(self):
+        return f"<GradeCategory {self.name} ({self.weight})>"
+
+
+class Assignment(Base):
+    __tablename__ = "assignments"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    classroom_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("classrooms.id", ondelete="CASCADE"), nullable=False)
+    category_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("grade_categories.id"), nullable=False)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    points_possible: Mapped[float] = mapped_column(Float, nullable=False)
+    due_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    created_by: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    category = relationship("GradeCategory")
+
+    __table_args__ = (
+        Index("ix_assignments_classroom", "classroom_id", "due_date"),
+    )
+
+    def __repr__(self):
+        return f"<Assignment {self.title} ({self.points_possible} pts)>"
+
+
+class AssignmentScore(Base):
+    """A student's result on an assignment; no row (or points NULL) means not graded yet"""
+    __tablename__ = "assignment_scores"
+
+    assignment_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("assignments.id", ondelete="CASCADE"), primary_key=True)
+    student_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    points: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    is_excused: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)  # left out of the grade
+    is_missing: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)  # counts as zero
+    graded_by: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_assignment_scores_student", "student_id"),
+    )
+
+
+class GradebookVersion(Base):
+    """Per-section counter bumped with every gradebook write; cached gradebooks compare against it"""
+    __tablename__ = "gradebook_versions"
+
+    classroom_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("classrooms.id", ondelete="CASCADE"), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,62 @@
+# backend/app/models/job.py
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, Boolean, Text, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime, timezone
+from typing import Optional
+import uuid
+from .base import Base
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class Job(Base):
+    """A unit of background work, claimed and run by app.jobs.JobRunner"""
+    __tablename__ = "jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)  # handler name, e.g. "academic_year_rollover"
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+
+    # Lifecycle
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")  # "queued", "running", "succeeded", "failed", "cancelled"
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)  # retry backoff
+
+    # Progress
+    progress_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    progress_total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    progress_message: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+
+    # Outcome
+    result: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Worker bookkeeping
+    worker_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_by: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    creator = relationship("User")
+
+    __table_args__ = (
+        # claim order for queued work
+        Index("ix_jobs_queued", "run_after", "created_at", postgresql_where=text("status = 'queued'")),
+        Index("ix_jobs_running_heartbeat", "heartbeat_at", postgresql_where=text("status = 'running'")),
+        Index("ix_jobs_created_by", "created_by", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<Job {self.kind} {self.status} ({self.progress_done}/{self.progress_total})>"
+
+    @property
+    def is_finished(self):
+        return self.status in ("succeeded", "failed", "cancelled")
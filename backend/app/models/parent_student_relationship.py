@@ -4,7 +4,7 @@
 # backend/app/models/parent_student_relationship.py
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Boolean, Integer, ForeignKey
+from sqlalchemy import String, Boolean, Integer, ForeignKey, select
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from .base import Base
@@ -44,29 +44,32 @@ class ParentStudentRelationship(Base):
         return f"<ParentStudentRelationship {parent_name} -> {student_name} ({self.relationship_type})>"
     
     @classmethod
-    def get_student_parents(cls, session, student_id, active_only=True):
+    async def get_student_parents(cls, session, student_id, active_only=True):
         """Get all parents for a specific student"""
-        query = session.query(cls).filter(cls.student_id == student_id)
+        query = select(cls).where(cls.student_id == student_id)
         if active_only:
-            query = query.filter(cls.is_active == True)
-        return query.all()
+            query = query.where(cls.is_active == True)
+        return (await session.execute(query)).scalars().all()
     
     @classmethod
-    def get_parent_students(cls, session, parent_id, active_only=True):
+    async def get_parent_students(cls, session, parent_id, active_only=True):
         """Get all students for a specific parent"""
-        query = session.query(cls).filter(cls.parent_id == parent_id)
+        query = select(cls).where(cls.parent_id == parent_id)
         if active_only:
-            query = query.filter(cls.is_active == True)
-        return query.all()
+            query = query.where(cls.is_active == True)
+        return (await session.execute(query)).scalars().all()
     
     @classmethod
-    def get_emergency_contacts(cls, session, student_id):
+    async def get_emergency_contacts(cls, session, student_id):
         """Get emergency contacts for a student, ordered by priority"""
-        return session.query(cls).filter(
-            cls.student_id == student_id,
-            cls.is_emergency_contact == True,
-            cls.is_active == True
-        ).order_by(cls.emergency_priority).all()
+        result = await session.execute(
+            select(cls).where(
+                cls.student_id == student_id,
+                cls.is_emergency_contact == True,
+                cls.is_active == True
+            ).order_by(cls.emergency_priority)
+        )
+        return result.scalars().all()
     
     def has_permission(self, permission_name):
         """Check if this relationship has a specific permission"""
@@ -1,7 +1,7 @@
 # backend/app/models/student_academic_record.py
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Float, Date, Boolean, ForeignKey
+from sqlalchemy import String, Float, Integer, Date, Boolean, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import date
 from typing import Optional
@@ -14,7 +14,7 @@ class StudentAcademicRecord(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     student_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("students.id"), nullable=False)
-    academic_year_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("academic_years.id"), nullable=False)
+    academic_year_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("academic_years.id"), primary_key=True)  # partition key
     school_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("schools.id"), nullable=False)
     
     # Grade Level Tracking (flexible for special programs)
@@ -26,6 +26,13 @@ class StudentAcademicRecord(Base):
     final_gpa: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     attendance_rate: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Percentage
     credits_earned: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # For middle/high school
+
+    # Attendance rollups: section-day records by status, kept current by attendance
+    # submissions (app/services/attendance.py); attendance_rate = present + tardy over all
+    attendance_present: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attendance_absent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attendance_tardy: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attendance_excused: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     
     # Enrollment Tracking (supports mid-year changes)
     enrollment_date: Mapped[date] = mapped_column(Date, nullable=False)
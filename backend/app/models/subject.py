@@ -1,7 +1,7 @@
 # backend/app/models/subject.py
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, Float
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from .base import Base
@@ -24,6 +24,9 @@ class Subject(Base):
     is_homeroom_default: Mapped[bool] = mapped_column(Boolean, default=False)    # True for elementary core subjects
     requires_specialist: Mapped[bool] = mapped_column(Boolean, default=False)    # True for PE, Art, Music
     allows_cross_grade: Mapped[bool] = mapped_column(Boolean, default=False)     # True for advanced subjects
+
+    # Credits a passing grade earns for a year-long section; also weights GPA
+    credits: Mapped[float] = mapped_column(Float, nullable=False, default=1.0)
     
     # System vs Admin Created
     is_system_core: Mapped[bool] = mapped_column(Boolean, default=False)         # Can't be deleted if True
@@ -0,0 +1,25 @@
+# backend/app/models/teacher_student_access.py
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from .base import Base
+
+
+class TeacherStudentAccess(Base):
+    """
+    Which teachers teach which students: one row per (teacher, student, section)
+    for active assignments and active enrollments in active sections. Maintained
+    by triggers on enrollments, classroom_teacher_assignments and classrooms
+    (see the add_teacher_student_access migration); never written by the app.
+    """
+    __tablename__ = "teacher_student_access"
+
+    teacher_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    student_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    classroom_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("classrooms.id", ondelete="CASCADE"), primary_key=True)
+    academic_year_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("academic_years.id"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_teacher_student_access_classroom", "classroom_id", "student_id"),
+    )
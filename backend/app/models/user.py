@@ -1,12 +1,13 @@
 # backend/app/models/user.py - Updated with parent profile relationship
 
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 from datetime import datetime, timezone
 
 from .base import Base
+from ..permissions import Permission
 
 class User(Base):
     __tablename__ = 'users'
@@ -16,6 +17,8 @@ class User(Base):
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    # OR of the permission bits of all active roles; maintained by a user_roles trigger
+    permissions = Column(Integer, default=0, server_default=text("0"), nullable=False)
     last_login_at = Column(DateTime(timezone=True))
 
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
@@ -42,11 +45,19 @@ class User(Base):
         """Check if user has a parent profile"""
         return self.parent_profile is not None
     
+    def has_permission(self, permission, school_id=None):
+        """Check permission bits, optionally for roles at a specific school"""
+        if school_id is None:
+            return bool(self.permissions & permission)
+        return any(
+            user_role.is_active and user_role.school_id == school_id and user_role.permissions & permission
+            for user_role in self.user_roles
+        )
+    
     def is_teacher(self, school_id=None):
         """Check if user has teacher role"""
-        return self.has_role("teacher", school_id)
+        return self.has_permission(Permission.TEACHER, school_id)
     
     def is_admin(self, school_id=None):
         """Check if user has any admin role"""
-        admin_roles = ["admin_principal", "admin_vp", "admin_dean", "admin_staff"]
-        return any(self.has_role(role, school_id) for role in admin_roles)
\ No newline at end of file
+        return self.has_permission(Permission.ADMIN, school_id)
\ No newline at end of file
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 from datetime import datetime, timezone
 
 from .base import Base
+from ..permissions import permissions_for_role
+
+
+def _role_permissions(context):
+    return int(permissions_for_role(context.get_current_parameters()["role"]))
 
 class UserRole(Base):
     __tablename__ = 'user_roles'
@@ -13,6 +18,7 @@ class UserRole(Base):
     role = Column(String, nullable=False, primary_key=True)  # allow multiple roles per user per school
     school_id = Column(UUID(as_uuid=True), ForeignKey('schools.id'), nullable=False, primary_key=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    permissions = Column(Integer, default=_role_permissions, server_default=text("0"), nullable=False)  # Permission bits for role
     last_used_at = Column(DateTime(timezone=True))
     
     # Relationships
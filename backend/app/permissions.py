@@ -0,0 +1,52 @@
+# backend/app/permissions.py
+"""
+Role permission bits.
+
+Each user_roles row stores the bits for its free-text role name, and
+users.permissions holds the OR of a user's active roles (kept up to date by a
+database trigger). Authorization is then a bitwise check on the already
+loaded user instead of a substring match on role names.
+"""
+
+from enum import IntFlag
+
+from sqlalchemy import literal_column
+
+
+class Permission(IntFlag):
+    NONE = 0
+    TEACHER = 1
+    ADMIN = 2
+    PARENT = 4
+    STUDENT = 8
+
+
+# Substring of the role name -> permission. Keep in sync with the
+# role_permissions() SQL function in alembic/versions/add_role_permissions.py
+ROLE_KEYWORDS = (
+    ("teacher", Permission.TEACHER),
+    ("admin", Permission.ADMIN),
+    ("parent", Permission.PARENT),
+    ("student", Permission.STUDENT),
+)
+
+
+def permissions_for_role(role):
+    """Permission bits for a role name, e.g. 'admin_principal' -> ADMIN"""
+    role = (role or "").lower()
+    permissions = Permission.NONE
+    for keyword, permission in ROLE_KEYWORDS:
+        if keyword in role:
+            permissions |= permission
+    return permissions
+
+
+def has_permission(column, permission):
+    """
+    SQL `(column & N) <> 0`.
+
+    N is inlined rather than bound so the planner can match the partial
+    indexes defined on exactly this expression.
+    """
+    flag = literal_column(str(int(permission)))
+    return column.op("&")(flag).op("<>")(literal_column("0"))
@@ -0,0 +1,340 @@
+# backend/app/read_models.py
+"""
+Read models for list endpoints.
+
+Each query is a Core select of exactly the columns the endpoint's response
+exposes, returned as named-tuple Rows or plain dicts of the response shape.
+Nothing is hydrated into entities (no hashed_password, no timestamps) and
+nothing enters the session's identity map.
+
+With settings.fast_json on, list_response() sends those dicts straight out
+through ORJSONResponse: they are built server-side from typed columns, so
+re-validating them against the response_model buys nothing. With it off,
+FastAPI validates them as it would ORM objects.
+"""
+
+from collections import defaultdict
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, func
+
+from .config import get_settings
+from .permissions import Permission, has_permission
+from .services.access import taught_student_ids
+from .models.user import User
+from .models.user_role import UserRole
+from .models.school import School
+from .models.room import Room
+from .models.student import Student
+from .models.student_academic_record import StudentAcademicRecord
+from .models.academic_year import AcademicYear
+from .models.classroom import Classroom
+from .models.classroom_teacher_assignment import ClassroomTeacherAssignment
+from .models.subject import Subject
+from .models.enrollment import Enrollment
+
+
+def list_response(items):
+    """Return read-model dicts, bypassing response_model validation on the fast path"""
+    if get_settings().fast_json:
+        return ORJSONResponse(items)
+    return items
+
+
+# ---------------------------------------------------------------------------
+# Students (StudentOut)
+# ---------------------------------------------------------------------------
+
+def student_list_stmt(teacher_user_id=None, student_ids=None):
+    """
+    Active students with their grade level in the active academic year,
+    optionally only a teacher's and/or only `student_ids` (delta sync)
+    """
+    active_year = select(AcademicYear.id).where(AcademicYear.is_active == True).scalar_subquery()
+    current_grade = (
+        select(StudentAcademicRecord.grade_level)
+        .where(
+            StudentAcademicRecord.student_id == Student.id,
+            StudentAcademicRecord.academic_year_id == active_year,
+            StudentAcademicRecord.is_active == True,
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Student.id,
+            Student.first_name,
+            Student.last_name,
+            Student.email,
+            Student.date_of_birth,
+            Student.student_id,
+            Student.entry_date,
+            Student.entry_grade_level,
+            Student.is_active,
+            current_grade.label("current_grade"),
+        )
+        .where(Student.is_active == True)
+        .order_by(Student.last_name, Student.first_name)
+    )
+    if teacher_user_id:
+        stmt = stmt.where(Student.id.in_(taught_student_ids(teacher_user_id)))
+    if student_ids is not None:
+        stmt = stmt.where(Student.id.in_(student_ids))
+    return stmt
+
+
+async def list_students(session, teacher_user_id=None, student_ids=None):
+    result = await session.execute(student_list_stmt(teacher_user_id, student_ids))
+    return [dict(row) for row in result.mappings()]
+
+
+# ---------------------------------------------------------------------------
+# Classrooms (ClassroomOut)
+# ---------------------------------------------------------------------------
+
+SUBJECT_COLUMNS = (
+    "id", "name", "code", "subject_type", "applies_to_elementary", "applies_to_middle",
+    "is_homeroom_default", "requires_specialist", "allows_cross_grade",
+    "is_system_core", "created_by_admin",
+)
+ACADEMIC_YEAR_COLUMNS = ("id", "name", "short_name", "start_date", "end_date", "is_active")
+
+
+def classroom_list_stmt(
+    academic_year_id=None, school_id=None, grade_level=None, subject_id=None, teacher_user_id=None, changed=None,
+):
+    """
+    Classrooms with subject, academic year and active enrollment count in one
+    statement; `changed` is extra criteria limiting it to changed rows (delta sync)
+    """
+    counts = select(Enrollment.classroom_id, func.count().label("enrollment_count")).where(Enrollment.is_active == True)
+    if academic_year_id:
+        # prunes the scan to that year's enrollments partition
+        counts = counts.where(Enrollment.academic_year_id == academic_year_id)
+    counts = counts.group_by(Enrollment.classroom_id).subquery()
+
+    stmt = (
+        select(
+            Classroom.id,
+            Classroom.name,
+            Classroom.grade_level,
+            Classroom.classroom_type,
+            Classroom.max_students,
+            Classroom.school_id,
+            Classroom.subject_id,
+            Classroom.academic_year_id,
+            func.coalesce(counts.c.enrollment_count, 0).label("enrollment_count"),
+            *(getattr(Subject, c).label(f"subject__{c}") for c in SUBJECT_COLUMNS),
+            *(getattr(AcademicYear, c).label(f"academic_year__{c}") for c in ACADEMIC_YEAR_COLUMNS),
+        )
+        .outerjoin(Subject, Subject.id == Classroom.subject_id)
+        .outerjoin(AcademicYear, AcademicYear.id == Classroom.academic_year_id)
+        .outerjoin(counts, counts.c.classroom_id == Classroom.id)
+        .order_by(Classroom.name)
+    )
+    if academic_year_id:
+        stmt = stmt.where(Classroom.academic_year_id == academic_year_id)
+    if school_id:
+        stmt = stmt.where(Classroom.school_id == school_id)
+    if grade_level:
+        stmt = stmt.where(Classroom.grade_level == grade_level)
+    if subject_id:
+        stmt = stmt.where(Classroom.subject_id == subject_id)
+    if teacher_user_id:
+        stmt = stmt.join(ClassroomTeacherAssignment, ClassroomTeacherAssignment.classroom_id == Classroom.id).where(
+            ClassroomTeacherAssignment.teacher_user_id == teacher_user_id,
+            ClassroomTeacherAssignment.is_active == True,
+        )
+    if changed is not None:
+        stmt = stmt.where(changed)
+    return stmt
+
+
+def nest_row(row):
+    """Fold `relation__column` labels into nested dicts (None when the outer join missed)"""
+    item = {}
+    for key, value in row.items():
+        relation, sep, column = key.partition("__")
+        if sep:
+            item.setdefault(relation, {})[column] = value
+        else:
+            item[key] = value
+    for relation in ("subject", "academic_year"):
+        if item.get(relation, {}).get("id") is None:
+            item[relation] = None
+    return item
+
+
+async def list_classrooms(session, **filters):
+    result = await session.execute(classroom_list_stmt(**filters))
+    return [nest_row(row) for row in result.mappings()]
+
+
+# ---------------------------------------------------------------------------
+# Users (UserOut, teacher lists, dashboard contacts)
+# ---------------------------------------------------------------------------
+
+async def list_users(session):
+    """Users with their roles and school names in two statements"""
+    users = (await session.execute(
+        select(User.id, User.email, User.first_name, User.last_name, User.is_active)
+        .order_by(User.last_name, User.first_name)
+    )).all()
+    roles = (await session.execute(
+        select(UserRole.user_id, UserRole.role, School.name.label("school_name"), UserRole.is_active)
+        .join(School, School.id == UserRole.school_id)
+    )).all()
+
+    roles_by_user = defaultdict(list)
+    for row in roles:
+        roles_by_user[row.user_id].append({"role": row.role, "school_name": row.school_name, "is_active": row.is_active})
+    return [
+        {
+            "id": u.id,
+            "email": u.email,
+            "first_name": u.first_name,
+            "last_name": u.last_name,
+            "is_active": u.is_active,
+            "roles": roles_by_user.get(u.id, []),
+        }
+        for u in users
+    ]
+
+
+async def list_teachers(session, school_id=None):
+    stmt = (
+        select(User.id, User.first_name, User.last_name, User.email)
+        .join(UserRole, UserRole.user_id == User.id)
+        .where(has_permission(UserRole.permissions, Permission.TEACHER), UserRole.is_active == True)
+    )
+    if school_id:
+        stmt = stmt.where(UserRole.school_id == school_id)
+    stmt = stmt.order_by(User.last_name, User.first_name)
+    return [dict(row) for row in (await session.execute(stmt)).mappings()]
+
+
+def contact(row):
+    """{"id", "name", "email"} entry used throughout the dashboards"""
+    return {"id": str(row.id), "name": f"{row.first_name} {row.last_name}", "email": row.email}
+
+
+async def school_contacts(session, school_ids, permission, exclude_user_id=None, limit=10):
+    """Users holding `permission` at any of `school_ids`, as contact dicts"""
+    stmt = (
+        select(User.id, User.first_name, User.last_name, User.email)
+        .join(UserRole, UserRole.user_id == User.id)
+        .where(
+            UserRole.school_id.in_(school_ids),
+            has_permission(UserRole.permissions, permission),
+            UserRole.is_active == True,
+        )
+    )
+    if exclude_user_id is not None:
+        stmt = stmt.where(User.id != exclude_user_id)
+    stmt = stmt.order_by(User.last_name, User.first_name).limit(limit)
+    return [contact(row) for row in await session.execute(stmt)]
+
+
+def teacher_students_stmt(teacher_user_id, academic_year_id, school_ids):
+    """(id, first_name, last_name, email, school_id) of students in the teacher's classrooms for a year"""
+    teacher_classrooms = select(ClassroomTeacherAssignment.classroom_id).where(
+        ClassroomTeacherAssignment.teacher_user_id == teacher_user_id,
+        ClassroomTeacherAssignment.is_active == True,
+    )
+    # enrollments and academic records are partitioned by academic year, so
+    # filtering both on the year keeps the scan inside one partition each
+    return (
+        select(Student.id, Student.first_name, Student.last_name, Student.email, StudentAcademicRecord.school_id)
+        .join(Enrollment, Enrollment.student_id == Student.id)
+        .join(StudentAcademicRecord, StudentAcademicRecord.student_id == Student.id)
+        .where(
+            Enrollment.academic_year_id == academic_year_id,
+            Enrollment.is_active == True,
+            Enrollment.classroom_id.in_(teacher_classrooms),
+            StudentAcademicRecord.academic_year_id == academic_year_id,
+            StudentAcademicRecord.school_id.in_(school_ids),
+        )
+        .distinct()
+        .order_by(Student.last_name, Student.first_name)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Rooms
+# ---------------------------------------------------------------------------
+
+async def room_availability(session, school_id):
+    """Utilization summary, per-room usage and available rooms by type for a school"""
+    rooms = (await session.execute(
+        select(Room.id, Room.name, Room.room_code, Room.room_type, Room.capacity)
+        .where(Room.school_id == school_id, Room.is_active == True)
+    )).all()
+    used = (await session.execute(
+        select(Classroom.room_id, Classroom.id, Classroom.name, Classroom.grade_level)
+        .join(Room, Room.id == Classroom.room_id)
+        .where(Room.school_id == school_id, Room.is_active == True, Classroom.is_active == True)
+    )).all()
+
+    assigned = {}
+    for row in used:
+        assigned.setdefault(row.room_id, row)  # first classroom wins, as before
+
+    room_usage = []
+    available_by_type = {}
+    for room in rooms:
+        classroom = assigned.get(room.id)
+        room_usage.append({
+            "room_id": str(room.id),
+            "room_name": room.name,
+            "room_code": room.room_code,
+            "room_type": room.room_type,
+            "capacity": room.capacity,
+            "is_available": classroom is None,
+            "assigned_classroom": {
+                "id": str(classroom.id),
+                "name": classroom.name,
+                "grade_level": classroom.grade_level,
+            } if classroom else None,
+        })
+        if classroom is None:
+            available_by_type.setdefault(room.room_type, []).append({
+                "id": str(room.id),
+                "name": room.name,
+                "code": room.room_code,
+                "capacity": room.capacity,
+            })
+
+    return {
+        "summary": utilization_summary(len(rooms), len(used)),
+        "room_usage": room_usage,
+        "available_by_type": available_by_type,
+    }
+
+
+def utilization_summary(total_rooms, used_rooms):
+    return {
+        "total_rooms": total_rooms,
+        "used_rooms": used_rooms,
+        "available_rooms": total_rooms - used_rooms,
+        "utilization_rate": round((used_rooms / total_rooms * 100) if total_rooms > 0 else 0, 1),
+    }
+
+
+async def room_utilization(session, school_ids):
+    """{school_id: utilization summary} as room_availability() computes it, for many schools at once"""
+    totals = dict((await session.execute(
+        select(Room.school_id, func.count())
+        .where(Room.school_id.in_(school_ids), Room.is_active == True)
+        .group_by(Room.school_id)
+    )).all())
+    used = dict((await session.execute(
+        select(Room.school_id, func.count())
+        .join(Classroom, Classroom.room_id == Room.id)
+        .where(Room.school_id.in_(school_ids), Room.is_active == True, Classroom.is_active == True)
+        .group_by(Room.school_id)
+    )).all())
+    return {
+        school_id: utilization_summary(totals.get(school_id, 0), used.get(school_id, 0))
+        for school_id in school_ids
+    }
@@ -0,0 +1,222 @@
+# backend/app/replicas.py
+"""
+Read replicas.
+
+With REPLICA_URLS set (comma-separated database URLs), endpoints that take
+their session from get_read_db run on a streaming replica instead of the
+primary. Replicas are used round-robin; monitor() checks each one every
+replica_check_interval seconds and takes it out of rotation while it is
+unreachable, not streaming from the primary, or more than
+replica_max_lag_seconds behind. With no usable replica, reads go to the
+primary. The replica role needs pg_read_all_stats to see its WAL receiver's
+status; without it every replica reads as not streaming.
+
+Read-your-writes: after a successful write request, the same user's reads go
+to the primary for replica_max_lag_seconds + replica_check_interval, the
+longest a replica still in rotation can be behind. The pin is kept in-process
+by user and in a cookie, so it holds when the user's next request lands on
+another API process.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from .config import get_settings
+from .db import get_sessionmaker
+from .instrumentation import install_query_listeners
+from .security import decode_access_token
+
+logger = logging.getLogger("sis.replicas")
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_COOKIE = "sis_read_primary_until"
+
+# Seconds of WAL replay the replica is behind; 0 when it has replayed all it
+# received (an idle primary would otherwise look like growing lag), NULL when
+# it has not replayed anything yet or its WAL receiver is not streaming - a
+# replica cut off from the primary has replayed all it received, too
+LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class Replica:
+    def __init__(self, url):
+        parsed = make_url(url)
+        self.name = f"{parsed.host}:{parsed.port or 5432}"
+        settings = get_settings()
+        self.engine = create_async_engine(
+            url, future=True, echo=False,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+        install_query_listeners(self.engine)
+        self.sessionmaker = async_sessionmaker(bind=self.engine, expire_on_commit=False, class_=AsyncSession)
+        self.healthy = False  # out of rotation until its first check passes
+        self.lag = None
+
+    async def _measure_lag(self):
+        async with self.engine.connect() as conn:
+            return (await conn.execute(LAG_SQL)).scalar()
+
+    async def check(self, timeout):
+        try:
+            lag = await asyncio.wait_for(self._measure_lag(), timeout)
+        except Exception as exc:
+            if self.healthy:
+                logger.warning("replica %s unreachable: %s", self.name, exc)
+            self.healthy, self.lag = False, None
+            return
+        if lag is None:
+            if self.lag is not None:
+                logger.warning("replica %s out of rotation: not streaming from the primary", self.name)
+        elif not self.healthy or self.lag is None:
+            logger.info("replica %s back in rotation (lag %s s)", self.name, lag)
+        self.healthy, self.lag = True, None if lag is None else float(lag)
+
+
+class ReplicaPool:
+    def __init__(self, urls, max_lag, check_interval):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._turn = itertools.count()
+
+    def usable(self):
+        return [r for r in self.replicas if r.healthy and r.lag is not None and r.lag <= self.max_lag]
+
+    def pick(self):
+        """Next usable replica in round-robin order, or None to use the primary"""
+        usable = self.usable()
+        if not usable:
+            return None
+        return usable[next(self._turn) % len(usable)]
+
+    def mark_down(self, replica):
+        """Take a replica out of rotation until the monitor sees it healthy again"""
+        replica.healthy = False
+
+    async def check_all(self):
+        await asyncio.gather(*(r.check(timeout=self.check_interval) for r in self.replicas))
+
+    async def monitor(self):
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.check_interval)
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+_pool = None
+
+
+def get_replicas():
+    """The configured ReplicaPool, or None when no replicas are configured"""
+    global _pool
+    settings = get_settings()
+    if _pool is None and settings.replica_urls.strip():
+        urls = [url.strip() for url in settings.replica_urls.split(",") if url.strip()]
+        _pool = ReplicaPool(urls, settings.replica_max_lag_seconds, settings.replica_check_interval)
+    return _pool
+
+
+# -- read-your-writes -------------------------------------------------------
+
+_recent_writers = {}  # token subject -> monotonic time until which reads use the primary
+
+
+def pin_window():
+    settings = get_settings()
+    return settings.replica_max_lag_seconds + settings.replica_check_interval
+
+
+def _token_subject(authorization):
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_access_token(token)
+
+
+def pinned_to_primary(request: Request):
+    """Whether this request follows a recent write by the same user"""
+    try:
+        if float(request.cookies.get(PIN_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    subject = _token_subject(request.headers.get("authorization"))
+    return subject is not None and _recent_writers.get(subject, 0) > time.monotonic()
+
+
+def _record_write(subject, window):
+    now = time.monotonic()
+    if len(_recent_writers) > 10_000:
+        for key in [k for k, until in _recent_writers.items() if until <= now]:
+            del _recent_writers[key]
+    _recent_writers[subject] = now + window
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning a user's reads to the primary right after they write"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in READ_METHODS or get_replicas() is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = pin_window()
+                headers = dict(scope["headers"])
+                subject = _token_subject(headers.get(b"authorization", b"").decode("latin-1"))
+                if subject is not None:
+                    _record_write(subject, window)
+                cookie = (
+                    f"{PIN_COOKIE}={int(time.time() + window) + 1}; Max-Age={int(window) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# -- sessions ---------------------------------------------------------------
+
+def read_sessionmaker(request: Request):
+    """(replica or None, session factory) for a read-only request"""
+    pool = get_replicas()
+    replica = None
+    if pool is not None and not pinned_to_primary(request):
+        replica = pool.pick()
+    return replica, replica.sessionmaker if replica else get_sessionmaker()
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    replica, SessionLocal = read_sessionmaker(request)
+    async with SessionLocal() as session:
+        try:
+            yield session
+        except DBAPIError as exc:
+            if replica is not None and (exc.connection_invalidated or isinstance(exc, (InterfaceError, OperationalError))):
+                get_replicas().mark_down(replica)
+            raise
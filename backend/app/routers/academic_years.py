@@ -4,7 +4,10 @@ from sqlalchemy import select, func, update
 from typing import List
 from ..deps import get_db, require_admin, get_current_user
 from ..models.academic_year import AcademicYear
-from ..schemas.academic_year import AcademicYearCreate, AcademicYearOut, AcademicYearUpdate
+from ..schemas.academic_year import AcademicYearCreate, AcademicYearOut, AcademicYearUpdate, RolloverRequest
+from ..services.rollover import run_rollover
+from ..services.partitions import attach_year_partitions, detach_year_partitions
+from ..jobs import enqueue
 
 router = APIRouter(tags=["academic-years"])
 
@@ -71,6 +74,8 @@ async def create_academic_year(
     )
     
     session.add(academic_year)
+    await session.flush()
+    await attach_year_partitions(session, academic_year)
     await session.commit()
     await session.refresh(academic_year)
     return academic_year
@@ -97,4 +102,121 @@ async def activate_academic_year(
     academic_year.is_active = True
     await session.commit()
     await session.refresh(academic_year)
-    return academic_year
\ No newline at end of file
+    return academic_year
+
+@router.post("/{year_id}/rollover", response_model=dict)
+async def rollover_academic_year(
+    year_id: str,
+    payload: RolloverRequest,
+    background: bool = False,
+    session: AsyncSession = Depends(get_db),
+    user: any = Depends(require_admin),
+):
+    """
+    Roll a year forward: clone classroom shells and teacher assignments,
+    promote students by promotion_status, and archive old enrollments.
+    Safe to re-run - completed steps are skipped.
+
+    With ?background=true the rollover is queued as a job and the response
+    carries its id; poll GET /jobs/{job_id} for progress.
+    """
+    from uuid import UUID
+
+    source_year = await session.get(AcademicYear, UUID(year_id))
+    target_year = await session.get(AcademicYear, UUID(payload.target_year_id))
+    if not source_year or not target_year:
+        raise HTTPException(status_code=404, detail="Academic year not found")
+    if source_year.id == target_year.id:
+        raise HTTPException(status_code=400, detail="Target year must differ from source year")
+    if target_year.start_date <= source_year.start_date:
+        raise HTTPException(status_code=400, detail="Target year must start after the source year")
+
+    if background:
+        job = await enqueue(session, "academic_year_rollover", {
+            "source_year_id": str(source_year.id),
+            "target_year_id": str(target_year.id),
+            "activate_target": payload.activate_target,
+        }, created_by=user.id)
+        await session.commit()
+        return {"job_id": str(job.id), "status": job.status}
+
+    await attach_year_partitions(session, target_year)
+    await session.commit()
+
+    counts = await run_rollover(session, source_year, target_year)
+
+    if payload.activate_target:
+        await session.execute(update(AcademicYear).values(is_active=False))
+        await session.execute(
+            update(AcademicYear).where(AcademicYear.id == target_year.id).values(is_active=True)
+        )
+        await session.commit()
+
+    return {
+        "source_year": source_year.name,
+        "target_year": target_year.name,
+        "steps": counts,
+        "target_activated": payload.activate_target,
+    }
+
+@router.post("/{year_id}/partitions/detach", response_model=dict)
+async def detach_academic_year_partitions(
+    year_id: str,
+    session: AsyncSession = Depends(get_db),
+    _: any = Depends(require_admin),
+):
+    """
+    Detach a past year's enrollment, academic record and attendance partitions.
+    The data stays in standalone tables (ready for archiving) and drops out of every query.
+    """
+    from uuid import UUID
+
+    academic_year = await session.get(AcademicYear, UUID(year_id))
+    if not academic_year:
+        raise HTTPException(status_code=404, detail="Academic year not found")
+    if academic_year.is_active:
+        raise HTTPException(status_code=400, detail="Cannot detach the active academic year")
+
+    detached = await detach_year_partitions(session, academic_year)
+    await session.commit()
+    return {"academic_year": academic_year.name, "detached": detached}
+
+@router.post("/{year_id}/partitions/attach", response_model=dict)
+async def attach_academic_year_partitions(
+    year_id: str,
+    session: AsyncSession = Depends(get_db),
+    _: any = Depends(require_admin),
+):
+    """Create or re-attach a year's enrollment and academic record partitions"""
+    from uuid import UUID
+
+    academic_year = await session.get(AcademicYear, UUID(year_id))
+    if not academic_year:
+        raise HTTPException(status_code=404, detail="Academic year not found")
+
+    attached = await attach_year_partitions(session, academic_year)
+    await session.commit()
+    return {"academic_year": academic_year.name, "attached": attached}
+
+@router.post("/{year_id}/recompute-gpa", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+async def recompute_gpa(
+    year_id: str,
+    session: AsyncSession = Depends(get_db),
+    user: any = Depends(require_admin),
+):
+    """
+    Queue a recompute of final GPA and credits earned from the gradebook for
+    every school in the year (poll GET /jobs/{job_id} for progress)
+    """
+    from uuid import UUID
+
+    try:
+        academic_year = await session.get(AcademicYear, UUID(year_id))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid academic year ID format")
+    if not academic_year:
+        raise HTTPException(status_code=404, detail="Academic year not found")
+
+    job = await enqueue(session, "gpa_recompute", {"academic_year_id": str(academic_year.id)}, created_by=user.id)
+    await session.commit()
+    return {"job_id": str(job.id), "status": job.status}
@@ -3,11 +3,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
 from ..deps import get_db, require_admin, get_current_user
+from .. import read_models
 from ..models.user import User
 from ..models.user_role import UserRole
 from ..models.school import School
 from ..schemas.user import UserCreate, UserOut
-from ..security import get_password_hash
+from ..security import get_password_hash_async
+from ..permissions import Permission
 from ..models.user_role import UserRole
 from ..models.user import User
 
@@ -24,49 +26,13 @@ async def test_admin_access(user: User = Depends(get_current_user), session: Asy
     return {
         "user_email": user.email,
         "user_roles": [{"role": ur.role, "school_id": str(ur.school_id), "is_active": ur.is_active} for ur in user_roles],
-        "has_admin_role": any('admin' in ur.role.lower() for ur in user_roles)
+        "permissions": user.permissions,
+        "has_admin_role": bool(user.permissions & Permission.ADMIN)
     }
 
 @router.get("/users", response_model=List[UserOut])
 async def list_users(session: AsyncSession = Depends(get_db), _: any = Depends(require_admin)):
-    # Get users with their roles and schools
-    result = await session.execute(
-        select(User)
-        .order_by(User.last_name, User.first_name)
-    )
-    users = result.scalars().all()
-    
-    # For each user, get their roles
-    user_data = []
-    for user in users:
-        user_roles_result = await session.execute(
-            select(UserRole).where(UserRole.user_id == user.id)
-        )
-        user_roles = user_roles_result.scalars().all()
-        
-        # Get school names for roles
-        roles_with_schools = []
-        for user_role in user_roles:
-            school_result = await session.execute(
-                select(School).where(School.id == user_role.school_id)
-            )
-            school = school_result.scalar_one()
-            roles_with_schools.append({
-                "role": user_role.role,
-                "school_name": school.name if school else "Unknown",
-                "is_active": user_role.is_active
-            })
-        
-        user_data.append({
-            "id": user.id,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "is_active": user.is_active,
-            "roles": roles_with_schools
-        })
-    
-    return user_data
+    return read_models.list_response(await read_models.list_users(session))
 
 
 @router.get("/teachers")
@@ -76,19 +42,7 @@ async def list_teachers(
     _: any = Depends(require_admin),
 ):
     # users having a teacher role at a given school (or any school if not provided)
-    stmt = (
-        select(User)
-        .join(UserRole, UserRole.user_id == User.id)
-        .where(UserRole.role.ilike("%teacher%"), UserRole.is_active == True)
-    )
-    if school_id:
-        stmt = stmt.where(UserRole.school_id == school_id)
-    stmt = stmt.order_by(User.last_name, User.first_name)
-    users = (await session.execute(stmt)).scalars().all()
-    return [
-        {"id": u.id, "first_name": u.first_name, "last_name": u.last_name, "email": u.email}
-        for u in users
-    ]
+    return await read_models.list_teachers(session, school_id)
 
 @router.post("/users", response_model=UserOut)
 async def create_user(
@@ -153,7 +107,7 @@ async def create_user(
     # Create new user
     user = User(
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash_async(user_data.password),
         first_name=user_data.first_name,
         last_name=user_data.last_name,
     )
@@ -0,0 +1,159 @@
+# backend/app/routers/attendance.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import date, datetime
+from typing import List, Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from ..config import get_settings
+from ..deps import get_db, get_read_db, get_current_user, require_admin
+from ..jobs import enqueue
+from .. import read_models
+from ..models.academic_year import AcademicYear
+from ..models.attendance import AttendanceRecord
+from ..models.user import User
+from ..permissions import Permission
+from ..schemas.attendance import AttendanceSubmission, AttendanceOut
+from ..services.attendance import submit, chronic_absence_stmt
+from ..services.sections import ROSTERS
+
+router = APIRouter(tags=["attendance"])
+
+
+def _district_today():
+    return datetime.now(ZoneInfo(get_settings().default_timezone)).date()
+
+
+async def _section_roster(session: AsyncSession, classroom_id: str, user: User):
+    """The cached roster for a section the user may take attendance for"""
+    try:
+        classroom_uuid = UUID(classroom_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid classroom ID format")
+    roster = await ROSTERS.get(session, classroom_uuid)
+    if roster is None:
+        raise HTTPException(status_code=404, detail="Classroom not found")
+    if user.id not in roster.takers and not user.permissions & Permission.ADMIN:
+        raise HTTPException(status_code=403, detail="Not assigned to take attendance for this classroom")
+    return roster
+
+
+@router.post("/sections/{classroom_id}", response_model=dict)
+async def submit_section_attendance(
+    classroom_id: str,
+    payload: AttendanceSubmission,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Record (or correct) a section's attendance for a day in one statement"""
+    roster = await _section_roster(session, classroom_id, user)
+
+    attendance_date = payload.attendance_date or _district_today()
+    if attendance_date > _district_today():
+        raise HTTPException(status_code=400, detail="Cannot record attendance for a future date")
+    if not roster.start_date <= attendance_date <= roster.end_date:
+        raise HTTPException(status_code=400, detail="Date is outside the classroom's academic year")
+
+    submitted = [entry.student_id for entry in payload.records]
+    if len(set(submitted)) != len(submitted):
+        raise HTTPException(status_code=400, detail="Each student may appear only once per submission")
+    not_enrolled = [str(sid) for sid in submitted if sid not in roster.student_ids]
+    if not_enrolled:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Students not enrolled in this classroom", "student_ids": not_enrolled},
+        )
+
+    written = await submit(
+        session, roster, attendance_date,
+        [(e.student_id, e.status, e.minutes_late, e.note) for e in payload.records],
+        recorded_by=user.id,
+    )
+    await session.commit()
+
+    return {
+        "classroom_id": str(roster.classroom_id),
+        "attendance_date": attendance_date.isoformat(),
+        "submitted": len(submitted),
+        "changed": len(written),
+        "not_submitted": [str(sid) for sid in roster.student_ids.difference(submitted)],
+    }
+
+
+@router.get("/sections/{classroom_id}", response_model=List[AttendanceOut])
+async def get_section_attendance(
+    classroom_id: str,
+    attendance_date: Optional[date] = None,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """A section's attendance for a day (today when no date is given)"""
+    roster = await _section_roster(session, classroom_id, user)
+    result = await session.execute(
+        select(AttendanceRecord).where(
+            AttendanceRecord.classroom_id == roster.classroom_id,
+            AttendanceRecord.attendance_date == (attendance_date or _district_today()),
+            AttendanceRecord.academic_year_id == roster.academic_year_id,
+        )
+    )
+    return result.scalars().all()
+
+
+@router.get("/chronic-absence", response_model=List[dict])
+async def chronic_absence(
+    school_id: str,
+    academic_year_id: Optional[str] = None,
+    threshold: float = Query(default=90.0, gt=0, le=100, description="attendance rate (%) below which a student is listed"),
+    min_records: int = Query(default=10, ge=0, description="skip students with fewer attendance records"),
+    session: AsyncSession = Depends(get_read_db),
+    _: any = Depends(require_admin),
+):
+    """Students whose attendance rate is below the threshold, lowest first"""
+    try:
+        school_uuid = UUID(school_id)
+        year_uuid = UUID(academic_year_id) if academic_year_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid ID format")
+    if year_uuid is None:
+        year_uuid = (await session.execute(
+            select(AcademicYear.id).where(AcademicYear.is_active == True)
+        )).scalar_one_or_none()
+        if year_uuid is None:
+            raise HTTPException(status_code=400, detail="No active academic year; pass academic_year_id")
+
+    rows = await session.execute(chronic_absence_stmt(year_uuid, school_uuid, threshold, min_records))
+    return read_models.list_response([
+        {
+            "student_id": str(row.student_id),
+            "district_student_id": row.district_student_id,
+            "name": f"{row.first_name} {row.last_name}",
+            "grade_level": row.grade_level,
+            "attendance_rate": row.attendance_rate,
+            "present": row.attendance_present,
+            "absent": row.attendance_absent,
+            "tardy": row.attendance_tardy,
+            "excused": row.attendance_excused,
+        }
+        for row in rows
+    ])
+
+
+@router.post("/reconcile", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+async def reconcile_attendance(
+    academic_year_id: Optional[str] = None,
+    session: AsyncSession = Depends(get_db),
+    user: any = Depends(require_admin),
+):
+    """Queue a recount of attendance counters from the raw records (poll GET /jobs/{job_id})"""
+    params = {}
+    if academic_year_id:
+        try:
+            params["academic_year_id"] = str(UUID(academic_year_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid academic year ID format")
+    job = await enqueue(session, "attendance_reconcile", params, created_by=user.id)
+    await session.commit()
+    return {"job_id": str(job.id), "status": job.status}
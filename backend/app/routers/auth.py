@@ -8,7 +8,7 @@ from ..models.user import User
 from ..models.user_role import UserRole
 from ..models.user_role_preference import UserRolePreference
 from ..models.school import School
-from ..security import verify_password, create_access_token
+from ..security import verify_password_async, create_access_token
 from ..schemas.auth import Token
 from ..schemas.user import UserOut
 
@@ -18,7 +18,7 @@ router = APIRouter(tags=["auth"])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_session)):
     result = await session.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     token = create_access_token(subject=user.email)
     return {"access_token": token, "token_type": "bearer"}
@@ -5,86 +5,89 @@ Enhanced Classroom Router with Room Integration and Homeroom Preparation
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, text
+from sqlalchemy import select, and_, or_, func, insert
 from sqlalchemy.orm import joinedload, selectinload
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
 import uuid
 
-from ..deps import get_db, require_admin, get_current_user
+from ..deps import get_db, get_read_db, require_admin, get_current_user
+from .. import read_models
+from ..services import sync
+from ..permissions import Permission, has_permission
+from ..tenancy import current_school
 from ..models.classroom import Classroom
 from ..models.classroom_teacher_assignment import ClassroomTeacherAssignment
 from ..models.academic_year import AcademicYear
 from ..models.subject import Subject
 from ..models.user import User
+from ..models.user_role import UserRole
 from ..models.room import Room
-from ..schemas.classroom import ClassroomCreate, ClassroomOut, ClassroomUpdate, ClassroomWithDetails
+from ..schemas.classroom import (
+    ClassroomCreate, ClassroomOut, ClassroomUpdate, ClassroomWithDetails, HomeroomBulkCreate, ClassroomChanges,
+)
 
 router = APIRouter(tags=["classrooms"])
 
-@router.get("", response_model=List[ClassroomOut])
+@router.get("", response_model=Union[List[ClassroomOut], ClassroomChanges])
 async def list_classrooms(
     academic_year_id: Optional[str] = None,
     grade_level: Optional[str] = None,
     subject_id: Optional[str] = None,
     teacher_user_id: Optional[str] = None,
     school_id: Optional[str] = None,
-    session: AsyncSession = Depends(get_db),
+    since: Optional[str] = Query(default=None, description="Sync token; only changes since it (empty for a first sync)"),
+    session: AsyncSession = Depends(get_read_db),
     _: any = Depends(get_current_user),
 ):
-    """Get classrooms with optional filtering and enhanced room information"""
-    query = select(Classroom).options(
-        joinedload(Classroom.subject),
-        joinedload(Classroom.academic_year),
-        selectinload(Classroom.teacher_assignments).joinedload(ClassroomTeacherAssignment.teacher)
-    ).order_by(Classroom.name)
-    
+    """Get classrooms with optional filtering"""
+    token = await sync.new_token(session) if since is not None else None
+
     # Default to active academic year if none specified
     if not academic_year_id:
-        result = await session.execute(select(AcademicYear).where(AcademicYear.is_active == True))
-        active_year = result.scalar_one_or_none()
-        if active_year:
-            academic_year_id = str(active_year.id)
-    
-    if academic_year_id:
-        query = query.where(Classroom.academic_year_id == UUID(academic_year_id))
-    
-    if grade_level:
-        query = query.where(Classroom.grade_level == grade_level)
-    
-    if subject_id:
-        query = query.where(Classroom.subject_id == UUID(subject_id))
-    
-    if teacher_user_id:
-        query = query.join(ClassroomTeacherAssignment).where(
-            and_(
-                ClassroomTeacherAssignment.teacher_user_id == UUID(teacher_user_id),
-                ClassroomTeacherAssignment.is_active == True
-            )
-        )
-    
-    result = await session.execute(query)
-    classrooms = result.scalars().all()
-    
-    # Add enrollment count and room information for each classroom
-    for classroom in classrooms:
-        # Get enrollment count (when enrollment model exists)
-        # For now, set to 0 as placeholder
-        classroom.enrollment_count = 0
-        
-        # Get room information if room_id exists
-        if hasattr(classroom, 'room_id') and classroom.room_id:
-            room_result = await session.execute(
-                select(Room).where(Room.id == classroom.room_id)
-            )
-            classroom.room = room_result.scalar_one_or_none()
-    
-    return classrooms
+        result = await session.execute(select(AcademicYear.id).where(AcademicYear.is_active == True))
+        active_year_id = result.scalar_one_or_none()
+        if active_year_id:
+            academic_year_id = str(active_year_id)
+    filters = dict(
+        academic_year_id=UUID(academic_year_id) if academic_year_id else None,
+        school_id=UUID(school_id) if school_id else None,
+        grade_level=grade_level,
+        subject_id=UUID(subject_id) if subject_id else None,
+        teacher_user_id=UUID(teacher_user_id) if teacher_user_id else None,
+    )
+
+    if since is None:
+        return read_models.list_response(await read_models.list_classrooms(session, **filters))
+
+    since_txid = sync.parse_token(since)
+    changes = None
+    if since_txid is not None:
+        changes = await sync.changes_since(session, since_txid, {
+            "classrooms": "entity_id",
+            "enrollments": "owner_id",  # enrollment_count
+            "classroom_teacher_assignments": "owner_id",  # teacher_user_id filter
+            "subjects": "entity_id",
+            "academic_years": "entity_id",  # the default year may have moved
+        })
+    if changes is None or changes["academic_years"]:
+        return read_models.list_response(sync.delta(token, await read_models.list_classrooms(session, **filters)))
+
+    changed_ids = changes["classrooms"] | changes["enrollments"] | changes["classroom_teacher_assignments"]
+    classrooms = await read_models.list_classrooms(
+        session,
+        changed=or_(
+            Classroom.id.in_(sync.uuids(changed_ids)),
+            Classroom.subject_id.in_(sync.uuids(changes["subjects"])),
+        ),
+        **filters,
+    )
+    return read_models.list_response(sync.delta(token, classrooms, changed_ids))
 
 @router.get("/{classroom_id}", response_model=ClassroomWithDetails)
 async def get_classroom(
     classroom_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     _: any = Depends(get_current_user),
 ):
     """Get detailed classroom information including enrollments and teachers"""
@@ -104,6 +107,15 @@ async def get_classroom(
     
     return classroom
 
+def _classroom_school(school_id, room=None):
+    """School a new classroom belongs to: the one given, else its room's, else the request's"""
+    school = UUID(school_id) if school_id else room.school_id if room else current_school()
+    if school is None:
+        raise HTTPException(status_code=400, detail="school_id is required")
+    if room and room.school_id != school:
+        raise HTTPException(status_code=400, detail="Room belongs to a different school")
+    return school
+
 @router.post("", response_model=ClassroomOut, status_code=status.HTTP_201_CREATED)
 async def create_classroom(
     payload: ClassroomCreate,
@@ -146,6 +158,7 @@ async def create_classroom(
     classroom_data = {
         "id": uuid.uuid4(),
         "name": payload.name,
+        "school_id": _classroom_school(payload.school_id, room),
         "subject_id": UUID(payload.subject_id),
         "academic_year_id": UUID(payload.academic_year_id),
         "grade_level": payload.grade_level,
@@ -245,6 +258,7 @@ async def create_homeroom_classroom(
     classroom = Classroom(
         id=uuid.uuid4(),
         name=classroom_name,
+        school_id=_classroom_school(payload.get("school_id"), room),
         subject_id=primary_subject.id,
         academic_year_id=UUID(academic_year_id),
         grade_level=grade_level,
@@ -277,9 +291,136 @@ async def create_homeroom_classroom(
     
     # TODO: In Phase A.2, this will create assignments for ALL core subjects
     # and implement the full homeroom intelligence system
-    
+    # (see /homeroom/bulk for the multi-subject version)
+
     return classroom
 
+@router.post("/homeroom/bulk", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def bulk_create_homerooms(
+    payload: HomeroomBulkCreate,
+    session: AsyncSession = Depends(get_db),
+    _: any = Depends(require_admin),
+):
+    """
+    Create the full core-subject classroom set plus teacher assignments for
+    many homerooms at once, using multi-row inserts in a single transaction
+    """
+    if not payload.homerooms:
+        raise HTTPException(status_code=400, detail="At least one homeroom is required")
+
+    academic_year = await session.get(AcademicYear, UUID(payload.academic_year_id))
+    if not academic_year:
+        raise HTTPException(status_code=400, detail="Academic year not found")
+
+    # Validate all teachers and rooms with one query each
+    teacher_ids = {UUID(h.teacher_id) for h in payload.homerooms}
+    teachers = {
+        t.id: t for t in (await session.execute(
+            select(User).where(User.id.in_(teacher_ids))
+        )).scalars().all()
+    }
+    missing_teachers = [str(t) for t in teacher_ids if t not in teachers]
+    if missing_teachers:
+        raise HTTPException(status_code=400, detail=f"Teachers not found: {', '.join(missing_teachers)}")
+
+    school_id = _classroom_school(payload.school_id)
+    room_ids = {UUID(h.room_id) for h in payload.homerooms if h.room_id}
+    if room_ids:
+        found_rooms = dict((await session.execute(
+            select(Room.id, Room.school_id).where(and_(Room.id.in_(room_ids), Room.is_active == True))
+        )).all())
+        missing_rooms = [str(r) for r in room_ids if r not in found_rooms]
+        if missing_rooms:
+            raise HTTPException(status_code=400, detail=f"Rooms not found: {', '.join(missing_rooms)}")
+        other_school = [str(r) for r in room_ids if found_rooms[r] != school_id]
+        if other_school:
+            raise HTTPException(
+                status_code=400, detail=f"Rooms belong to a different school: {', '.join(other_school)}"
+            )
+
+    core_subjects = (await session.execute(
+        select(Subject).where(Subject.is_homeroom_default == True).order_by(Subject.name)
+    )).scalars().all()
+    if not core_subjects:
+        raise HTTPException(
+            status_code=400,
+            detail="No core subjects found for homeroom assignment. Please create core subjects first."
+        )
+
+    # Skip (teacher, grade, subject) sets that already exist this year so reruns are safe
+    existing = set((await session.execute(
+        select(
+            ClassroomTeacherAssignment.teacher_user_id,
+            Classroom.grade_level,
+            Classroom.subject_id
+        )
+        .join(Classroom, Classroom.id == ClassroomTeacherAssignment.classroom_id)
+        .where(
+            and_(
+                Classroom.academic_year_id == academic_year.id,
+                Classroom.classroom_type == "HOMEROOM",
+                ClassroomTeacherAssignment.teacher_user_id.in_(teacher_ids),
+                ClassroomTeacherAssignment.is_active == True
+            )
+        )
+    )).all())
+
+    classroom_rows = []
+    assignment_rows = []
+    skipped = 0
+    for homeroom in payload.homerooms:
+        teacher = teachers[UUID(homeroom.teacher_id)]
+        for subject in core_subjects:
+            if (teacher.id, homeroom.grade_level, subject.id) in existing:
+                skipped += 1
+                continue
+            existing.add((teacher.id, homeroom.grade_level, subject.id))
+
+            classroom_id = uuid.uuid4()
+            classroom_rows.append({
+                "id": classroom_id,
+                "name": f"Grade {homeroom.grade_level} {subject.name} - {teacher.last_name}"[:100],
+                "school_id": school_id,
+                "subject_id": subject.id,
+                "academic_year_id": academic_year.id,
+                "grade_level": homeroom.grade_level,
+                "classroom_type": "HOMEROOM",
+                "max_students": homeroom.max_students,
+                "room_id": UUID(homeroom.room_id) if homeroom.room_id else None,
+                "is_active": True,
+            })
+            assignment_rows.append({
+                "id": uuid.uuid4(),
+                "classroom_id": classroom_id,
+                "teacher_user_id": teacher.id,
+                "role_name": "Homeroom Teacher",
+                "can_view_grades": True,
+                "can_modify_grades": True,
+                "can_take_attendance": True,
+                "can_view_parent_contact": True,
+                "can_create_assignments": True,
+                "start_date": academic_year.start_date,
+                "is_active": True,
+            })
+
+    if classroom_rows:
+        await session.execute(insert(Classroom), classroom_rows)
+        await session.execute(insert(ClassroomTeacherAssignment), assignment_rows)
+        await session.commit()
+
+    return {
+        "academic_year_id": str(academic_year.id),
+        "homerooms": len(payload.homerooms),
+        "core_subjects": [s.code for s in core_subjects],
+        "classrooms_created": len(classroom_rows),
+        "assignments_created": len(assignment_rows),
+        "skipped_existing": skipped,
+        "classrooms": [
+            {"id": str(row["id"]), "name": row["name"], "grade_level": row["grade_level"]}
+            for row in classroom_rows
+        ],
+    }
+
 @router.get("/available-rooms", response_model=List[dict])
 async def get_available_rooms(
     grade_level: Optional[str] = None,
@@ -334,38 +475,36 @@ async def get_teachers_for_assignment(
 ):
     """Get available teachers for classroom assignment"""
     
-    # Get users with teacher role
-    query = text("""
-        SELECT DISTINCT u.id, u.first_name, u.last_name, u.email
-        FROM users u
-        JOIN user_roles ur ON u.id = ur.user_id
-        WHERE ur.role ILIKE '%teacher%' 
-        AND ur.is_active = true
-        AND u.is_active = true
-        ORDER BY u.last_name, u.first_name
-    """)
-    
-    result = await session.execute(query)
-    teachers = result.fetchall()
-    
-    teacher_list = []
-    for teacher in teachers:
-        # Get current classroom assignments
-        assignment_query = await session.execute(
-            select(func.count(ClassroomTeacherAssignment.id)).where(
-                and_(
-                    ClassroomTeacherAssignment.teacher_user_id == teacher.id,
-                    ClassroomTeacherAssignment.is_active == True
-                )
-            )
+    # Teachers with an active teacher role, at the request's school when it has one
+    teaching_users = (
+        select(UserRole.user_id)
+        .where(has_permission(UserRole.permissions, Permission.TEACHER), UserRole.is_active == True)
+    )
+    if current_school() is not None:
+        teaching_users = teaching_users.where(UserRole.school_id == current_school())
+    assignment_counts = (
+        select(ClassroomTeacherAssignment.teacher_user_id, func.count().label("current_assignments"))
+        .where(ClassroomTeacherAssignment.is_active == True)
+        .group_by(ClassroomTeacherAssignment.teacher_user_id)
+        .subquery()
+    )
+    result = await session.execute(
+        select(
+            User.id, User.first_name, User.last_name, User.email,
+            func.coalesce(assignment_counts.c.current_assignments, 0).label("current_assignments"),
         )
-        current_assignments = assignment_query.scalar()
-        
+        .outerjoin(assignment_counts, assignment_counts.c.teacher_user_id == User.id)
+        .where(User.id.in_(teaching_users), User.is_active == True)
+        .order_by(User.last_name, User.first_name)
+    )
+
+    teacher_list = []
+    for teacher in result:
         teacher_list.append({
             "id": str(teacher.id),
             "name": f"{teacher.first_name} {teacher.last_name}",
             "email": teacher.email,
-            "current_assignments": current_assignments,
+            "current_assignments": teacher.current_assignments,
             "available": True  # Will add capacity logic later
         })
     
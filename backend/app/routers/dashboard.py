@@ -1,22 +1,26 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-import sqlalchemy as sa
 
-from ..deps import get_db, require_admin, require_role, get_current_user
+from ..config import get_settings
+from ..deps import get_read_db, require_admin, require_role, get_current_user
+from .. import read_models
+from ..permissions import Permission, has_permission
+from ..services.dashboard_events import HUB
+from ..tenancy import current_school
 from ..models.user import User
 from ..models.user_role import UserRole
 from ..models.school import School
-from ..models.school_year import SchoolYear
-from ..models.enrollment import Enrollment
-from ..models.classroom import Classroom
-from ..models.student import Student
+from ..models.academic_year import AcademicYear
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("/admin_overview")
-async def admin_overview(session: AsyncSession = Depends(get_db), _: User = Depends(require_admin)):
+async def admin_overview(session: AsyncSession = Depends(get_read_db), _: User = Depends(require_admin)):
     total_users = (await session.execute(select(func.count()).select_from(User))).scalar_one()
     total_schools = (await session.execute(select(func.count()).select_from(School))).scalar_one()
 
@@ -31,15 +35,12 @@ async def admin_overview(session: AsyncSession = Depends(get_db), _: User = Depe
 
     # Recent users (by created_at if present; fallback to email)
     recent_users_rows = (await session.execute(
-        select(User).order_by(User.created_at.desc()).limit(5)
-    )).scalars().all()
+        select(User.id, User.first_name, User.last_name, User.email, User.is_active)
+        .order_by(User.created_at.desc())
+        .limit(5)
+    )).all()
     recent_users = [
-        {
-            "id": str(u.id),
-            "name": f"{u.first_name} {u.last_name}",
-            "email": u.email,
-            "is_active": u.is_active,
-        }
+        {**read_models.contact(u), "is_active": u.is_active}
         for u in recent_users_rows
     ]
 
@@ -54,103 +55,56 @@ async def admin_overview(session: AsyncSession = Depends(get_db), _: User = Depe
 @router.get("/teacher_overview")
 async def teacher_overview(
     user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_role("teacher")),
-    school_year_id: str | None = None,
+    academic_year_id: str | None = None,
 ):
     # Schools where this user is a teacher
-    teacher_roles = (await session.execute(
-        select(UserRole).where(
+    school_ids = (await session.execute(
+        select(UserRole.school_id).where(
             UserRole.user_id == user.id,
-            UserRole.role.ilike("%teacher%"),
+            has_permission(UserRole.permissions, Permission.TEACHER),
             UserRole.is_active == True,
         )
     )).scalars().all()
-    school_ids = [tr.school_id for tr in teacher_roles]
 
     schools = []
     colleagues = []
     admins = []
     students = []
     if school_ids:
-        schools = (await session.execute(select(School).where(School.id.in_(school_ids)))).scalars().all()
+        schools = (await session.execute(select(School.id, School.name).where(School.id.in_(school_ids)))).all()
         # Colleagues: other teachers in same schools
-        colleagues_rows = (await session.execute(
-            select(User)
-            .join(UserRole, UserRole.user_id == User.id)
-            .where(
-                UserRole.school_id.in_(school_ids),
-                UserRole.role.ilike("%teacher%"),
-                UserRole.is_active == True,
-                User.id != user.id,
-            )
-            .order_by(User.last_name, User.first_name)
-            .limit(10)
-        )).scalars().all()
-        colleagues = [
-            {"id": str(u.id), "name": f"{u.first_name} {u.last_name}", "email": u.email}
-            for u in colleagues_rows
-        ]
+        colleagues = await read_models.school_contacts(session, school_ids, Permission.TEACHER, exclude_user_id=user.id)
         # Admin contacts in same schools
-        admins_rows = (await session.execute(
-            select(User)
-            .join(UserRole, UserRole.user_id == User.id)
-            .where(
-                UserRole.school_id.in_(school_ids),
-                UserRole.role.ilike("admin%"),
-                UserRole.is_active == True,
-            )
-            .order_by(User.last_name, User.first_name)
-            .limit(10)
-        )).scalars().all()
-        admins = [
-            {"id": str(u.id), "name": f"{u.first_name} {u.last_name}", "email": u.email}
-            for u in admins_rows
-        ]
+        admins = await read_models.school_contacts(session, school_ids, Permission.ADMIN)
 
-        # Determine selected/active year
-        year_uuid = None
-        if school_year_id:
-            year_uuid = school_year_id
-        else:
-            active_year = (await session.execute(select(SchoolYear).where(SchoolYear.is_active == True))).scalar_one_or_none()
-            if active_year:
-                year_uuid = str(active_year.id)
+    # Students taught by this teacher in the selected (or active) academic year
+    year_uuid = UUID(academic_year_id) if academic_year_id else (await session.execute(
+        select(AcademicYear.id).where(AcademicYear.is_active == True)
+    )).scalar_one_or_none()
 
-        # Students taught by this teacher (homeroom classrooms owned by teacher), filtered by year when provided
+    counts = []
+    if school_ids and year_uuid is not None:
         student_rows = (await session.execute(
-            select(Student)
-            .join(Enrollment, Enrollment.student_id == Student.id)
-            .join(Classroom, Classroom.id == Enrollment.classroom_id)
-            .where(
-                Classroom.teacher_user_id == user.id,
-                Classroom.school_id.in_(school_ids),
-                (Enrollment.school_year_id == year_uuid) if year_uuid is not None else sa.true(),
-            )
-            .order_by(Student.last_name, Student.first_name)
-        )).scalars().all()
-        students = [
-            {"id": str(s.id), "name": f"{s.first_name} {s.last_name}", "email": s.email}
-            for s in student_rows
+            read_models.teacher_students_stmt(user.id, year_uuid, school_ids)
+        )).all()
+        students = [read_models.contact(s) for s in student_rows]
+
+        # Student counts per school for the year
+        per_school = {}
+        for row in student_rows:
+            per_school[row.school_id] = per_school.get(row.school_id, 0) + 1
+        counts = [
+            {
+                "school_id": str(sid),
+                "school_name": next((s.name for s in schools if s.id == sid), ""),
+                "year_id": str(year_uuid),
+                "student_count": per_school.get(sid, 0),
+            }
+            for sid in school_ids
         ]
 
-    # Student counts per school and per (active) year
-    counts = []
-    for sid in school_ids:
-        # use selected/active year for counts
-        if school_year_id:
-            year_id = school_year_id
-        else:
-            active_year = (await session.execute(select(SchoolYear).where(SchoolYear.is_active == True))).scalar_one_or_none()
-            year_id = active_year.id if active_year else None
-        total = (await session.execute(
-            select(func.count())
-            .select_from(Enrollment)
-            .join(Classroom, Classroom.id == Enrollment.classroom_id)
-            .where(Classroom.school_id == sid, (Enrollment.school_year_id == year_id) if year_id is not None else sa.true(), Classroom.teacher_user_id == user.id)
-        )).scalar_one()
-        counts.append({"school_id": str(sid), "school_name": next((s.name for s in schools if s.id == sid), ""), "year_id": str(year_id) if year_id else None, "student_count": total})
-
     return {
         "schools": [{"id": s.id, "name": s.name} for s in schools],
         "colleagues": colleagues,
@@ -163,38 +117,23 @@ async def teacher_overview(
 @router.get("/parent_overview")
 async def parent_overview(
     user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_role("parent")),
 ):
     # Schools where this user is a parent
-    parent_roles = (await session.execute(
-        select(UserRole).where(
+    school_ids = (await session.execute(
+        select(UserRole.school_id).where(
             UserRole.user_id == user.id,
-            UserRole.role.ilike("%parent%"),
+            has_permission(UserRole.permissions, Permission.PARENT),
             UserRole.is_active == True,
         )
     )).scalars().all()
-    school_ids = [pr.school_id for pr in parent_roles]
 
     schools = []
     admins = []
     if school_ids:
-        schools = (await session.execute(select(School).where(School.id.in_(school_ids)))).scalars().all()
-        admins_rows = (await session.execute(
-            select(User)
-            .join(UserRole, UserRole.user_id == User.id)
-            .where(
-                UserRole.school_id.in_(school_ids),
-                UserRole.role.ilike("admin%"),
-                UserRole.is_active == True,
-            )
-            .order_by(User.last_name, User.first_name)
-            .limit(10)
-        )).scalars().all()
-        admins = [
-            {"id": str(u.id), "name": f"{u.first_name} {u.last_name}", "email": u.email}
-            for u in admins_rows
-        ]
+        schools = (await session.execute(select(School.id, School.name).where(School.id.in_(school_ids)))).all()
+        admins = await read_models.school_contacts(session, school_ids, Permission.ADMIN)
 
     return {
         "schools": [{"id": s.id, "name": s.name} for s in schools],
@@ -202,3 +141,36 @@ async def parent_overview(
     }
 
 
+@router.get("/events")
+async def dashboard_events(
+    school_id: Optional[UUID] = None,
+    user: User = Depends(require_role("admin", "teacher")),
+    session: AsyncSession = Depends(get_read_db),
+):
+    """
+    Server-Sent Events stream of a school's dashboard changes (default: the
+    user's active school); see app/services/dashboard_events.py for events
+    """
+    if not get_settings().change_feed_enabled:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Live updates are disabled")
+    school_id = school_id or current_school()
+    if school_id is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="school_id is required")
+    if not user.permissions & Permission.ADMIN:
+        teaches_there = (await session.execute(
+            select(UserRole.user_id).where(
+                UserRole.user_id == user.id,
+                UserRole.school_id == school_id,
+                has_permission(UserRole.permissions, Permission.TEACHER),
+                UserRole.is_active == True,
+            ).limit(1)
+        )).scalar_one_or_none()
+        if teaches_there is None:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No teacher role at this school")
+
+    # Dependencies (and their sessions) are closed before the body streams
+    return StreamingResponse(
+        HUB.stream(school_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
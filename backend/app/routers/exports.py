@@ -0,0 +1,227 @@
+# backend/app/routers/exports.py
+"""
+Streaming exports for state reporting.
+
+GET /exports/{entity}?format=csv|ndjson streams every row through a
+server-side cursor (yield_per), encoding one chunk per fetched batch, so
+memory stays flat however large the district is.
+"""
+
+import csv
+import io
+from typing import Optional
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import get_sessionmaker
+from ..deps import get_read_db, require_admin
+from ..replicas import read_sessionmaker
+from ..permissions import Permission, has_permission
+from ..models.academic_year import AcademicYear
+from ..models.classroom import Classroom
+from ..models.enrollment import Enrollment
+from ..models.parent import Parent
+from ..models.parent_student_relationship import ParentStudentRelationship
+from ..models.school import School
+from ..models.student import Student
+from ..models.student_academic_record import StudentAcademicRecord
+from ..models.user import User
+from ..models.user_role import UserRole
+
+router = APIRouter(tags=["exports"])
+
+EXPORT_BATCH_ROWS = 2000
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _academic_record(year_id):
+    """Join condition for a student's record in the export year"""
+    return and_(
+        StudentAcademicRecord.student_id == Student.id,
+        StudentAcademicRecord.academic_year_id == year_id,
+    )
+
+
+def students_export(year_id, school_id):
+    stmt = (
+        select(
+            Student.id,
+            Student.student_id.label("district_student_id"),
+            Student.first_name,
+            Student.last_name,
+            Student.email,
+            Student.date_of_birth,
+            Student.entry_date,
+            Student.entry_grade_level,
+            StudentAcademicRecord.grade_level,
+            StudentAcademicRecord.program_type,
+            School.name.label("school_name"),
+            Student.is_active,
+        )
+        .outerjoin(StudentAcademicRecord, _academic_record(year_id))
+        .outerjoin(School, School.id == StudentAcademicRecord.school_id)
+        .order_by(Student.last_name, Student.first_name, Student.id)
+    )
+    if school_id:
+        stmt = stmt.where(StudentAcademicRecord.school_id == school_id)
+    return stmt
+
+
+def enrollments_export(year_id, school_id):
+    stmt = (
+        select(
+            Enrollment.id,
+            Enrollment.student_id,
+            Student.student_id.label("district_student_id"),
+            Student.first_name,
+            Student.last_name,
+            Enrollment.classroom_id,
+            Classroom.name.label("classroom_name"),
+            Classroom.grade_level,
+            Enrollment.enrollment_date,
+            Enrollment.enrollment_status,
+            Enrollment.withdrawal_date,
+            Enrollment.withdrawal_reason,
+            Enrollment.is_active,
+        )
+        .join(Student, Student.id == Enrollment.student_id)
+        .join(Classroom, Classroom.id == Enrollment.classroom_id)
+        .where(Enrollment.academic_year_id == year_id)  # one partition
+        .order_by(Classroom.name, Student.last_name, Student.first_name, Enrollment.id)
+    )
+    if school_id:
+        stmt = stmt.join(StudentAcademicRecord, _academic_record(year_id)).where(
+            StudentAcademicRecord.school_id == school_id
+        )
+    return stmt
+
+
+def parent_contacts_export(year_id, school_id):
+    stmt = (
+        select(
+            Student.id.label("student_id"),
+            Student.student_id.label("district_student_id"),
+            Student.first_name.label("student_first_name"),
+            Student.last_name.label("student_last_name"),
+            User.first_name.label("parent_first_name"),
+            User.last_name.label("parent_last_name"),
+            User.email.label("parent_email"),
+            ParentStudentRelationship.relationship_type,
+            ParentStudentRelationship.custody_status,
+            ParentStudentRelationship.is_emergency_contact,
+            ParentStudentRelationship.emergency_priority,
+            ParentStudentRelationship.can_pickup_student,
+            Parent.preferred_contact_method,
+        )
+        .join(Student, Student.id == ParentStudentRelationship.student_id)
+        .join(Parent, Parent.id == ParentStudentRelationship.parent_id)
+        .join(User, User.id == Parent.user_id)
+        .where(ParentStudentRelationship.is_active == True)
+        .order_by(Student.last_name, Student.first_name, Student.id, ParentStudentRelationship.emergency_priority)
+    )
+    if school_id:
+        stmt = stmt.join(StudentAcademicRecord, _academic_record(year_id)).where(
+            StudentAcademicRecord.school_id == school_id
+        )
+    return stmt
+
+
+def staff_export(year_id, school_id):
+    stmt = (
+        select(
+            User.id,
+            User.first_name,
+            User.last_name,
+            User.email,
+            UserRole.role,
+            School.name.label("school_name"),
+            UserRole.is_active.label("role_is_active"),
+            User.is_active,
+        )
+        .join(UserRole, UserRole.user_id == User.id)
+        .join(School, School.id == UserRole.school_id)
+        .where(has_permission(UserRole.permissions, Permission.TEACHER | Permission.ADMIN))
+        .order_by(User.last_name, User.first_name, User.id, School.name)
+    )
+    if school_id:
+        stmt = stmt.where(UserRole.school_id == school_id)
+    return stmt
+
+
+EXPORTS = {
+    "students": students_export,
+    "enrollments": enrollments_export,
+    "parent-contacts": parent_contacts_export,
+    "staff": staff_export,
+}
+
+
+def _csv_chunk(rows, header=None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunk(keys, rows):
+    return b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+async def stream_export(stmt, fmt, SessionLocal=None):
+    """Yield encoded chunks of `stmt`'s rows from a server-side cursor"""
+    # The request's session is closed before the body is sent, so the
+    # stream owns its session for as long as the client keeps reading
+    SessionLocal = SessionLocal or get_sessionmaker()
+    async with SessionLocal() as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_ROWS))
+        keys = list(result.keys())
+        if fmt == "csv":
+            yield _csv_chunk([], header=keys)
+        async for rows in result.partitions():
+            if fmt == "csv":
+                yield _csv_chunk(rows)
+            else:
+                yield _ndjson_chunk(keys, rows)
+
+
+@router.get("/{entity}")
+async def export_entity(
+    entity: str,
+    request: Request,
+    format: str = Query(default="csv", regex="^(csv|ndjson)$"),
+    academic_year_id: Optional[str] = Query(default=None),
+    school_id: Optional[str] = Query(default=None),
+    session: AsyncSession = Depends(get_read_db),
+    _: any = Depends(require_admin),
+):
+    """Stream a full export of students, enrollments, parent-contacts or staff"""
+    build = EXPORTS.get(entity)
+    if build is None:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{entity}'. Available: {', '.join(EXPORTS)}")
+
+    try:
+        school_uuid = UUID(school_id) if school_id else None
+        year_uuid = UUID(academic_year_id) if academic_year_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid ID format")
+
+    if year_uuid is None:
+        year_uuid = (await session.execute(
+            select(AcademicYear.id).where(AcademicYear.is_active == True)
+        )).scalar_one_or_none()
+        if year_uuid is None:
+            raise HTTPException(status_code=400, detail="No active academic year; pass academic_year_id")
+
+    return StreamingResponse(
+        stream_export(build(year_uuid, school_uuid), format, read_sessionmaker(request)[1]),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'},
+    )
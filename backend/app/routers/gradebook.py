@@ -0,0 +1,131 @@
+# backend/app/routers/gradebook.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from uuid import UUID
+
+from ..deps import get_db, get_current_user
+from ..models.gradebook import GradeCategory, Assignment
+from ..models.user import User
+from ..permissions import Permission
+from ..schemas.gradebook import GradeCategoryCreate, AssignmentCreate, ScoreUpdate
+from ..services.gradebook import GRADEBOOKS, bump_version, write_score
+from ..services.sections import ROSTERS
+
+router = APIRouter(tags=["gradebook"])
+
+
+async def _section_roster(session: AsyncSession, classroom_id: str, user: User, modify: bool):
+    """The cached roster for a section the user may view (or, with modify, change) grades for"""
+    try:
+        classroom_uuid = UUID(classroom_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid classroom ID format")
+    roster = await ROSTERS.get(session, classroom_uuid)
+    if roster is None:
+        raise HTTPException(status_code=404, detail="Classroom not found")
+    allowed = roster.graders if modify else roster.grade_viewers
+    if user.id not in allowed and not user.permissions & Permission.ADMIN:
+        raise HTTPException(status_code=403, detail="Not assigned to grade this classroom")
+    return roster
+
+
+@router.get("/sections/{classroom_id}", response_model=dict)
+async def get_gradebook(
+    classroom_id: str,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    A section's gradebook: assignments, each student's scores in assignment
+    order (null where not graded), category percentages, grade and letter
+    """
+    roster = await _section_roster(session, classroom_id, user, modify=False)
+    gradebook = await GRADEBOOKS.get(session, roster)
+    return gradebook.response()
+
+
+@router.post("/sections/{classroom_id}/categories", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def create_category(
+    classroom_id: str,
+    payload: GradeCategoryCreate,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    roster = await _section_roster(session, classroom_id, user, modify=True)
+    category = GradeCategory(classroom_id=roster.classroom_id, **payload.dict())
+    session.add(category)
+    try:
+        await session.flush()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Category name already exists in this classroom")
+    await bump_version(session, roster.classroom_id)
+    await session.commit()
+    GRADEBOOKS.invalidate(roster.classroom_id)
+    return {"id": str(category.id), "name": category.name, "weight": category.weight}
+
+
+@router.post("/sections/{classroom_id}/assignments", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def create_assignment(
+    classroom_id: str,
+    payload: AssignmentCreate,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    roster = await _section_roster(session, classroom_id, user, modify=True)
+    category = (await session.execute(
+        select(GradeCategory.id).where(
+            GradeCategory.id == payload.category_id,
+            GradeCategory.classroom_id == roster.classroom_id,
+        )
+    )).scalar_one_or_none()
+    if category is None:
+        raise HTTPException(status_code=400, detail="Category not found in this classroom")
+
+    assignment = Assignment(classroom_id=roster.classroom_id, created_by=user.id, **payload.dict())
+    session.add(assignment)
+    await session.flush()
+    await bump_version(session, roster.classroom_id)
+    await session.commit()
+    GRADEBOOKS.invalidate(roster.classroom_id)
+    return {
+        "id": str(assignment.id),
+        "title": assignment.title,
+        "category_id": str(assignment.category_id),
+        "points_possible": assignment.points_possible,
+        "due_date": assignment.due_date.isoformat() if assignment.due_date else None,
+    }
+
+
+@router.put("/sections/{classroom_id}/scores", response_model=dict)
+async def update_score(
+    classroom_id: str,
+    payload: ScoreUpdate,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Set one student's score on one assignment; returns the student's recomputed gradebook row"""
+    roster = await _section_roster(session, classroom_id, user, modify=True)
+    gradebook = await GRADEBOOKS.get(session, roster)
+    if payload.assignment_id not in gradebook.column:
+        raise HTTPException(status_code=404, detail="Assignment not found in this classroom")
+    if payload.student_id not in gradebook.row:
+        raise HTTPException(status_code=400, detail="Student not enrolled in this classroom")
+
+    version = await write_score(
+        session, roster.classroom_id, payload.student_id, payload.assignment_id,
+        payload.points, payload.is_excused, payload.is_missing, graded_by=user.id,
+    )
+    await session.commit()
+
+    row = GRADEBOOKS.score_written(
+        roster.classroom_id, version, payload.student_id, payload.assignment_id,
+        payload.points, payload.is_excused, payload.is_missing,
+    )
+    if row is None:
+        gradebook = await GRADEBOOKS.get(session, roster)
+        row = gradebook.rows[gradebook.row[payload.student_id]]
+    return {"version": version, "student": row}
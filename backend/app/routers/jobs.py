@@ -0,0 +1,88 @@
+# backend/app/routers/jobs.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional
+from uuid import UUID
+
+from ..deps import get_db, require_admin, get_current_user
+from ..jobs import request_cancel, requeue, QUEUED, RUNNING, FAILED, CANCELLED
+from ..models.job import Job
+from ..models.user import User
+from ..permissions import Permission
+from ..schemas.job import JobOut
+
+router = APIRouter(tags=["jobs"])
+
+
+async def _get_visible_job(session: AsyncSession, job_id: str, user: User) -> Job:
+    """A job is visible to admins and to the user who started it"""
+    try:
+        job_uuid = UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    job = await session.get(Job, job_uuid)
+    if not job or (job.created_by != user.id and not user.permissions & Permission.ADMIN):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("", response_model=List[JobOut])
+async def list_jobs(
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    limit: int = Query(default=50, le=500),
+    session: AsyncSession = Depends(get_db),
+    _: any = Depends(require_admin),
+):
+    """Most recent jobs first"""
+    query = select(Job).order_by(Job.created_at.desc()).limit(limit)
+    if status:
+        query = query.where(Job.status == status)
+    if kind:
+        query = query.where(Job.kind == kind)
+    result = await session.execute(query)
+    return result.scalars().all()
+
+
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Status, progress and result of a job"""
+    return await _get_visible_job(session, job_id, user)
+
+
+@router.post("/{job_id}/cancel", response_model=JobOut)
+async def cancel_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Cancel a queued job, or ask a running one to stop"""
+    job = await _get_visible_job(session, job_id, user)
+    if job.status not in (QUEUED, RUNNING):
+        raise HTTPException(status_code=400, detail=f"Job is already {job.status}")
+    await request_cancel(session, job)
+    await session.commit()
+    await session.refresh(job)
+    return job
+
+
+@router.post("/{job_id}/retry", response_model=JobOut)
+async def retry_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """Queue a failed or cancelled job again"""
+    job = await _get_visible_job(session, job_id, user)
+    if job.status not in (FAILED, CANCELLED):
+        raise HTTPException(status_code=400, detail=f"Only failed or cancelled jobs can be retried (job is {job.status})")
+    await requeue(session, job)
+    await session.commit()
+    await session.refresh(job)
+    return job
@@ -14,9 +14,11 @@ from ..models.user import User
 from ..models.student import Student
 from ..schemas.parent import (
     ParentCreate, ParentOut, ParentUpdate,
-    ParentStudentRelationshipCreate, ParentStudentRelationshipOut, ParentStudentRelationshipUpdate
+    ParentStudentRelationshipCreate, ParentStudentRelationshipOut, ParentStudentRelationshipUpdate,
+    EmergencyContactLookup,
 )
-from ..security import get_password_hash
+from ..security import get_password_hash_async
+from ..services.emergency_contacts import INDEX as EMERGENCY_CONTACTS
 
 router = APIRouter(tags=["parents"])
 
@@ -52,7 +54,7 @@ async def create_parent(
         # Create new user account
         user = User(
             email=payload.email,
-            hashed_password=get_password_hash(payload.password),
+            hashed_password=await get_password_hash_async(payload.password),
             first_name=payload.first_name,
             last_name=payload.last_name,
         )
@@ -82,8 +84,11 @@ async def get_parent_students(
     """Get all students for a parent"""
     from uuid import UUID
     
-    relationships = ParentStudentRelationship.get_parent_students(session, UUID(parent_id))
-    return relationships
+    try:
+        parent_uuid = UUID(parent_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid parent ID format")
+    return await ParentStudentRelationship.get_parent_students(session, parent_uuid)
 
 @router.post("/relationships", response_model=ParentStudentRelationshipOut, status_code=status.HTTP_201_CREATED)
 async def create_parent_student_relationship(
@@ -131,4 +136,22 @@ async def create_parent_student_relationship(
     session.add(relationship)
     await session.commit()
     await session.refresh(relationship)
-    return relationship
\ No newline at end of file
+    return relationship
+
+@router.post("/emergency-contacts/lookup", response_model=dict)
+async def lookup_emergency_contacts(
+    payload: EmergencyContactLookup,
+    session: AsyncSession = Depends(get_db),
+    _: any = Depends(require_admin),
+):
+    """Emergency contacts in priority order for a whole school, some grades, or a list of students"""
+    from uuid import UUID
+    
+    try:
+        school_id = UUID(payload.school_id)
+        student_ids = [UUID(sid) for sid in payload.student_ids or []]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid ID format")
+    return await EMERGENCY_CONTACTS.lookup(
+        session, school_id, student_ids=student_ids, grade_levels=payload.grade_levels,
+    )
@@ -2,17 +2,23 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from typing import List, Optional
-from ..deps import get_db, require_admin, get_current_user
+from sqlalchemy import select, func, and_, or_, update
+from sqlalchemy.orm import joinedload
+from typing import List, Optional, Union
+from ..deps import get_db, get_read_db, require_admin, get_current_user
+from .. import read_models
+from ..services import sync
+from ..tenancy import district_wide
 from ..models.room import Room
 from ..models.classroom import Classroom
-from ..schemas.room import RoomCreate, RoomOut, RoomUpdate
+from ..models.academic_year import AcademicYear
+from ..schemas.room import RoomCreate, RoomOut, RoomUpdate, RoomAssignmentPlanApply, RoomChanges
+from ..services.room_assignment import solve_assignment
 from uuid import UUID
 
 router = APIRouter(tags=["rooms"])
 
-@router.get("", response_model=List[RoomOut])
+@router.get("", response_model=Union[List[RoomOut], RoomChanges])
 async def list_rooms(
     school_id: Optional[str] = None,
     room_type: Optional[str] = None,
@@ -23,10 +29,12 @@ async def list_rooms(
     has_computers: Optional[bool] = None,
     has_smartboard: Optional[bool] = None,
     has_sink: Optional[bool] = None,
+    since: Optional[str] = Query(default=None, description="Sync token; only changes since it (empty for a first sync)"),
     session: AsyncSession = Depends(get_db),
     _: any = Depends(get_current_user),
 ):
     """Get rooms with comprehensive filtering options"""
+    token = await sync.new_token(session) if since is not None else None
     query = select(Room).where(Room.is_active == True).order_by(Room.name)
     
     if school_id:
@@ -61,97 +69,32 @@ async def list_rooms(
             and_(Classroom.room_id.isnot(None), Classroom.is_active == True)
         )
         query = query.where(Room.id.notin_(used_rooms_subquery))
-    
-    result = await session.execute(query)
-    return result.scalars().all()
+
+    if since is None:
+        result = await session.execute(query)
+        return result.scalars().all()
+
+    since_txid = sync.parse_token(since)
+    changes = None
+    if since_txid is not None:
+        keys = {"rooms": "entity_id"}
+        if available_only:
+            keys["classrooms"] = "entity_id"  # rooms freed by a classroom aren't named by its event
+        changes = await sync.changes_since(session, since_txid, keys)
+    if changes is None or changes.get("classrooms"):
+        return sync.delta(token, (await session.execute(query)).scalars().all())
+
+    result = await session.execute(query.where(Room.id.in_(sync.uuids(changes["rooms"]))))
+    return sync.delta(token, result.scalars().all(), changes["rooms"])
 
 @router.get("/availability", response_model=dict)
 async def get_room_availability(
     school_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     _: any = Depends(get_current_user),
 ):
     """Get comprehensive room availability and utilization data"""
-    
-    # Get all rooms for the school
-    rooms_result = await session.execute(
-        select(Room).where(
-            and_(Room.school_id == UUID(school_id), Room.is_active == True)
-        )
-    )
-    all_rooms = rooms_result.scalars().all()
-    
-    # Get rooms currently in use by classrooms
-    used_rooms_result = await session.execute(
-        select(Room, Classroom)
-        .join(Classroom, Room.id == Classroom.room_id)
-        .where(
-            and_(
-                Room.school_id == UUID(school_id),
-                Room.is_active == True,
-                Classroom.is_active == True
-            )
-        )
-    )
-    used_rooms_data = used_rooms_result.all()
-    
-    # Process the data
-    total_rooms = len(all_rooms)
-    used_rooms = len(used_rooms_data)
-    available_rooms = total_rooms - used_rooms
-    utilization_rate = round((used_rooms / total_rooms * 100) if total_rooms > 0 else 0, 1)
-    
-    # Room usage details
-    room_usage = []
-    used_room_ids = {room.Room.id for room in used_rooms_data}
-    
-    for room in all_rooms:
-        usage_info = {
-            "room_id": str(room.id),
-            "room_name": room.name,
-            "room_code": room.room_code,
-            "room_type": room.room_type,
-            "capacity": room.capacity,
-            "is_available": room.id not in used_room_ids,
-            "assigned_classroom": None
-        }
-        
-        # Find assigned classroom if any
-        for used_room in used_rooms_data:
-            if used_room.Room.id == room.id:
-                usage_info["assigned_classroom"] = {
-                    "id": str(used_room.Classroom.id),
-                    "name": used_room.Classroom.name,
-                    "grade_level": used_room.Classroom.grade_level
-                }
-                break
-        
-        room_usage.append(usage_info)
-    
-    # Available rooms by type
-    available_by_type = {}
-    for room in all_rooms:
-        if room.id not in used_room_ids:
-            room_type = room.room_type
-            if room_type not in available_by_type:
-                available_by_type[room_type] = []
-            available_by_type[room_type].append({
-                "id": str(room.id),
-                "name": room.name,
-                "code": room.room_code,
-                "capacity": room.capacity
-            })
-    
-    return {
-        "summary": {
-            "total_rooms": total_rooms,
-            "used_rooms": used_rooms,
-            "available_rooms": available_rooms,
-            "utilization_rate": utilization_rate
-        },
-        "room_usage": room_usage,
-        "available_by_type": available_by_type
-    }
+    return await read_models.room_availability(session, UUID(school_id))
 
 @router.get("/suggestions", response_model=List[dict])
 async def get_room_suggestions(
@@ -162,13 +105,16 @@ async def get_room_suggestions(
     needs_computers: bool = False,
     needs_smartboard: bool = False,
     needs_sink: bool = False,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     _: any = Depends(get_current_user),
 ):
     """Get smart room suggestions based on requirements"""
     
     # Start with available rooms
-    query = select(Room).where(
+    query = select(
+        Room.id, Room.name, Room.room_code, Room.room_type, Room.capacity,
+        Room.has_projector, Room.has_computers, Room.has_smartboard, Room.has_sink,
+    ).where(
         and_(
             Room.school_id == UUID(school_id),
             Room.is_active == True
@@ -201,7 +147,7 @@ async def get_room_suggestions(
         query = query.where(Room.has_sink == True)
     
     result = await session.execute(query.order_by(Room.capacity))
-    rooms = result.scalars().all()
+    rooms = result.all()
     
     # Score rooms based on how well they match requirements
     suggestions = []
@@ -265,9 +211,152 @@ async def get_room_suggestions(
     
     # Sort by score (highest first)
     suggestions.sort(key=lambda x: x["score"], reverse=True)
-    
+
     return suggestions
 
+async def _resolve_academic_year_id(session: AsyncSession, academic_year_id: Optional[str]) -> UUID:
+    if academic_year_id:
+        return UUID(academic_year_id)
+    result = await session.execute(select(AcademicYear.id).where(AcademicYear.is_active == True))
+    active_year_id = result.scalar_one_or_none()
+    if not active_year_id:
+        raise HTTPException(status_code=400, detail="No active academic year found")
+    return active_year_id
+
+def _rooms_in_use_subquery(academic_year_id: UUID):
+    return select(Classroom.room_id).where(
+        and_(
+            Classroom.room_id.isnot(None),
+            Classroom.is_active == True,
+            Classroom.academic_year_id == academic_year_id
+        )
+    )
+
+@router.get("/assignment-plan", response_model=dict)
+async def get_room_assignment_plan(
+    school_id: str,
+    academic_year_id: Optional[str] = None,
+    session: AsyncSession = Depends(get_db),
+    _: any = Depends(require_admin),
+):
+    """
+    Propose rooms for every classroom of the school in the academic year that
+    has none, solved globally as a min-cost matching instead of one room at a time
+    """
+    year_id = await _resolve_academic_year_id(session, academic_year_id)
+
+    classrooms_result = await session.execute(
+        select(Classroom)
+        .options(joinedload(Classroom.subject))
+        .where(
+            and_(
+                Classroom.school_id == UUID(school_id),
+                Classroom.academic_year_id == year_id,
+                Classroom.room_id.is_(None),
+                Classroom.is_active == True
+            )
+        )
+        .order_by(Classroom.name)
+    )
+    classrooms = classrooms_result.scalars().all()
+
+    rooms_result = await session.execute(
+        select(Room).where(
+            and_(
+                Room.school_id == UUID(school_id),
+                Room.is_active == True,
+                Room.id.notin_(_rooms_in_use_subquery(year_id))
+            )
+        ).order_by(Room.capacity, Room.name)
+    )
+    rooms = rooms_result.scalars().all()
+
+    assignments, unassigned = solve_assignment(classrooms, rooms)
+
+    return {
+        "academic_year_id": str(year_id),
+        "school_id": school_id,
+        "summary": {
+            "unplaced_classrooms": len(classrooms),
+            "available_rooms": len(rooms),
+            "assigned": len(assignments),
+            "unassigned": len(unassigned),
+            "total_cost": round(sum(a["cost"] for a in assignments), 2)
+        },
+        "assignments": assignments,
+        "unassigned": unassigned
+    }
+
+@router.post("/assignment-plan/apply", response_model=dict)
+async def apply_room_assignment_plan(
+    payload: RoomAssignmentPlanApply,
+    session: AsyncSession = Depends(get_db),
+    _: any = Depends(require_admin),
+):
+    """Apply a proposed room plan atomically - all assignments or none"""
+    year_id = UUID(payload.academic_year_id)
+    pairs = [(UUID(a.classroom_id), UUID(a.room_id)) for a in payload.assignments]
+    if not pairs:
+        return {"applied": 0}
+
+    classroom_ids = [c for c, _ in pairs]
+    room_ids = [r for _, r in pairs]
+    if len(set(classroom_ids)) != len(classroom_ids) or len(set(room_ids)) != len(room_ids):
+        raise HTTPException(status_code=400, detail="Each classroom and room may appear only once in a plan")
+
+    # Classrooms must still be unplaced in this year
+    placeable = dict((await session.execute(
+        select(Classroom.id, Classroom.school_id).where(
+            and_(
+                Classroom.id.in_(classroom_ids),
+                Classroom.academic_year_id == year_id,
+                Classroom.room_id.is_(None),
+                Classroom.is_active == True
+            )
+        ).with_for_update()
+    )).all())
+
+    # Rooms must still be free in this year
+    free_rooms = dict((await session.execute(
+        select(Room.id, Room.school_id).where(
+            and_(
+                Room.id.in_(room_ids),
+                Room.is_active == True,
+                Room.id.notin_(_rooms_in_use_subquery(year_id))
+            )
+        )
+    )).all())
+
+    stale_classrooms = [str(c) for c in classroom_ids if c not in placeable]
+    stale_rooms = [str(r) for r in room_ids if r not in free_rooms]
+    if stale_classrooms or stale_rooms:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Plan is out of date; request a new plan",
+                "classrooms_already_placed": stale_classrooms,
+                "rooms_no_longer_available": stale_rooms
+            }
+        )
+
+    other_school = [str(c) for c, r in pairs if placeable[c] != free_rooms[r]]
+    if other_school:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "Classrooms can only be placed in rooms of their own school",
+                "classrooms": other_school
+            }
+        )
+
+    await session.execute(
+        update(Classroom),
+        [{"id": classroom_id, "room_id": room_id} for classroom_id, room_id in pairs]
+    )
+    await session.commit()
+
+    return {"applied": len(pairs)}
+
 @router.post("", response_model=RoomOut, status_code=status.HTTP_201_CREATED)
 async def create_room(
     payload: RoomCreate,
@@ -282,16 +371,17 @@ async def create_room(
     if not school:
         raise HTTPException(status_code=400, detail="School not found")
     
-    # Check for duplicate room code at school
-    existing = await session.execute(
-        select(Room).where(
-            and_(
-                Room.school_id == UUID(payload.school_id), 
-                Room.room_code == payload.room_code,
-                Room.is_active == True
+    # Check for duplicate room code at school (the payload's, not the request's scope)
+    with district_wide():
+        existing = await session.execute(
+            select(Room).where(
+                and_(
+                    Room.school_id == UUID(payload.school_id), 
+                    Room.room_code == payload.room_code,
+                    Room.is_active == True
+                )
             )
         )
-    )
     if existing.scalar_one_or_none():
         raise HTTPException(
             status_code=400, 
@@ -338,7 +428,7 @@ async def get_room(
 @router.get("/{room_id}/usage", response_model=dict)
 async def get_room_usage(
     room_id: str,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
     _: any = Depends(get_current_user),
 ):
     """Get detailed usage information for a specific room"""
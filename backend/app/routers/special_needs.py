@@ -7,7 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
-from ..deps import get_db, require_admin, get_current_user
+from ..deps import get_db, require_admin, get_current_user, require_student_access
+from ..tenancy import district_wide
 from ..models.special_needs_tag_library import SpecialNeedsTagLibrary
 from ..models.student_special_need import StudentSpecialNeed
 from ..schemas.special_needs import (
@@ -48,12 +49,13 @@ async def create_special_needs_tag(
     
     # Check for duplicate tag code
     school_id_uuid = UUID(payload.school_id) if payload.school_id else None
-    existing = await session.execute(
-        select(SpecialNeedsTagLibrary).where(
-            SpecialNeedsTagLibrary.tag_code == payload.tag_code.upper(),
-            SpecialNeedsTagLibrary.school_id == school_id_uuid
+    with district_wide():  # the payload's school, not the request's scope
+        existing = await session.execute(
+            select(SpecialNeedsTagLibrary).where(
+                SpecialNeedsTagLibrary.tag_code == payload.tag_code.upper(),
+                SpecialNeedsTagLibrary.school_id == school_id_uuid
+            )
         )
-    )
     if existing.scalar_one_or_none():
         scope = "school" if payload.school_id else "district"
         raise HTTPException(status_code=400, detail=f"Tag code already exists for this {scope}")
@@ -76,7 +78,7 @@ async def get_student_special_needs(
     student_id: str,
     active_only: bool = True,
     session: AsyncSession = Depends(get_db),
-    _: any = Depends(get_current_user),
+    _: any = Depends(require_student_access),
 ):
     """Get all special needs assignments for a student"""
     from uuid import UUID
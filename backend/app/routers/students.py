@@ -5,29 +5,32 @@ import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from sqlalchemy.orm import joinedload
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from ..deps import get_db, require_admin, get_current_user
+from ..deps import get_db, get_read_db, require_admin, require_role, get_current_user, require_student_access
+from .. import read_models
+from ..services import sync
 from ..models.student import Student
+from ..models.user import User
 from ..models.school import School
 from ..models.classroom import Classroom
 from ..models.enrollment import Enrollment
 from ..models.academic_year import AcademicYear
-from ..schemas.student import StudentCreate, StudentOut, StudentUpdate, StudentWithDetails
+from ..schemas.student import StudentCreate, StudentOut, StudentUpdate, StudentWithDetails, StudentChanges
 
 router = APIRouter(prefix="/students", tags=["students"])
 
-@router.get("", response_model=List[StudentOut])
+@router.get("", response_model=Union[List[StudentOut], StudentChanges])
 async def list_students(
     school_id: Optional[str] = Query(default=None),
     grade_level: Optional[str] = Query(default=None),
     academic_year_id: Optional[str] = Query(default=None),
-    session: AsyncSession = Depends(get_db),
+    since: Optional[str] = Query(default=None, description="Sync token; only changes since it (empty for a first sync)"),
+    session: AsyncSession = Depends(get_read_db),
     _: any = Depends(get_current_user),
 ):
     """Get students with optional filtering"""
-    query = select(Student).where(Student.is_active == True).order_by(Student.last_name, Student.first_name)
-    
+    token = await sync.new_token(session) if since is not None else None
     if school_id:
         try:
             school_uuid = uuid.UUID(str(school_id))
@@ -40,16 +43,38 @@ async def list_students(
     if grade_level:
         # Filter by current grade level through academic records
         pass  # Implement when needed
-    
-    result = await session.execute(query)
-    students = result.scalars().all()
-    return students
+
+    if since is None:
+        return read_models.list_response(await read_models.list_students(session))
+
+    since_txid = sync.parse_token(since)
+    changes = None
+    if since_txid is not None:
+        changes = await sync.changes_since(session, since_txid, {
+            "students": "entity_id",
+            "student_academic_records": "owner_id",  # current_grade, school scope
+            "academic_years": "entity_id",  # current_grade follows the active year
+        })
+    if changes is None or changes["academic_years"]:
+        return read_models.list_response(sync.delta(token, await read_models.list_students(session)))
+
+    changed_ids = changes["students"] | changes["student_academic_records"]
+    students = await read_models.list_students(session, student_ids=sync.uuids(changed_ids))
+    return read_models.list_response(sync.delta(token, students, changed_ids))
+
+@router.get("/mine", response_model=List[StudentOut])
+async def list_my_students(
+    session: AsyncSession = Depends(get_read_db),
+    user: User = Depends(require_role("teacher")),
+):
+    """Students enrolled in the current user's active sections"""
+    return read_models.list_response(await read_models.list_students(session, teacher_user_id=user.id))
 
 @router.get("/{student_id}", response_model=StudentWithDetails)
 async def get_student(
     student_id: str,
     session: AsyncSession = Depends(get_db),
-    _: any = Depends(get_current_user),
+    _: any = Depends(require_student_access),
 ):
     """Get detailed student information"""
     try:
@@ -210,24 +235,35 @@ async def enroll_student_in_classroom(
     if not classroom:
         raise HTTPException(status_code=404, detail="Classroom not found")
     
-    # Check if already enrolled
-    existing = await session.execute(
+    # Check if already enrolled (one row per student and classroom, withdrawn or not)
+    existing = (await session.execute(
         select(Enrollment).where(
             and_(
                 Enrollment.student_id == student_uuid,
                 Enrollment.classroom_id == classroom_uuid,
-                Enrollment.is_active == True
+                Enrollment.academic_year_id == classroom.academic_year_id
             )
         )
-    )
-    if existing.scalar_one_or_none():
+    )).scalar_one_or_none()
+    if existing and existing.is_active:
         raise HTTPException(status_code=400, detail="Student already enrolled in this classroom")
     
-    # Create enrollment
     from datetime import date
+    if existing:
+        # Re-enroll a withdrawn student
+        existing.is_active = True
+        existing.enrollment_status = "ACTIVE"
+        existing.enrollment_date = date.today()
+        existing.withdrawal_date = None
+        existing.withdrawal_reason = None
+        await session.commit()
+        return {"message": "Student enrolled successfully"}
+    
+    # Create enrollment
     enrollment = Enrollment(
         student_id=student_uuid,
         classroom_id=classroom_uuid,
+        academic_year_id=classroom.academic_year_id,
         enrollment_date=date.today(),
         enrollment_status="ACTIVE"
     )
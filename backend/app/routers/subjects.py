@@ -1,23 +1,26 @@
 # backend/app/routers/subjects.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from typing import List, Optional
+from typing import List, Optional, Union
 from ..deps import get_db, require_admin, get_current_user
 from ..models.subject import Subject
-from ..schemas.subject import SubjectCreate, SubjectOut, SubjectUpdate
+from ..schemas.subject import SubjectCreate, SubjectOut, SubjectUpdate, SubjectChanges
+from ..services import sync
 
 router = APIRouter(tags=["subjects"])
 
-@router.get("", response_model=List[SubjectOut])
+@router.get("", response_model=Union[List[SubjectOut], SubjectChanges])
 async def list_subjects(
     grade_band: Optional[str] = None,  # "elementary", "middle"
     subject_type: Optional[str] = None,  # "CORE", "ENRICHMENT", "SPECIAL"
+    since: Optional[str] = Query(default=None, description="Sync token; only changes since it (empty for a first sync)"),
     session: AsyncSession = Depends(get_db),
     _: any = Depends(get_current_user),
 ):
     """Get subjects with optional filtering"""
+    token = await sync.new_token(session) if since is not None else None
     query = select(Subject).order_by(Subject.name)
     
     if grade_band == "elementary":
@@ -27,9 +30,20 @@ async def list_subjects(
     
     if subject_type:
         query = query.where(Subject.subject_type == subject_type.upper())
-    
-    result = await session.execute(query)
-    return result.scalars().all()
+
+    if since is None:
+        result = await session.execute(query)
+        return result.scalars().all()
+
+    since_txid = sync.parse_token(since)
+    changes = None
+    if since_txid is not None:
+        changes = await sync.changes_since(session, since_txid, {"subjects": "entity_id"})
+    if changes is None:
+        return sync.delta(token, (await session.execute(query)).scalars().all())
+
+    result = await session.execute(query.where(Subject.id.in_(sync.uuids(changes["subjects"]))))
+    return sync.delta(token, result.scalars().all(), changes["subjects"])
 
 @router.get("/core", response_model=List[SubjectOut])
 async def get_core_subjects(
@@ -61,6 +75,7 @@ async def create_subject(
         is_homeroom_default=payload.is_homeroom_default,
         requires_specialist=payload.requires_specialist,
         allows_cross_grade=payload.allows_cross_grade,
+        credits=payload.credits,
         is_system_core=False,  # Admin-created subjects are never system core
         created_by_admin=True,
     )
@@ -84,6 +99,10 @@ async def update_subject(
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
     
+    # Credit value is district policy, editable on every subject
+    if payload.credits is not None:
+        subject.credits = payload.credits
+
     # Prevent major changes to system core subjects
     if subject.is_system_core:
         # Only allow name changes for system subjects
@@ -55,4 +55,8 @@ class AcademicYearOut(AcademicYearBase):
 
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RolloverRequest(BaseModel):
+    target_year_id: str
+    activate_target: bool = False
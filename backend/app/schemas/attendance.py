@@ -0,0 +1,42 @@
+# backend/app/schemas/attendance.py
+
+from pydantic import BaseModel, validator
+from datetime import date
+from typing import Optional, List
+from uuid import UUID
+
+ATTENDANCE_STATUSES = ['PRESENT', 'ABSENT', 'TARDY', 'EXCUSED']
+
+class AttendanceEntry(BaseModel):
+    student_id: UUID
+    status: str
+    minutes_late: Optional[int] = None
+    note: Optional[str] = None
+
+    @validator('status')
+    def status_valid(cls, v):
+        v = v.upper()
+        if v not in ATTENDANCE_STATUSES:
+            raise ValueError(f'Status must be one of: {ATTENDANCE_STATUSES}')
+        return v
+
+    @validator('note')
+    def note_length(cls, v):
+        if v is not None and len(v) > 200:
+            raise ValueError('Note must be at most 200 characters')
+        return v
+
+class AttendanceSubmission(BaseModel):
+    attendance_date: Optional[date] = None  # today in the district timezone when omitted
+    records: List[AttendanceEntry]
+
+class AttendanceOut(BaseModel):
+    student_id: UUID
+    attendance_date: date
+    status: str
+    minutes_late: Optional[int] = None
+    note: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
@@ -15,6 +15,7 @@ class ClassroomBase(BaseModel):
 class ClassroomCreate(ClassroomBase):
     subject_id: str
     academic_year_id: str
+    school_id: Optional[str] = None  # defaults to the room's school, then the request's
 
 class ClassroomUpdate(BaseModel):
     name: Optional[str] = None
@@ -22,6 +23,17 @@ class ClassroomUpdate(BaseModel):
     classroom_type: Optional[str] = None
     max_students: Optional[int] = None
 
+class HomeroomSpec(BaseModel):
+    teacher_id: str
+    grade_level: str
+    room_id: Optional[str] = None
+    max_students: Optional[int] = 25
+
+class HomeroomBulkCreate(BaseModel):
+    academic_year_id: str
+    school_id: Optional[str] = None  # defaults to the request's school
+    homerooms: List[HomeroomSpec]
+
 class TeacherAssignmentOut(BaseModel):
     id: UUID
     teacher_user_id: UUID
@@ -40,6 +52,7 @@ class TeacherAssignmentOut(BaseModel):
 
 class ClassroomOut(ClassroomBase):
     id: UUID
+    school_id: Optional[UUID] = None
     subject_id: UUID
     academic_year_id: UUID
     subject: Optional[SubjectOut] = None
@@ -56,4 +69,10 @@ class ClassroomWithDetails(ClassroomOut):
 
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ClassroomChanges(BaseModel):
+    token: str
+    reset: bool
+    items: List[ClassroomOut]
+    removed: List[UUID] = []
@@ -0,0 +1,62 @@
+# backend/app/schemas/gradebook.py
+
+from pydantic import BaseModel, validator, root_validator
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+class GradeCategoryCreate(BaseModel):
+    name: str
+    weight: float
+    position: int = 0
+
+    @validator('name')
+    def name_valid(cls, v):
+        v = v.strip()
+        if not v or len(v) > 50:
+            raise ValueError('Name must be 1-50 characters')
+        return v
+
+    @validator('weight')
+    def weight_valid(cls, v):
+        if v < 0:
+            raise ValueError('Weight cannot be negative')
+        return v
+
+class AssignmentCreate(BaseModel):
+    category_id: UUID
+    title: str
+    points_possible: float
+    due_date: Optional[date] = None
+
+    @validator('title')
+    def title_valid(cls, v):
+        v = v.strip()
+        if not v or len(v) > 200:
+            raise ValueError('Title must be 1-200 characters')
+        return v
+
+    @validator('points_possible')
+    def points_possible_valid(cls, v):
+        if v <= 0:
+            raise ValueError('Points possible must be positive')
+        return v
+
+class ScoreUpdate(BaseModel):
+    assignment_id: UUID
+    student_id: UUID
+    points: Optional[float] = None  # None clears the score
+    is_excused: bool = False
+    is_missing: bool = False
+
+    @validator('points')
+    def points_valid(cls, v):
+        if v is not None and v < 0:
+            raise ValueError('Points cannot be negative')
+        return v
+
+    @root_validator(skip_on_failure=True)
+    def excused_or_missing(cls, values):
+        if values.get('is_excused') and values.get('is_missing'):
+            raise ValueError('A score cannot be both excused and missing')
+        return values
@@ -0,0 +1,28 @@
+# backend/app/schemas/job.py
+
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+class JobOut(BaseModel):
+    id: UUID
+    kind: str
+    status: str
+    params: dict = {}
+    progress_done: int = 0
+    progress_total: Optional[int] = None
+    progress_message: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    created_by: Optional[UUID] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
@@ -73,4 +73,9 @@ class ParentStudentRelationshipOut(ParentStudentRelationshipBase):
 
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class EmergencyContactLookup(BaseModel):
+    school_id: str
+    student_ids: Optional[List[str]] = None  # all students when omitted
+    grade_levels: Optional[List[str]] = None
@@ -1,7 +1,7 @@
 # backend/app/schemas/room.py
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 class RoomBase(BaseModel):
@@ -37,4 +37,18 @@ class RoomOut(RoomBase):
 
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RoomAssignmentItem(BaseModel):
+    classroom_id: str
+    room_id: str
+
+class RoomAssignmentPlanApply(BaseModel):
+    academic_year_id: str
+    assignments: List[RoomAssignmentItem]
+
+class RoomChanges(BaseModel):
+    token: str
+    reset: bool
+    items: List[RoomOut]
+    removed: List[UUID] = []
@@ -45,3 +45,8 @@ class StudentWithDetails(StudentOut):
         orm_mode = True
         from_attributes = True
 
+class StudentChanges(BaseModel):
+    token: str
+    reset: bool
+    items: List[StudentOut]
+    removed: List[UUID] = []
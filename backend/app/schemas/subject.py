@@ -1,7 +1,7 @@
 # backend/app/schemas/subject.py
 
 from pydantic import BaseModel, validator
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 class SubjectBase(BaseModel):
@@ -13,6 +13,7 @@ class SubjectBase(BaseModel):
     is_homeroom_default: bool = False
     requires_specialist: bool = False
     allows_cross_grade: bool = False
+    credits: float = 1.0
 
     @validator('code')
     def code_uppercase_alphanumeric(cls, v):
@@ -30,6 +31,12 @@ class SubjectBase(BaseModel):
             raise ValueError(f'Subject type must be one of: {valid_types}')
         return v
 
+    @validator('credits')
+    def credits_valid(cls, v):
+        if v < 0:
+            raise ValueError('Credits cannot be negative')
+        return v
+
 class SubjectCreate(SubjectBase):
     pass
 
@@ -41,6 +48,13 @@ class SubjectUpdate(BaseModel):
     is_homeroom_default: Optional[bool] = None
     requires_specialist: Optional[bool] = None
     allows_cross_grade: Optional[bool] = None
+    credits: Optional[float] = None
+
+    @validator('credits')
+    def credits_valid(cls, v):
+        if v is not None and v < 0:
+            raise ValueError('Credits cannot be negative')
+        return v
 
 class SubjectOut(SubjectBase):
     id: UUID
@@ -49,4 +63,10 @@ class SubjectOut(SubjectBase):
 
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SubjectChanges(BaseModel):
+    token: str
+    reset: bool
+    items: List[SubjectOut]
+    removed: List[UUID] = []
@@ -1,12 +1,18 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from typing import Optional
 
 from .config import get_settings
+from .metrics import BCRYPT_QUEUE
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow (~250ms); run it off the event loop on a small pool
+_hash_executor = ThreadPoolExecutor(max_workers=get_settings().bcrypt_workers, thread_name_prefix="bcrypt")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -16,6 +22,22 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_hash(func, *args):
+    BCRYPT_QUEUE.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        BCRYPT_QUEUE.dec()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash(get_password_hash, password)
+
+
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     settings = get_settings()
     to_encode = {"sub": subject}
@@ -0,0 +1,53 @@
+# backend/app/services/access.py
+"""
+Row-level access to students.
+
+Admins see every student. Teachers see students enrolled in a section they
+are actively assigned to, checked against the trigger-maintained
+teacher_student_access projection (one primary-key prefix lookup instead of
+enrollments -> classrooms -> teacher assignments joins). Parents see their
+own children through an active relationship.
+"""
+
+from sqlalchemy import select
+
+from ..models.parent import Parent
+from ..models.parent_student_relationship import ParentStudentRelationship
+from ..models.teacher_student_access import TeacherStudentAccess
+from ..permissions import Permission
+
+
+def taught_student_ids(teacher_user_id):
+    """Subquery of the students a teacher currently teaches - an index range scan on the projection"""
+    return (
+        select(TeacherStudentAccess.student_id)
+        .where(TeacherStudentAccess.teacher_user_id == teacher_user_id)
+        .distinct()
+    )
+
+
+async def can_access_student(session, user, student_id):
+    if user.permissions & Permission.ADMIN:
+        return True
+    if user.permissions & Permission.TEACHER:
+        teaches = (await session.execute(
+            select(TeacherStudentAccess.classroom_id).where(
+                TeacherStudentAccess.teacher_user_id == user.id,
+                TeacherStudentAccess.student_id == student_id,
+            ).limit(1)
+        )).scalar_one_or_none()
+        if teaches is not None:
+            return True
+    if user.permissions & Permission.PARENT:
+        related = (await session.execute(
+            select(ParentStudentRelationship.id)
+            .join(Parent, Parent.id == ParentStudentRelationship.parent_id)
+            .where(
+                Parent.user_id == user.id,
+                ParentStudentRelationship.student_id == student_id,
+                ParentStudentRelationship.is_active == True,
+            ).limit(1)
+        )).scalar_one_or_none()
+        if related is not None:
+            return True
+    return False
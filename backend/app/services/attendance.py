@@ -0,0 +1,223 @@
+# backend/app/services/attendance.py
+"""
+Daily attendance.
+
+Every section submits its whole roster in the same morning window, so a
+submission is one version check against the cached section roster plus one
+INSERT ... ON CONFLICT DO UPDATE for all of its students. Rows whose status,
+minutes late and note are unchanged are left alone, so a resubmission only
+rewrites what a teacher actually corrected.
+
+Rosters come from the section roster cache (app/services/sections.py).
+
+The same statement keeps per-status counters and attendance_rate on each
+student's academic record current, so rates and chronic-absence lists never
+aggregate raw records. The attendance_reconcile job recomputes the counters
+from the records nightly and fixes any that drifted. The counter columns are
+not in the emergency contact trigger's column list (see the
+add_cache_versions migration), so submissions don't bump cache_versions or
+queue on its row.
+"""
+
+from sqlalchemy import select, text
+
+from ..models.student import Student
+from ..models.student_academic_record import StudentAcademicRecord
+
+# Counters each status feeds on the student's academic record for the year
+STATUS_COUNTERS = {
+    "PRESENT": "attendance_present",
+    "ABSENT": "attendance_absent",
+    "TARDY": "attendance_tardy",
+    "EXCUSED": "attendance_excused",
+}
+ATTENDED = ("attendance_present", "attendance_tardy")
+
+
+def _counter_deltas():
+    return ",\n            ".join(
+        f"(w.status = '{status}')::int - COALESCE((o.status = '{status}')::int, 0) AS {column}"
+        for status, column in STATUS_COUNTERS.items()
+    )
+
+
+def _rollup_assignments():
+    total = " + ".join(f"sar.{c} + d.{c}" for c in STATUS_COUNTERS.values())
+    attended = " + ".join(f"sar.{c} + d.{c}" for c in ATTENDED)
+    counters = ",\n            ".join(f"{c} = sar.{c} + d.{c}" for c in STATUS_COUNTERS.values())
+    return f"{counters},\n            attendance_rate = round(100.0 * ({attended}) / NULLIF({total}, 0), 2)"
+
+
+# Upsert a section's day and apply the status changes to the rollup counters in
+# one statement. `old` reads the rows as they were before the statement, so
+# each written row contributes (new status) - (previous status, if any). The
+# arrays keep the statement text fixed whatever the roster size, so asyncpg
+# reuses one prepared statement.
+SUBMIT_SQL = text(f"""
+    WITH input AS (
+        SELECT * FROM unnest(
+            CAST(:student_ids AS uuid[]), CAST(:statuses AS varchar[]),
+            CAST(:minutes_late AS integer[]), CAST(:notes AS varchar[])
+        ) AS t(student_id, status, minutes_late, note)
+    ),
+    old AS (
+        SELECT student_id, status FROM attendance_records
+        WHERE classroom_id = CAST(:classroom_id AS uuid)
+          AND attendance_date = CAST(:attendance_date AS date)
+          AND academic_year_id = CAST(:academic_year_id AS uuid)
+    ),
+    written AS (
+        INSERT INTO attendance_records
+            (classroom_id, attendance_date, student_id, academic_year_id, status, minutes_late, note, recorded_by)
+        SELECT CAST(:classroom_id AS uuid), CAST(:attendance_date AS date), student_id,
+               CAST(:academic_year_id AS uuid), status, minutes_late, note, CAST(:recorded_by AS uuid)
+        FROM input
+        ON CONFLICT (classroom_id, attendance_date, student_id, academic_year_id) DO UPDATE SET
+            status = excluded.status,
+            minutes_late = excluded.minutes_late,
+            note = excluded.note,
+            recorded_by = excluded.recorded_by,
+            updated_at = now()
+        WHERE attendance_records.status <> excluded.status
+           OR attendance_records.minutes_late IS DISTINCT FROM excluded.minutes_late
+           OR attendance_records.note IS DISTINCT FROM excluded.note
+        RETURNING student_id, status
+    ),
+    delta AS (
+        SELECT w.student_id,
+            {_counter_deltas()}
+        FROM written w LEFT JOIN old o ON o.student_id = w.student_id
+        WHERE w.status IS DISTINCT FROM o.status
+    ),
+    rolled_up AS (
+        UPDATE student_academic_records sar SET
+            {_rollup_assignments()}
+        FROM delta d
+        WHERE sar.student_id = d.student_id
+          AND sar.academic_year_id = CAST(:academic_year_id AS uuid)
+          AND sar.is_active
+    )
+    SELECT student_id FROM written
+""")
+
+
+async def submit(session, roster, attendance_date, entries, recorded_by):
+    """
+    Record a section's attendance for a day; `entries` are (student_id, status,
+    minutes_late, note) for students on the roster, each at most once. Returns
+    the ids of rows inserted or changed. Caller commits.
+    """
+    if not entries:
+        return []
+    # Concurrent submissions for the same section and day would both compute
+    # their counter deltas from the same `old` rows; take turns instead
+    await session.execute(
+        text("SELECT pg_advisory_xact_lock(hashtextextended(:key, 0))"),
+        {"key": f"attendance:{roster.classroom_id}:{attendance_date.isoformat()}"},
+    )
+    student_ids, statuses, minutes_late, notes = (list(column) for column in zip(*entries))
+    result = await session.execute(SUBMIT_SQL, {
+        "student_ids": student_ids,
+        "statuses": statuses,
+        "minutes_late": minutes_late,
+        "notes": notes,
+        "classroom_id": roster.classroom_id,
+        "attendance_date": attendance_date,
+        "academic_year_id": roster.academic_year_id,
+        "recorded_by": recorded_by,
+    })
+    return result.scalars().all()
+
+
+# Recompute one school's counters for a year from the raw records and fix the
+# rows that drifted. A rate that came from the counters is cleared if the
+# records behind it are gone; rates imported without any records are kept.
+RECONCILE_SQL = text("""
+    WITH counts AS (
+        SELECT student_id,
+               count(*) AS total,
+               count(*) FILTER (WHERE status = 'PRESENT') AS present,
+               count(*) FILTER (WHERE status = 'ABSENT') AS absent,
+               count(*) FILTER (WHERE status = 'TARDY') AS tardy,
+               count(*) FILTER (WHERE status = 'EXCUSED') AS excused
+        FROM attendance_records
+        WHERE academic_year_id = CAST(:academic_year_id AS uuid)
+          AND student_id IN (
+              SELECT student_id FROM student_academic_records
+              WHERE academic_year_id = CAST(:academic_year_id AS uuid)
+                AND school_id = CAST(:school_id AS uuid)
+                AND is_active
+          )
+        GROUP BY student_id
+    ),
+    fixed AS (
+        SELECT s.id, s.academic_year_id,
+               COALESCE(c.total, 0) AS total,
+               COALESCE(c.present, 0) AS present,
+               COALESCE(c.absent, 0) AS absent,
+               COALESCE(c.tardy, 0) AS tardy,
+               COALESCE(c.excused, 0) AS excused,
+               round(100.0 * (c.present + c.tardy) / NULLIF(c.total, 0), 2) AS rate
+        FROM student_academic_records s
+        LEFT JOIN counts c ON c.student_id = s.student_id
+        WHERE s.academic_year_id = CAST(:academic_year_id AS uuid)
+          AND s.school_id = CAST(:school_id AS uuid)
+          AND s.is_active
+    )
+    UPDATE student_academic_records sar SET
+        attendance_present = f.present,
+        attendance_absent = f.absent,
+        attendance_tardy = f.tardy,
+        attendance_excused = f.excused,
+        attendance_rate = CASE
+            WHEN f.total > 0 THEN f.rate
+            WHEN sar.attendance_present + sar.attendance_absent + sar.attendance_tardy + sar.attendance_excused > 0 THEN NULL
+            ELSE sar.attendance_rate
+        END
+    FROM fixed f
+    WHERE sar.id = f.id
+      AND sar.academic_year_id = f.academic_year_id
+      AND (
+          (sar.attendance_present, sar.attendance_absent, sar.attendance_tardy, sar.attendance_excused)
+              IS DISTINCT FROM (f.present, f.absent, f.tardy, f.excused)
+          OR (f.total > 0 AND sar.attendance_rate IS DISTINCT FROM f.rate)
+      )
+    RETURNING sar.student_id
+""")
+
+
+async def reconcile_rollups(session, academic_year_id, school_id):
+    """Fix drifted counters for one school's year; returns the student ids corrected. Caller commits."""
+    result = await session.execute(RECONCILE_SQL, {"academic_year_id": academic_year_id, "school_id": school_id})
+    return result.scalars().all()
+
+
+def chronic_absence_stmt(academic_year_id, school_id, threshold, min_records):
+    """Students below `threshold`% attendance - a range scan on ix_academic_records_attendance_rate"""
+    total = (
+        StudentAcademicRecord.attendance_present + StudentAcademicRecord.attendance_absent
+        + StudentAcademicRecord.attendance_tardy + StudentAcademicRecord.attendance_excused
+    )
+    return (
+        select(
+            StudentAcademicRecord.student_id,
+            Student.student_id.label("district_student_id"),
+            Student.first_name,
+            Student.last_name,
+            StudentAcademicRecord.grade_level,
+            StudentAcademicRecord.attendance_rate,
+            StudentAcademicRecord.attendance_present,
+            StudentAcademicRecord.attendance_absent,
+            StudentAcademicRecord.attendance_tardy,
+            StudentAcademicRecord.attendance_excused,
+        )
+        .join(Student, Student.id == StudentAcademicRecord.student_id)
+        .where(
+            StudentAcademicRecord.academic_year_id == academic_year_id,
+            StudentAcademicRecord.school_id == school_id,
+            StudentAcademicRecord.attendance_rate < threshold,
+            StudentAcademicRecord.is_active == True,
+            total >= min_records,
+        )
+        .order_by(StudentAcademicRecord.attendance_rate, Student.last_name, Student.first_name)
+    )
@@ -0,0 +1,36 @@
+# backend/app/services/cache_versions.py
+"""
+Trigger-maintained version counters for in-process caches.
+
+Each cache has a row in cache_versions that triggers on its source tables
+bump on every write (see the add_cache_versions migration); caches
+versioned per key (a school, a classroom) have a '<cache>:<key>' row each. A
+cache keeps the version it was built at and rebuilds when the counter has
+moved, so a write from any process or script invalidates it everywhere.
+"""
+
+from sqlalchemy import select
+
+from ..models.cache_version import CacheVersion
+
+UNVERSIONED = -1  # row missing: never trust the cache
+
+
+async def current_version(session, name):
+    version = (await session.execute(
+        select(CacheVersion.version).where(CacheVersion.name == name)
+    )).scalar_one_or_none()
+    return UNVERSIONED if version is None else version
+
+
+def keyed_name(name, key):
+    return f"{name}:{key}"
+
+
+async def current_versions(session, names):
+    """current_version for several counters in one query, by name"""
+    rows = (await session.execute(
+        select(CacheVersion.name, CacheVersion.version).where(CacheVersion.name.in_(list(names)))
+    )).all()
+    found = dict(rows)
+    return {name: found.get(name, UNVERSIONED) for name in names}
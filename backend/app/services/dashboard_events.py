@@ -0,0 +1,227 @@
+# backend/app/services/dashboard_events.py
+"""
+Live dashboard updates over Server-Sent Events (GET /dashboard/events).
+
+Each process has one DashboardHub subscribed to the change feed (see
+app/change_feed.py). Feed batches only mark what went stale; every
+FLUSH_INTERVAL the hub queries current values for the schools that have
+open streams, once per school however many clients watch it, and puts each
+message, encoded once, on every connection's queue:
+
+    users              users whose row or roles at the school changed, and
+                       the ids of users no longer active there
+    enrollment_counts  active enrollment counts of changed classrooms
+    room_utilization   the school's summary, as /rooms/availability reports
+                       it, when it differs from the last one sent
+    resync             deltas were lost; refetch the overview
+
+Messages carry current values rather than increments, so repeats are
+harmless. A connection QUEUE_SIZE messages behind has its backlog replaced
+by a single resync, as has every connection after a feed gap or a burst of
+more than MAX_DIRTY changed rows. Streams hold no database connection; an
+idle one costs its queue and a heartbeat comment every HEARTBEAT_INTERVAL.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict
+
+from sqlalchemy import select, func
+
+from ..change_feed import FEED
+from ..db import get_sessionmaker
+from ..models.classroom import Classroom
+from ..models.enrollment import Enrollment
+from ..models.user import User
+from ..models.user_role import UserRole
+from ..read_models import contact, room_utilization
+
+logger = logging.getLogger("sis.dashboard_events")
+
+QUEUE_SIZE = 32
+FLUSH_INTERVAL = 1.0  # seconds; changes within one are coalesced
+HEARTBEAT_INTERVAL = 15.0  # keeps proxies from closing idle streams
+MAX_DIRTY = 5000
+
+RETRY = b"retry: 5000\n\n"
+HEARTBEAT = b": ping\n\n"
+
+
+def encode(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n".encode()
+
+
+RESYNC = encode("resync", {})
+
+
+class Connection:
+    __slots__ = ("school_id", "queue")
+
+    def __init__(self, school_id):
+        self.school_id = school_id
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def send(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # too far behind for deltas to help: drop them and have the client refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class DashboardHub:
+    def __init__(self):
+        self._connections = defaultdict(set)  # school_id -> Connections
+        self._utilization = {}  # school_id -> last summary sent
+        self._reset_dirty()
+
+    def _reset_dirty(self):
+        self._users = defaultdict(set)  # school_id (None: any school) -> user ids
+        self._classrooms = set()
+        self._room_schools = set()
+
+    # -- connections -------------------------------------------------------
+
+    async def stream(self, school_id):
+        """SSE body for one client: a ready event, then the school's messages"""
+        connection = Connection(school_id)
+        self._connections[school_id].add(connection)
+        try:
+            yield RETRY + encode("ready", {"school_id": school_id})
+            while True:
+                yield await connection.queue.get()
+        finally:
+            watchers = self._connections.get(school_id)
+            if watchers is not None:
+                watchers.discard(connection)
+                if not watchers:
+                    del self._connections[school_id]
+                    self._utilization.pop(school_id, None)
+
+    def _push(self, school_id, message):
+        for connection in self._connections.get(school_id, ()):
+            connection.send(message)
+
+    def _broadcast(self, message):
+        for watchers in self._connections.values():
+            for connection in watchers:
+                connection.send(message)
+
+    # -- change feed -------------------------------------------------------
+
+    def on_changes(self, changes):
+        if not self._connections:
+            return
+        if changes is None:
+            self._reset_dirty()
+            self._utilization.clear()
+            self._broadcast(RESYNC)
+            return
+        for change in changes:
+            if change.entity == "users":
+                self._users[None].add(uuid.UUID(change.entity_id))
+            elif change.entity == "user_roles":
+                self._users[change.school_id].add(uuid.UUID(change.owner_id))
+            elif change.entity == "enrollments":
+                self._classrooms.add(uuid.UUID(change.owner_id))
+            elif change.entity == "classrooms":
+                self._classrooms.add(uuid.UUID(change.entity_id))
+                self._room_schools.add(change.school_id)  # rooms it took or freed are at its school
+            elif change.entity == "rooms":
+                self._room_schools.add(change.school_id)
+        dirty = sum(len(ids) for ids in self._users.values()) + len(self._classrooms)
+        if dirty > MAX_DIRTY:
+            self._reset_dirty()
+            self._broadcast(RESYNC)
+
+    # -- flushing ----------------------------------------------------------
+
+    async def run(self):
+        """Flush coalesced changes and send heartbeats until cancelled"""
+        last_heartbeat = time.monotonic()
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("dashboard event flush failed")
+                self._broadcast(RESYNC)
+            if time.monotonic() - last_heartbeat >= HEARTBEAT_INTERVAL:
+                self._broadcast(HEARTBEAT)
+                last_heartbeat = time.monotonic()
+
+    async def flush(self):
+        users, classrooms, room_schools = self._users, self._classrooms, self._room_schools
+        self._reset_dirty()
+        schools = list(self._connections)
+        if not schools or not (users or classrooms or room_schools):
+            return
+        SessionLocal = get_sessionmaker()
+        async with SessionLocal() as session:
+            if users:
+                await self._flush_users(session, users, schools)
+            if classrooms:
+                await self._flush_enrollment_counts(session, classrooms, schools)
+            room_schools = [school_id for school_id in schools if school_id in room_schools]
+            if room_schools:
+                await self._flush_utilization(session, room_schools)
+
+    async def _flush_users(self, session, users, schools):
+        user_ids = set().union(*users.values())
+        rows = (await session.execute(
+            select(User.id, User.first_name, User.last_name, User.email, User.is_active,
+                   UserRole.school_id, UserRole.role)
+            .join(UserRole, UserRole.user_id == User.id)
+            .where(User.id.in_(user_ids), UserRole.school_id.in_(schools), UserRole.is_active == True)
+            .order_by(User.last_name, User.first_name, UserRole.role)
+        )).all()
+        by_school = defaultdict(dict)
+        for row in rows:
+            entry = by_school[row.school_id].setdefault(
+                row.id, {**contact(row), "is_active": row.is_active, "roles": []}
+            )
+            entry["roles"].append(row.role)
+        for school_id in schools:
+            present = by_school.get(school_id, {})
+            removed = sorted(users.get(school_id, set()) - present.keys(), key=str)
+            if present or removed:
+                self._push(school_id, encode("users", {
+                    "school_id": school_id, "users": list(present.values()), "removed": removed,
+                }))
+
+    async def _flush_enrollment_counts(self, session, classroom_ids, schools):
+        counts = (
+            select(Enrollment.classroom_id, func.count().label("enrollment_count"))
+            .where(Enrollment.classroom_id.in_(classroom_ids), Enrollment.is_active == True)
+            .group_by(Enrollment.classroom_id)
+            .subquery()
+        )
+        rows = (await session.execute(
+            select(Classroom.id, Classroom.name, Classroom.school_id,
+                   func.coalesce(counts.c.enrollment_count, 0).label("enrollment_count"))
+            .outerjoin(counts, counts.c.classroom_id == Classroom.id)
+            .where(Classroom.id.in_(classroom_ids), Classroom.school_id.in_(schools))
+            .order_by(Classroom.name)
+        )).all()
+        by_school = defaultdict(list)
+        for row in rows:
+            by_school[row.school_id].append(
+                {"id": str(row.id), "name": row.name, "enrollment_count": row.enrollment_count}
+            )
+        for school_id, classrooms in by_school.items():
+            self._push(school_id, encode("enrollment_counts", {"school_id": school_id, "classrooms": classrooms}))
+
+    async def _flush_utilization(self, session, schools):
+        for school_id, summary in (await room_utilization(session, schools)).items():
+            if self._utilization.get(school_id) != summary and school_id in self._connections:
+                self._utilization[school_id] = summary
+                self._push(school_id, encode("room_utilization", {"school_id": school_id, "summary": summary}))
+
+
+HUB = DashboardHub()
+FEED.subscribe(HUB.on_changes)
@@ -0,0 +1,218 @@
+# backend/app/services/emergency_contacts.py
+"""
+Emergency contact index.
+
+For each school: every active student in the active academic year with their
+active emergency contacts in emergency_priority order, held in memory so a
+lockdown or early-dismissal lookup for a grade or a whole school is a dict
+walk rather than a multi-join query.
+
+Freshness: each school has its own counter,
+cache_versions['emergency_contacts:<school id>'], which triggers bump on
+writes to that school's relationships, parents, academic records and the
+name/email columns shown here (see the add_cache_versions migration). Every
+lookup reads the school's counter by primary key and rebuilds the school
+first if it moved, so a write from any process is visible on the next lookup
+and a write at one school leaves the others cached. run_refresher() rebuilds
+stale schools in the background shortly after a write so lookups normally
+find them warm.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import select, and_
+
+from ..db import get_sessionmaker
+from ..models.academic_year import AcademicYear
+from ..models.parent import Parent
+from ..models.parent_student_relationship import ParentStudentRelationship
+from ..models.student import Student
+from ..models.student_academic_record import StudentAcademicRecord
+from ..models.user import User
+from ..change_feed import FEED
+from ..tenancy import district_wide
+from .cache_versions import current_version, current_versions, keyed_name, UNVERSIONED
+from .rollover import GRADE_LADDER
+
+logger = logging.getLogger("sis.emergency_contacts")
+
+CACHE_NAME = "emergency_contacts"
+
+_GRADE_ORDER = {grade: i for i, grade in enumerate(GRADE_LADDER)}
+
+
+class SchoolContacts:
+    """Snapshot of one school's students and contacts at a cache version"""
+
+    __slots__ = ("version", "students", "order")
+
+    def __init__(self, version):
+        self.version = version
+        self.students = {}  # student id (str) -> entry
+        self.order = []     # student ids by grade, then name
+
+
+def _school_stmt(school_id):
+    active_year = select(AcademicYear.id).where(AcademicYear.is_active == True).scalar_subquery()
+    return (
+        select(
+            Student.id,
+            Student.student_id.label("district_student_id"),
+            Student.first_name,
+            Student.last_name,
+            StudentAcademicRecord.grade_level,
+            ParentStudentRelationship.emergency_priority,
+            ParentStudentRelationship.relationship_type,
+            ParentStudentRelationship.custody_status,
+            ParentStudentRelationship.can_pickup_student,
+            Parent.preferred_contact_method,
+            User.first_name.label("contact_first_name"),
+            User.last_name.label("contact_last_name"),
+            User.email.label("contact_email"),
+        )
+        .join(StudentAcademicRecord, StudentAcademicRecord.student_id == Student.id)
+        .outerjoin(ParentStudentRelationship, and_(
+            ParentStudentRelationship.student_id == Student.id,
+            ParentStudentRelationship.is_active == True,
+            ParentStudentRelationship.is_emergency_contact == True,
+        ))
+        .outerjoin(Parent, Parent.id == ParentStudentRelationship.parent_id)
+        .outerjoin(User, User.id == Parent.user_id)
+        .where(
+            StudentAcademicRecord.school_id == school_id,
+            StudentAcademicRecord.academic_year_id == active_year,
+            StudentAcademicRecord.is_active == True,
+            Student.is_active == True,
+        )
+        .order_by(Student.id, ParentStudentRelationship.emergency_priority)
+    )
+
+
+class EmergencyContactIndex:
+    def __init__(self):
+        self._schools = {}  # school id (str) -> SchoolContacts
+        self._locks = {}
+
+    async def _build(self, session, school_id, version):
+        snapshot = SchoolContacts(version)
+        with district_wide():  # shared by every user; never build it under a request's school scope
+            rows = await session.execute(_school_stmt(school_id))
+        for row in rows:
+            key = str(row.id)
+            entry = snapshot.students.get(key)
+            if entry is None:
+                entry = snapshot.students[key] = {
+                    "student_id": key,
+                    "district_student_id": row.district_student_id,
+                    "name": f"{row.first_name} {row.last_name}",
+                    "grade_level": row.grade_level,
+                    "contacts": [],
+                }
+            if row.emergency_priority is not None:
+                entry["contacts"].append({
+                    "priority": row.emergency_priority,
+                    "name": f"{row.contact_first_name} {row.contact_last_name}",
+                    "email": row.contact_email,
+                    "relationship_type": row.relationship_type,
+                    "custody_status": row.custody_status,
+                    "can_pickup": row.can_pickup_student,
+                    "preferred_contact_method": row.preferred_contact_method,
+                })
+        snapshot.order = sorted(
+            snapshot.students,
+            key=lambda sid: (
+                _GRADE_ORDER.get(snapshot.students[sid]["grade_level"], len(_GRADE_ORDER)),
+                snapshot.students[sid]["name"],
+            ),
+        )
+        return snapshot
+
+    async def school(self, session, school_id, version=None):
+        """The school's snapshot, rebuilt first if the cache version moved"""
+        key = str(school_id)
+        if version is None:
+            version = await current_version(session, keyed_name(CACHE_NAME, key))
+        cached = self._schools.get(key)
+        if cached is not None and cached.version == version != UNVERSIONED:
+            return cached
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._schools.get(key)  # another request may have rebuilt it meanwhile
+            if cached is None or cached.version != version or version == UNVERSIONED:
+                cached = self._schools[key] = await self._build(session, school_id, version)
+            return cached
+
+    async def lookup(self, session, school_id, student_ids=None, grade_levels=None):
+        """Students (optionally narrowed to ids/grades) with contacts in priority order"""
+        snapshot = await self.school(session, school_id)
+        if student_ids:
+            wanted = {str(sid) for sid in student_ids}
+            ids = [sid for sid in snapshot.order if sid in wanted]
+            not_found = sorted(wanted - snapshot.students.keys())
+        else:
+            ids = snapshot.order
+            not_found = []
+        if grade_levels:
+            grades = set(grade_levels)
+            ids = [sid for sid in ids if snapshot.students[sid]["grade_level"] in grades]
+        return {
+            "school_id": str(school_id),
+            "version": snapshot.version,
+            "students": [snapshot.students[sid] for sid in ids],
+            "not_found": not_found,
+        }
+
+    async def refresh(self, session):
+        """Rebuild every cached school whose snapshot is older than its current version"""
+        keys = list(self._schools)
+        versions = await current_versions(session, [keyed_name(CACHE_NAME, key) for key in keys])
+        for key in keys:
+            version = versions[keyed_name(CACHE_NAME, key)]
+            cached = self._schools.get(key)
+            if cached is None or cached.version != version:
+                await self.school(session, key, version)
+
+    async def warm(self, session):
+        """Build every school with students in the active year"""
+        school_ids = (await session.execute(
+            select(StudentAcademicRecord.school_id)
+            .join(AcademicYear, AcademicYear.id == StudentAcademicRecord.academic_year_id)
+            .where(AcademicYear.is_active == True)
+            .distinct()
+        )).scalars().all()
+        versions = await current_versions(session, [keyed_name(CACHE_NAME, sid) for sid in school_ids])
+        for school_id in school_ids:
+            await self.school(session, school_id, versions[keyed_name(CACHE_NAME, school_id)])
+
+
+    def evict(self, changes):
+        """Change feed subscriber: drop schools whose academic records changed elsewhere"""
+        if changes is None:
+            self._schools.clear()
+            return
+        for change in changes:
+            if change.entity == "student_academic_records" and change.school_id:
+                self._schools.pop(str(change.school_id), None)
+
+
+INDEX = EmergencyContactIndex()
+FEED.subscribe(INDEX.evict)
+
+
+async def run_refresher(interval):
+    """Warm the index, then keep cached schools current until cancelled"""
+    SessionLocal = get_sessionmaker()
+    warmed = False
+    while True:
+        try:
+            async with SessionLocal() as session:
+                if not warmed:
+                    await INDEX.warm(session)
+                    warmed = True
+                else:
+                    await INDEX.refresh(session)
+        except Exception:
+            logger.exception("emergency contact refresh failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,190 @@
+# backend/app/services/gpa.py
+"""
+GPA and credits earned for a school's academic records.
+
+One query returns earned and possible points per (student, section,
+category) from the gradebook, aggregated in Postgres; NumPy then turns those
+into section grades with the same rules as app/services/gradebook.py
+(weighted category mean, or total points when a section has no weights)
+and rolls them up per student:
+
+    final_gpa       credit-weighted mean of grade points (LETTER_SCALE) over
+                    graded sections; the plain mean if none carry credits
+    credits_earned  sum of credits of sections with a passing grade
+
+Results are written back with UPDATE ... FROM (VALUES ...) in chunks of
+WRITE_CHUNK rows, touching only records whose values changed. Students with
+no graded work in the year keep the values they have (e.g. imported ones).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import text
+
+from .gradebook import LETTER_SCALE, grade_points
+
+PASSING_PERCENT = LETTER_SCALE[-2][0]  # lowest grade above F
+WRITE_CHUNK = 1000
+
+# Ranks are computed in SQL so NumPy can group on dense integer keys
+# instead of UUIDs: `pair` numbers (student, section) combinations and
+# `student` numbers students, both in student order.
+SECTION_POINTS_SQL = text("""
+    WITH records AS (
+        SELECT DISTINCT ON (student_id) id, student_id FROM student_academic_records
+        WHERE academic_year_id = CAST(:academic_year_id AS uuid)
+          AND school_id = CAST(:school_id AS uuid)
+          AND is_active
+        ORDER BY student_id, enrollment_date DESC
+    ),
+    sections AS (
+        SELECT e.student_id, e.classroom_id, sub.credits
+        FROM enrollments e
+        JOIN records r ON r.student_id = e.student_id
+        JOIN classrooms c ON c.id = e.classroom_id
+        JOIN subjects sub ON sub.id = c.subject_id
+        WHERE e.academic_year_id = CAST(:academic_year_id AS uuid)
+          AND e.is_active
+          AND NOT e.is_audit_only
+          AND e.enrollment_status IN ('ACTIVE', 'COMPLETED')
+    ),
+    section_weights AS (
+        SELECT classroom_id, sum(weight) AS total_weight
+        FROM grade_categories
+        WHERE classroom_id IN (SELECT classroom_id FROM sections)
+        GROUP BY classroom_id
+    ),
+    category_points AS (
+        SELECT s.student_id, s.classroom_id, s.credits, gc.weight,
+               sum(x.earned) AS earned, sum(a.points_possible) AS possible
+        FROM sections s
+        JOIN assignments a ON a.classroom_id = s.classroom_id AND a.is_active
+        JOIN grade_categories gc ON gc.id = a.category_id
+        JOIN assignment_scores sc ON sc.assignment_id = a.id AND sc.student_id = s.student_id
+        CROSS JOIN LATERAL (
+            SELECT CASE
+                WHEN sc.is_excused THEN NULL
+                WHEN sc.points IS NOT NULL THEN sc.points
+                WHEN sc.is_missing THEN 0
+            END AS earned
+        ) x
+        WHERE x.earned IS NOT NULL
+        GROUP BY s.student_id, s.classroom_id, s.credits, gc.id, gc.weight
+    )
+    SELECT r.id AS record_id,
+           dense_rank() OVER (ORDER BY cp.student_id) - 1 AS student,
+           dense_rank() OVER (ORDER BY cp.student_id, cp.classroom_id) - 1 AS pair,
+           cp.credits, cp.weight, COALESCE(w.total_weight, 0) AS section_weight,
+           cp.earned, cp.possible
+    FROM category_points cp
+    JOIN records r ON r.student_id = cp.student_id
+    LEFT JOIN section_weights w ON w.classroom_id = cp.classroom_id
+    ORDER BY pair
+""")
+
+
+def compute(record_ids, student, pair, credits, weight, section_weight, earned, possible):
+    """
+    Per-student (record ids, final_gpa, credits_earned) from per-category
+    point rows; `student` and `pair` are dense 0-based group numbers.
+    """
+    student = np.asarray(student, dtype=np.int64)
+    pair = np.asarray(pair, dtype=np.int64)
+    if not len(pair):
+        return [], np.empty(0), np.empty(0)
+    credits, weight, section_weight, earned, possible = (
+        np.asarray(a, dtype=float) for a in (credits, weight, section_weight, earned, possible)
+    )
+    n_pairs = pair.max() + 1
+    n_students = student.max() + 1
+
+    # Section grades, as final_percents() computes them for a gradebook
+    with np.errstate(divide="ignore", invalid="ignore"):
+        graded = possible > 0
+        category_percents = np.where(graded, earned / np.where(graded, possible, 1), 0.0)
+        applied = np.where(graded, weight, 0.0)
+        weighted = np.bincount(pair, category_percents * applied, n_pairs) / np.bincount(pair, applied, n_pairs)
+        by_points = np.bincount(pair, earned, n_pairs) / np.bincount(pair, possible, n_pairs)
+    pair_student = np.empty(n_pairs, dtype=np.int64)
+    pair_student[pair] = student
+    pair_credits = np.empty(n_pairs)
+    pair_credits[pair] = credits
+    pair_weighted = np.empty(n_pairs, dtype=bool)
+    pair_weighted[pair] = section_weight > 0
+    percents = 100.0 * np.where(pair_weighted, weighted, by_points)
+
+    # Roll sections up to students
+    has_grade = ~np.isnan(percents)
+    owners = pair_student[has_grade]
+    points = grade_points(percents[has_grade])
+    section_credits = pair_credits[has_grade]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        credit_weighted = (
+            np.bincount(owners, points * section_credits, n_students)
+            / np.bincount(owners, section_credits, n_students)
+        )
+        plain = np.bincount(owners, points, n_students) / np.bincount(owners, minlength=n_students)
+    gpa = np.where(np.isnan(credit_weighted), plain, credit_weighted)
+    credits_earned = np.bincount(
+        owners, np.where(percents[has_grade] >= PASSING_PERCENT, section_credits, 0.0), n_students
+    )
+
+    # Students whose every section is still ungraded keep their current values
+    first_row = np.unique(student, return_index=True)[1]
+    keep = ~np.isnan(gpa)
+    return (
+        [record_ids[i] for i in first_row[keep]],
+        np.round(gpa[keep], 2),
+        np.round(credits_earned[keep], 2),
+    )
+
+
+@lru_cache(maxsize=8)  # full chunks share one statement; only a school's last chunk differs
+def _write_sql(rows):
+    values = ",\n        ".join(
+        f"(CAST(:id_{i} AS uuid), CAST(:gpa_{i} AS float8), CAST(:credits_{i} AS float8))"
+        for i in range(rows)
+    )
+    return text(f"""
+        UPDATE student_academic_records sar SET
+            final_gpa = v.final_gpa,
+            credits_earned = v.credits_earned
+        FROM (VALUES
+            {values}
+        ) AS v(id, final_gpa, credits_earned)
+        WHERE sar.id = v.id
+          AND sar.academic_year_id = CAST(:academic_year_id AS uuid)
+          AND (sar.final_gpa, sar.credits_earned) IS DISTINCT FROM (v.final_gpa, v.credits_earned)
+    """)
+
+
+async def write_back(session, academic_year_id, record_ids, gpas, credits):
+    """Bulk-update records in WRITE_CHUNK batches; returns how many changed. Caller commits."""
+    changed = 0
+    for start in range(0, len(record_ids), WRITE_CHUNK):
+        chunk = range(start, min(start + WRITE_CHUNK, len(record_ids)))
+        params = {"academic_year_id": academic_year_id}
+        for i, row in enumerate(chunk):
+            params[f"id_{i}"] = record_ids[row]
+            params[f"gpa_{i}"] = float(gpas[row])
+            params[f"credits_{i}"] = float(credits[row])
+        result = await session.execute(_write_sql(len(chunk)), params)
+        changed += result.rowcount
+    return changed
+
+
+async def recompute_school(session, academic_year_id, school_id):
+    """
+    Recompute and store GPA and credits for one school's year; returns
+    (students graded, records changed). Caller commits.
+    """
+    rows = (await session.execute(
+        SECTION_POINTS_SQL, {"academic_year_id": academic_year_id, "school_id": school_id}
+    )).all()
+    if not rows:
+        return 0, 0
+    record_ids, student, pair, credits, weight, section_weight, earned, possible = zip(*rows)
+    ids, gpas, credits_earned = compute(record_ids, student, pair, credits, weight, section_weight, earned, possible)
+    changed = await write_back(session, academic_year_id, ids, gpas, credits_earned)
+    return len(ids), changed
@@ -0,0 +1,312 @@
+# backend/app/services/gradebook.py
+"""
+Gradebook engine.
+
+A section's scores are held as a (students x assignments) NumPy matrix:
+earned points, NaN where a score is not in the grade (not graded yet or
+excused) and 0 where it is marked missing. A one-hot (assignments x
+categories) matrix turns that into per-category earned and possible points
+with two matrix products, and each student's grade is the weighted mean of
+their category percentages over the categories they have graded work in.
+With no category weights set, the grade is plain total points.
+
+Matrices are cached per section. Every gradebook write bumps the section's
+row in gradebook_versions in the same transaction; a cached matrix is used
+while its version matches that row and the section's roster version.
+After a single score changes, the writer patches its cached matrix in place
+and recomputes only that student's row, so the next render of the section
+is served from memory.
+"""
+
+import asyncio
+import math
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+
+from ..models.gradebook import GradeCategory, Assignment, AssignmentScore
+from ..change_feed import FEED
+from ..models.student import Student
+from ..tenancy import district_wide
+
+# (minimum percent, letter, grade points), highest first
+LETTER_SCALE = (
+    (90.0, "A", 4.0),
+    (80.0, "B", 3.0),
+    (70.0, "C", 2.0),
+    (60.0, "D", 1.0),
+    (0.0, "F", 0.0),
+)
+
+
+def letter_grade(percent):
+    """(letter, grade points) for a percentage, or (None, None) if there is no grade yet"""
+    if percent is None:
+        return None, None
+    for minimum, letter, points in LETTER_SCALE:
+        if percent >= minimum:
+            return letter, points
+    return LETTER_SCALE[-1][1], LETTER_SCALE[-1][2]
+
+
+def grade_points(percents):
+    """Vectorized letter_grade(): grade points for an array of percentages (NaN stays NaN)"""
+    percents = np.asarray(percents, dtype=float)
+    thresholds = np.array([minimum for minimum, _, _ in LETTER_SCALE])
+    points = np.array([p for _, _, p in LETTER_SCALE])
+    # thresholds descend; count how many a percent clears from the bottom
+    index = len(LETTER_SCALE) - np.searchsorted(thresholds[::-1], percents, side="right")
+    result = points[np.clip(index, 0, len(LETTER_SCALE) - 1)]
+    return np.where(np.isnan(percents), np.nan, result)
+
+
+def final_percents(earned_by_category, possible_by_category, weights):
+    """
+    Grades for each row of (rows x categories) earned/possible point sums:
+    weighted mean of category percentages over the categories with graded
+    work, or total points when no category has a weight. NaN means no grade.
+    """
+    graded = possible_by_category > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if weights.sum() > 0:
+            category_percents = np.where(graded, earned_by_category / np.where(graded, possible_by_category, 1), 0.0)
+            applied = np.where(graded, weights, 0.0)
+            return 100.0 * (category_percents * applied).sum(axis=1) / applied.sum(axis=1)
+        return 100.0 * earned_by_category.sum(axis=1) / possible_by_category.sum(axis=1)
+
+
+def _round(value):
+    return None if math.isnan(value) else round(value, 2)
+
+
+class SectionGradebook:
+    """One section's score matrix and computed grades at a gradebook version"""
+
+    def __init__(self, classroom_id, version, roster_version, students, categories, assignments, scores):
+        self.classroom_id = classroom_id
+        self.version = version
+        self.roster_version = roster_version
+
+        self.student_ids = [s.id for s in students]
+        self.names = [f"{s.first_name} {s.last_name}" for s in students]
+        self.row = {sid: i for i, sid in enumerate(self.student_ids)}
+        self.category_ids = [c.id for c in categories]
+        self.categories = [
+            {"id": str(c.id), "name": c.name, "weight": c.weight} for c in categories
+        ]
+        self.assignment_ids = [a.id for a in assignments]
+        self.column = {aid: j for j, aid in enumerate(self.assignment_ids)}
+        self.assignments = [
+            {
+                "id": str(a.id),
+                "title": a.title,
+                "category_id": str(a.category_id),
+                "points_possible": a.points_possible,
+                "due_date": a.due_date.isoformat() if a.due_date else None,
+            }
+            for a in assignments
+        ]
+
+        n_students, n_assignments = len(self.student_ids), len(self.assignment_ids)
+        category_index = {cid: k for k, cid in enumerate(self.category_ids)}
+        self.weights = np.array([c.weight for c in categories], dtype=float)
+        self.possible = np.array([a.points_possible for a in assignments], dtype=float)
+        self.membership = np.zeros((n_assignments, len(self.category_ids)))
+        self.membership[np.arange(n_assignments), [category_index[a.category_id] for a in assignments]] = 1.0
+
+        self.points = np.full((n_students, n_assignments), np.nan)  # as entered
+        self.excused = np.zeros((n_students, n_assignments), dtype=bool)
+        self.missing = np.zeros((n_students, n_assignments), dtype=bool)
+        for score in scores:
+            i, j = self.row.get(score.student_id), self.column.get(score.assignment_id)
+            if i is not None and j is not None:
+                self.points[i, j] = np.nan if score.points is None else score.points
+                self.excused[i, j] = score.is_excused
+                self.missing[i, j] = score.is_missing
+
+        self._compute(slice(None))
+        self.rows = [self._render(i) for i in range(n_students)]
+
+    def _earned(self, rows):
+        """Points counted toward the grade: NaN if excused or ungraded, 0 if missing"""
+        earned = np.where(self.missing[rows] & np.isnan(self.points[rows]), 0.0, self.points[rows])
+        return np.where(self.excused[rows], np.nan, earned)
+
+    def _compute(self, rows):
+        earned = self._earned(rows)
+        counted = ~np.isnan(earned)
+        earned_by_category = np.where(counted, earned, 0.0) @ self.membership
+        possible_by_category = (counted * self.possible) @ self.membership
+        if rows == slice(None):
+            self.earned_by_category = earned_by_category
+            self.possible_by_category = possible_by_category
+            self.percents = final_percents(earned_by_category, possible_by_category, self.weights)
+        else:
+            self.earned_by_category[rows] = earned_by_category
+            self.possible_by_category[rows] = possible_by_category
+            self.percents[rows] = final_percents(earned_by_category, possible_by_category, self.weights)
+
+    def _render(self, i):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            category_percents = 100.0 * self.earned_by_category[i] / self.possible_by_category[i]
+        percent = _round(float(self.percents[i]))
+        letter, _ = letter_grade(percent)
+        flags = {}
+        for j in np.flatnonzero(self.excused[i] | self.missing[i]).tolist():
+            flags[str(self.assignment_ids[j])] = "EXCUSED" if self.excused[i, j] else "MISSING"
+        return {
+            "student_id": str(self.student_ids[i]),
+            "name": self.names[i],
+            "scores": [None if math.isnan(p) else p for p in self.points[i].tolist()],
+            "flags": flags,
+            "category_percents": {
+                str(cid): _round(p) for cid, p in zip(self.category_ids, category_percents.tolist())
+            },
+            "percent": percent,
+            "letter": letter,
+        }
+
+    def set_score(self, student_id, assignment_id, points, is_excused, is_missing):
+        """Update one cell and recompute that student's grade; returns their rendered row"""
+        i, j = self.row[student_id], self.column[assignment_id]
+        self.points[i, j] = np.nan if points is None else points
+        self.excused[i, j] = is_excused
+        self.missing[i, j] = is_missing
+        self._compute(slice(i, i + 1))
+        self.rows[i] = self._render(i)
+        return self.rows[i]
+
+    def response(self):
+        return {
+            "classroom_id": str(self.classroom_id),
+            "version": self.version,
+            "categories": self.categories,
+            "assignments": self.assignments,
+            "students": self.rows,
+        }
+
+
+async def gradebook_version(session, classroom_id):
+    return (await session.execute(
+        text("SELECT version FROM gradebook_versions WHERE classroom_id = :classroom_id"),
+        {"classroom_id": classroom_id},
+    )).scalar_one_or_none() or 0
+
+
+async def bump_version(session, classroom_id):
+    """Advance the section's gradebook version; holds its row lock until the caller commits"""
+    return (await session.execute(
+        text("""
+            INSERT INTO gradebook_versions (classroom_id, version) VALUES (:classroom_id, 1)
+            ON CONFLICT (classroom_id) DO UPDATE SET version = gradebook_versions.version + 1
+            RETURNING version
+        """),
+        {"classroom_id": classroom_id},
+    )).scalar_one()
+
+
+async def write_score(session, classroom_id, student_id, assignment_id, points, is_excused, is_missing, graded_by):
+    """Upsert one score and bump the section's version; returns the new version. Caller commits."""
+    values = {
+        "points": points,
+        "is_excused": is_excused,
+        "is_missing": is_missing,
+        "graded_by": graded_by,
+    }
+    await session.execute(
+        insert(AssignmentScore)
+        .values(assignment_id=assignment_id, student_id=student_id, **values)
+        .on_conflict_do_update(
+            index_elements=[AssignmentScore.assignment_id, AssignmentScore.student_id],
+            set_={**values, "updated_at": text("now()")},
+        )
+    )
+    return await bump_version(session, classroom_id)
+
+
+class GradebookCache:
+    def __init__(self):
+        self._sections = {}
+        self._locks = {}
+
+    async def _build(self, session, roster, version):
+        classroom_id = roster.classroom_id
+        students = (await session.execute(
+            select(Student.id, Student.first_name, Student.last_name)
+            .where(Student.id.in_(roster.student_ids))
+            .order_by(Student.last_name, Student.first_name)
+        )).all() if roster.student_ids else []
+        categories = (await session.execute(
+            select(GradeCategory)
+            .where(GradeCategory.classroom_id == classroom_id)
+            .order_by(GradeCategory.position, GradeCategory.name)
+        )).scalars().all()
+        assignments = (await session.execute(
+            select(Assignment)
+            .where(Assignment.classroom_id == classroom_id, Assignment.is_active == True)
+            .order_by(Assignment.due_date.nulls_last(), Assignment.created_at)
+        )).scalars().all()
+        scores = (await session.execute(
+            select(
+                AssignmentScore.assignment_id, AssignmentScore.student_id, AssignmentScore.points,
+                AssignmentScore.is_excused, AssignmentScore.is_missing,
+            )
+            .join(Assignment, Assignment.id == AssignmentScore.assignment_id)
+            .where(Assignment.classroom_id == classroom_id, Assignment.is_active == True)
+        )).all()
+        return SectionGradebook(classroom_id, version, roster.version, students, categories, assignments, scores)
+
+    async def get(self, session, roster):
+        """The section's gradebook, rebuilt first if it or its roster changed"""
+        classroom_id = roster.classroom_id
+        version = await gradebook_version(session, classroom_id)
+        cached = self._sections.get(classroom_id)
+        if cached is not None and cached.version == version and cached.roster_version == roster.version:
+            return cached
+
+        lock = self._locks.setdefault(classroom_id, asyncio.Lock())
+        async with lock:
+            cached = self._sections.get(classroom_id)  # another request may have rebuilt it meanwhile
+            if cached is None or cached.version != version or cached.roster_version != roster.version:
+                with district_wide():  # shared by every grader of the section
+                    cached = self._sections[classroom_id] = await self._build(session, roster, version)
+            return cached
+
+    def score_written(self, classroom_id, version, student_id, assignment_id, points, is_excused, is_missing):
+        """
+        Apply a committed score write at `version` to the cached gradebook.
+        Returns the student's recomputed row, or None if the cache was behind
+        by more than this write and has been dropped instead.
+        """
+        cached = self._sections.get(classroom_id)
+        # A build that read its version before this write may already include
+        # the score; setting the cell again is harmless
+        if (cached is None or cached.version not in (version - 1, version)
+                or student_id not in cached.row or assignment_id not in cached.column):
+            self._sections.pop(classroom_id, None)
+            return None
+        row = cached.set_score(student_id, assignment_id, points, is_excused, is_missing)
+        cached.version = version
+        return row
+
+    def invalidate(self, classroom_id):
+        self._sections.pop(classroom_id, None)
+
+    def evict(self, changes):
+        """Change feed subscriber: drop gradebooks whose section or roster changed"""
+        if changes is None:
+            self._sections.clear()
+            return
+        for change in changes:
+            if change.entity == "classrooms":
+                self.invalidate(UUID(change.entity_id))
+            elif change.entity == "enrollments" and change.owner_id:
+                self.invalidate(UUID(change.owner_id))
+            elif change.entity == "students":
+                self._sections.clear()  # names are rendered into every row
+
+
+GRADEBOOKS = GradebookCache()
+FEED.subscribe(GRADEBOOKS.evict)
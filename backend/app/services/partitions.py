@@ -0,0 +1,85 @@
+# backend/app/services/partitions.py
+"""
+Per-academic-year partitions for enrollments, student academic records and
+attendance records.
+
+These tables are LIST-partitioned on academic_year_id. Each year gets its own
+partition; rows for a year without one land in the <table>_default partition.
+Detaching a partition leaves it as a plain table that can be dumped or moved
+to cold storage, and attaching it again brings the history back online.
+"""
+
+import re
+
+from sqlalchemy import text
+
+PARTITIONED_TABLES = ("enrollments", "student_academic_records", "attendance_records")
+
+
+def partition_name(table, academic_year):
+    """e.g. enrollments_y24_25_1a2b3c4d (short name + id prefix keeps it unique)"""
+    slug = re.sub(r"[^a-z0-9]+", "_", (academic_year.short_name or "").lower()).strip("_")
+    return f"{table}_y{slug}_{academic_year.id.hex[:8]}"
+
+
+async def _is_attached(session, table, name):
+    result = await session.execute(
+        text(
+            "SELECT 1 FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent AND c.relname = :child"
+        ),
+        {"parent": table, "child": name},
+    )
+    return result.scalar() is not None
+
+
+async def _exists(session, name):
+    result = await session.execute(text("SELECT to_regclass(:name)"), {"name": name})
+    return result.scalar() is not None
+
+
+async def attach_year_partitions(session, academic_year):
+    """
+    Make sure every partitioned table has a partition for this year.
+
+    A previously detached partition is re-attached, otherwise a new one is
+    created; either way rows for the year that landed in the default partition
+    are moved into it first.
+    Returns the names of partitions created or attached. Caller commits.
+    """
+    year_id = str(academic_year.id)
+    changed = []
+    for table in PARTITIONED_TABLES:
+        name = partition_name(table, academic_year)
+        if await _is_attached(session, table, name):
+            continue
+        if not await _exists(session, name):
+            await session.execute(text(
+                f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ))
+        # ATTACH refuses while the default partition still holds rows for this year
+        await session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {table}_default WHERE academic_year_id = :year_id RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"year_id": academic_year.id},
+        )
+        await session.execute(text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES IN ('{year_id}')"
+        ))
+        changed.append(name)
+    return changed
+
+
+async def detach_year_partitions(session, academic_year):
+    """Detach this year's partitions, leaving them as standalone tables. Caller commits."""
+    detached = []
+    for table in PARTITIONED_TABLES:
+        name = partition_name(table, academic_year)
+        if await _is_attached(session, table, name):
+            await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            detached.append(name)
+    return detached
@@ -0,0 +1,234 @@
+# backend/app/services/rollover.py
+"""
+Academic year rollover: promote students and clone classrooms into the next year.
+
+Every step is a single set-based statement committed on its own, and every
+step skips rows that already exist in the target year, so a rollover that
+stops part-way can simply be run again.
+"""
+
+from sqlalchemy import select, insert, update, and_, or_, func, case, literal, exists, values, column, String, Boolean, Date
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import aliased
+
+from ..models.classroom import Classroom
+from ..models.classroom_teacher_assignment import ClassroomTeacherAssignment
+from ..models.enrollment import Enrollment
+from ..models.student_academic_record import StudentAcademicRecord
+
+# Grade progression; the last grade has no next grade (students graduate)
+GRADE_LADDER = ["PS", "PK", "K", "1", "2", "3", "4", "5", "6", "7", "8"]
+
+# promotion_status values that end a student's time at the school
+EXIT_STATUSES = ("transferred", "graduated", "withdrawn")
+
+ROLLOVER_STEPS = (
+    "clone_classrooms",
+    "clone_teacher_assignments",
+    "promote_students",
+    "archive_enrollments",
+    "close_source_records",
+)
+
+
+def _grade_ladder():
+    rows = []
+    for i, grade in enumerate(GRADE_LADDER):
+        promoted = GRADE_LADDER[i + 1] if i + 1 < len(GRADE_LADDER) else None
+        skipped = GRADE_LADDER[i + 2] if i + 2 < len(GRADE_LADDER) else None
+        rows.append((grade, promoted, skipped))
+    return values(
+        column("grade", String), column("promoted", String), column("skipped", String),
+        name="grade_ladder",
+    ).data(rows)
+
+
+def _same_shell(target, source):
+    """Classrooms are matched across years by school, name, subject and grade"""
+    return and_(
+        target.school_id == source.school_id,
+        target.name == source.name,
+        target.subject_id == source.subject_id,
+        target.grade_level == source.grade_level,
+    )
+
+
+def clone_classrooms_stmt(source_year, target_year):
+    src = aliased(Classroom)
+    dst = aliased(Classroom)
+    shells = select(
+        func.gen_random_uuid(),
+        src.name,
+        src.school_id,
+        src.subject_id,
+        literal(target_year.id, UUID(as_uuid=True)),
+        src.grade_level,
+        src.classroom_type,
+        src.max_students,
+        src.room_id,
+        literal(True, Boolean),
+    ).where(
+        src.academic_year_id == source_year.id,
+        src.is_active == True,
+        ~exists().where(dst.academic_year_id == target_year.id, _same_shell(dst, src)),
+    )
+    return insert(Classroom).from_select(
+        ["id", "name", "school_id", "subject_id", "academic_year_id", "grade_level",
+         "classroom_type", "max_students", "room_id", "is_active"],
+        shells,
+    )
+
+
+def clone_teacher_assignments_stmt(source_year, target_year):
+    src = aliased(Classroom)
+    dst = aliased(Classroom)
+    cta = aliased(ClassroomTeacherAssignment)
+    existing = aliased(ClassroomTeacherAssignment)
+    rows = (
+        select(
+            func.gen_random_uuid(),
+            dst.id,
+            cta.teacher_user_id,
+            cta.role_name,
+            cta.can_view_grades,
+            cta.can_modify_grades,
+            cta.can_take_attendance,
+            cta.can_view_parent_contact,
+            cta.can_create_assignments,
+            literal(target_year.start_date, Date),
+            literal(True, Boolean),
+        )
+        .join(src, src.id == cta.classroom_id)
+        .join(dst, and_(dst.academic_year_id == target_year.id, _same_shell(dst, src)))
+        .where(
+            src.academic_year_id == source_year.id,
+            cta.is_active == True,
+            ~exists().where(
+                existing.classroom_id == dst.id,
+                existing.teacher_user_id == cta.teacher_user_id,
+                existing.role_name == cta.role_name,
+            ),
+        )
+    )
+    return insert(ClassroomTeacherAssignment).from_select(
+        ["id", "classroom_id", "teacher_user_id", "role_name", "can_view_grades",
+         "can_modify_grades", "can_take_attendance", "can_view_parent_contact",
+         "can_create_assignments", "start_date", "is_active"],
+        rows,
+    )
+
+
+def promote_students_stmt(source_year, target_year):
+    rec = aliased(StudentAcademicRecord)
+    existing = aliased(StudentAcademicRecord)
+    ladder = _grade_ladder()
+    status = func.lower(rec.promotion_status)
+    next_grade = case(
+        (ladder.c.grade.is_(None), rec.grade_level),  # SPED, UNGRADED...: keep grade
+        (status == "retained", rec.grade_level),
+        (status == "skipped", func.coalesce(ladder.c.skipped, ladder.c.promoted)),
+        else_=ladder.c.promoted,
+    )
+    rows = (
+        select(
+            func.gen_random_uuid(),
+            rec.student_id,
+            literal(target_year.id, UUID(as_uuid=True)),
+            rec.school_id,
+            next_grade,
+            rec.program_type,
+            literal("enrolled", String),
+            literal(target_year.start_date, Date),
+            literal(True, Boolean),
+        )
+        .select_from(rec)
+        .outerjoin(ladder, ladder.c.grade == rec.grade_level)
+        .where(
+            rec.academic_year_id == source_year.id,
+            rec.is_active == True,
+            status.notin_(EXIT_STATUSES),
+            next_grade.isnot(None),  # top of the ladder graduates
+            ~exists().where(
+                existing.student_id == rec.student_id,
+                existing.academic_year_id == target_year.id,
+            ),
+        )
+    )
+    return insert(StudentAcademicRecord).from_select(
+        ["id", "student_id", "academic_year_id", "school_id", "grade_level",
+         "program_type", "promotion_status", "enrollment_date", "is_active"],
+        rows,
+    )
+
+
+def archive_enrollments_stmt(source_year):
+    return (
+        update(Enrollment)
+        .where(Enrollment.academic_year_id == source_year.id, Enrollment.is_active == True)
+        .values(
+            is_active=False,
+            enrollment_status="COMPLETED",
+            withdrawal_date=func.coalesce(Enrollment.withdrawal_date, source_year.end_date),
+            withdrawal_reason=func.coalesce(Enrollment.withdrawal_reason, "PROMOTED"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def close_source_records_stmt(source_year):
+    """Deactivate source-year records, resolving undecided ones to promoted/graduated"""
+    top_grade = GRADE_LADDER[-1]
+    undecided = func.lower(StudentAcademicRecord.promotion_status).notin_(
+        ("promoted", "retained", "skipped") + EXIT_STATUSES
+    )
+    return (
+        update(StudentAcademicRecord)
+        .where(
+            StudentAcademicRecord.academic_year_id == source_year.id,
+            StudentAcademicRecord.is_active == True,
+        )
+        .values(
+            is_active=False,
+            promotion_status=case(
+                (and_(undecided, StudentAcademicRecord.grade_level == top_grade), "graduated"),
+                (undecided, "promoted"),
+                else_=StudentAcademicRecord.promotion_status,
+            ),
+            withdrawal_reason=case(
+                (
+                    or_(
+                        func.lower(StudentAcademicRecord.promotion_status) == "graduated",
+                        and_(undecided, StudentAcademicRecord.grade_level == top_grade),
+                    ),
+                    "GRADUATED",
+                ),
+                else_=StudentAcademicRecord.withdrawal_reason,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def run_rollover(session, source_year, target_year, progress=None):
+    """
+    Run every rollover step, committing after each one.
+
+    `progress` is an optional async callback `(step_name, step_index, total_steps)`
+    invoked before each step. Returns the number of rows touched per step.
+    """
+    statements = {
+        "clone_classrooms": clone_classrooms_stmt(source_year, target_year),
+        "clone_teacher_assignments": clone_teacher_assignments_stmt(source_year, target_year),
+        "promote_students": promote_students_stmt(source_year, target_year),
+        "archive_enrollments": archive_enrollments_stmt(source_year),
+        "close_source_records": close_source_records_stmt(source_year),
+    }
+
+    counts = {}
+    for index, step in enumerate(ROLLOVER_STEPS):
+        if progress:
+            await progress(step, index, len(ROLLOVER_STEPS))
+        result = await session.execute(statements[step])
+        await session.commit()
+        counts[step] = result.rowcount
+    return counts
@@ -0,0 +1,143 @@
+# backend/app/services/room_assignment.py
+"""
+Global room assignment for unplaced classrooms.
+
+Builds a (classrooms x rooms) cost matrix with NumPy and solves it as a
+min-cost bipartite matching (Hungarian / Jonker-Volgenant via SciPy).
+"""
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+DEFAULT_CLASS_SIZE = 25
+
+# Cost weights mirror the scoring used by /rooms/suggestions
+SLACK_WEIGHT = 20.0          # cost per 100% of unused seats
+MISSING_EQUIPMENT_COST = 15.0
+WRONG_ROOM_TYPE_COST = 10.0
+INFEASIBLE_COST = 1e6        # room too small for the classroom
+
+EQUIPMENT_FIELDS = ("has_projector", "has_computers", "has_smartboard", "has_sink")
+
+# Equipment a subject needs, keyed by subject code
+SUBJECT_EQUIPMENT = {
+    "SCI": ("has_sink",),
+    "ART": ("has_sink",),
+    "LIB": ("has_computers",),
+    "COMP": ("has_computers",),
+    "TECH": ("has_computers",),
+}
+
+
+def required_capacity(classroom):
+    return classroom.max_students or DEFAULT_CLASS_SIZE
+
+
+def subject_equipment(subject):
+    """Equipment flags a classroom needs, derived from its subject"""
+    if not subject:
+        return ()
+    return SUBJECT_EQUIPMENT.get(subject.code, ())
+
+
+def preferred_room_type(classroom):
+    """Specialist subjects (PE, Art, Music...) belong in SPECIAL rooms"""
+    subject = classroom.subject
+    if classroom.classroom_type in ("ENRICHMENT", "SPECIAL") or (subject and subject.requires_specialist):
+        return "SPECIAL"
+    return "CLASSROOM"
+
+
+def build_cost_matrix(classrooms, rooms):
+    """Return (cost, feasible) matrices of shape (len(classrooms), len(rooms))"""
+    capacity = np.array([room.capacity or 0 for room in rooms], dtype=float)
+    room_types = np.array([room.room_type for room in rooms], dtype=object)
+    has_equipment = np.array(
+        [[bool(getattr(room, field)) for field in EQUIPMENT_FIELDS] for room in rooms],
+        dtype=bool,
+    ).reshape(len(rooms), len(EQUIPMENT_FIELDS))
+
+    required = np.array([required_capacity(c) for c in classrooms], dtype=float)
+    needs = np.array(
+        [[field in subject_equipment(c.subject) for field in EQUIPMENT_FIELDS] for c in classrooms],
+        dtype=bool,
+    ).reshape(len(classrooms), len(EQUIPMENT_FIELDS))
+    wanted_types = np.array([preferred_room_type(c) for c in classrooms], dtype=object)
+
+    # Unused seats relative to class size; smaller is better
+    slack = (capacity[None, :] - required[:, None]) / required[:, None]
+    feasible = slack >= 0
+    cost = np.where(feasible, slack, 0.0) * SLACK_WEIGHT
+
+    # Count needed equipment each room lacks: needs @ (not has)^T
+    missing = needs.astype(np.int32) @ (~has_equipment).astype(np.int32).T
+    cost += missing * MISSING_EQUIPMENT_COST
+
+    cost += (wanted_types[:, None] != room_types[None, :]) * WRONG_ROOM_TYPE_COST
+    cost = np.where(feasible, cost, INFEASIBLE_COST)
+    return cost, feasible
+
+
+def _match_reasons(classroom, room):
+    reasons = []
+    required = required_capacity(classroom)
+    if room.capacity <= required * 1.2:
+        reasons.append("Perfect size")
+    else:
+        reasons.append("Large enough")
+    for field in subject_equipment(classroom.subject):
+        label = field.replace("has_", "")
+        reasons.append(f"Has {label}" if getattr(room, field) else f"Missing {label}")
+    if room.room_type == preferred_room_type(classroom):
+        reasons.append(f"Correct type ({room.room_type})")
+    return reasons
+
+
+def solve_assignment(classrooms, rooms):
+    """
+    Assign each classroom at most one room (and each room at most one classroom)
+    minimizing total cost. Returns (assignments, unassigned) as plain dicts.
+    """
+    if not classrooms:
+        return [], []
+    if not rooms:
+        return [], [
+            {"classroom_id": str(c.id), "classroom_name": c.name, "reason": "No available rooms"}
+            for c in classrooms
+        ]
+
+    cost, feasible = build_cost_matrix(classrooms, rooms)
+    row_idx, col_idx = linear_sum_assignment(cost)
+
+    assignments = []
+    placed = set()
+    for r, c in zip(row_idx, col_idx):
+        if not feasible[r, c]:
+            continue
+        classroom, room = classrooms[r], rooms[c]
+        placed.add(r)
+        assignments.append({
+            "classroom_id": str(classroom.id),
+            "classroom_name": classroom.name,
+            "grade_level": classroom.grade_level,
+            "required_capacity": required_capacity(classroom),
+            "room_id": str(room.id),
+            "room_name": room.name,
+            "room_code": room.room_code,
+            "room_capacity": room.capacity,
+            "cost": round(float(cost[r, c]), 2),
+            "match_reasons": _match_reasons(classroom, room),
+        })
+
+    unassigned = []
+    for r, classroom in enumerate(classrooms):
+        if r in placed:
+            continue
+        reason = "No room large enough" if not feasible[r].any() else "All suitable rooms taken"
+        unassigned.append({
+            "classroom_id": str(classroom.id),
+            "classroom_name": classroom.name,
+            "reason": reason,
+        })
+
+    return assignments, unassigned
@@ -0,0 +1,126 @@
+# backend/app/services/sections.py
+"""
+Section rosters.
+
+Attendance submissions and gradebook edits both need a section's enrolled
+students and which teachers may act on it. Rosters are cached per section
+and rebuilt when the section's cache_versions['section_rosters:<classroom
+id>'] counter moves (triggers on its enrollments, teacher assignments and
+classroom row bump it; academic year date changes bump every section), so
+validating a request costs one primary-key lookup and a write in one section
+leaves the others, and their gradebooks, cached.
+"""
+
+import asyncio
+from uuid import UUID
+
+from sqlalchemy import select
+
+from ..models.academic_year import AcademicYear
+from ..models.classroom import Classroom
+from ..models.classroom_teacher_assignment import ClassroomTeacherAssignment
+from ..models.enrollment import Enrollment
+from ..change_feed import FEED
+from .cache_versions import current_version, keyed_name, UNVERSIONED
+
+ROSTER_CACHE_NAME = "section_rosters"
+
+
+class SectionRoster:
+    """A section's enrolled students and who may take attendance or grade it"""
+
+    __slots__ = (
+        "classroom_id", "academic_year_id", "start_date", "end_date", "student_ids",
+        "takers", "graders", "grade_viewers", "version",
+    )
+
+    def __init__(self, classroom_id, academic_year_id, start_date, end_date, student_ids,
+                 takers, graders, grade_viewers, version):
+        self.classroom_id = classroom_id
+        self.academic_year_id = academic_year_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.student_ids = student_ids      # frozenset of enrolled student ids
+        # frozensets of teacher user ids by assignment permission
+        self.takers = takers                # can_take_attendance
+        self.graders = graders              # can_modify_grades
+        self.grade_viewers = grade_viewers  # can_view_grades
+        self.version = version
+
+
+class RosterCache:
+    def __init__(self):
+        self._rosters = {}
+        self._locks = {}
+
+    async def _build(self, session, classroom_id, version):
+        section = (await session.execute(
+            select(Classroom.academic_year_id, AcademicYear.start_date, AcademicYear.end_date)
+            .join(AcademicYear, AcademicYear.id == Classroom.academic_year_id)
+            .where(Classroom.id == classroom_id, Classroom.is_active == True)
+        )).one_or_none()
+        if section is None:
+            return None
+        students = (await session.execute(
+            select(Enrollment.student_id).where(
+                Enrollment.classroom_id == classroom_id,
+                Enrollment.academic_year_id == section.academic_year_id,
+                Enrollment.is_active == True,
+                Enrollment.enrollment_status == "ACTIVE",
+            )
+        )).scalars().all()
+        teachers = (await session.execute(
+            select(
+                ClassroomTeacherAssignment.teacher_user_id,
+                ClassroomTeacherAssignment.can_take_attendance,
+                ClassroomTeacherAssignment.can_modify_grades,
+                ClassroomTeacherAssignment.can_view_grades,
+            ).where(
+                ClassroomTeacherAssignment.classroom_id == classroom_id,
+                ClassroomTeacherAssignment.is_active == True,
+            )
+        )).all()
+        return SectionRoster(
+            classroom_id, section.academic_year_id, section.start_date, section.end_date,
+            frozenset(students),
+            frozenset(t.teacher_user_id for t in teachers if t.can_take_attendance),
+            frozenset(t.teacher_user_id for t in teachers if t.can_modify_grades),
+            frozenset(t.teacher_user_id for t in teachers if t.can_view_grades or t.can_modify_grades),
+            version,
+        )
+
+    async def get(self, session, classroom_id):
+        """The section's roster, or None if it doesn't exist or is inactive"""
+        version = await current_version(session, keyed_name(ROSTER_CACHE_NAME, classroom_id))
+        cached = self._rosters.get(classroom_id)
+        if cached is not None and cached.version == version != UNVERSIONED:
+            return cached
+
+        lock = self._locks.setdefault(classroom_id, asyncio.Lock())
+        async with lock:
+            cached = self._rosters.get(classroom_id)  # another submission may have rebuilt it meanwhile
+            if cached is None or cached.version != version or version == UNVERSIONED:
+                cached = await self._build(session, classroom_id, version)
+                if cached is None:
+                    self._rosters.pop(classroom_id, None)
+                    return None
+                self._rosters[classroom_id] = cached
+            return cached
+
+
+    def evict(self, changes):
+        """Change feed subscriber: drop rosters other workers' writes touched"""
+        if changes is None:
+            self._rosters.clear()
+            return
+        for change in changes:
+            if change.entity == "academic_years":
+                self._rosters.clear()
+            elif change.entity == "classrooms":
+                self._rosters.pop(UUID(change.entity_id), None)
+            elif change.entity in ("enrollments", "classroom_teacher_assignments") and change.owner_id:
+                self._rosters.pop(UUID(change.owner_id), None)
+
+
+ROSTERS = RosterCache()
+FEED.subscribe(ROSTERS.evict)
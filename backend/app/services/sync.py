@@ -0,0 +1,128 @@
+# backend/app/services/sync.py
+"""
+Change tokens for delta-syncing list endpoints.
+
+A list endpoint called with `?since=<token>` returns only the rows whose
+change_events (see app/change_feed.py) committed after the token was issued,
+plus the ids of rows that changed but no longer belong in the list (deleted,
+deactivated, moved out of the filter), and a new token to send next time.
+Pass `since=` empty on the first sync to get the full list and a token.
+Events come from triggers on the tables behind each list, so bulk Core and
+raw SQL writes (homeroom creation, room plans, rollover, year activation)
+show up like ORM ones.
+
+A token is the xmin of the database snapshot it was issued under: every
+transaction with a lower id had finished by then, so anything committed
+later has txid >= xmin. Transactions still running at issue time commit
+later and are picked up by the next sync; rows they share with the last
+response are simply sent again. The token is taken before the rows are
+read, so nothing falls between two syncs.
+
+The delta falls back to the full list (`reset: true`) when the token is
+older than TOKEN_TTL (run_pruner() deletes older events), when more than
+MAX_CHANGED rows changed, or when a change affects the whole list (e.g.
+the active academic year).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, text
+
+from ..db import get_sessionmaker
+from ..models.change_event import ChangeEvent
+
+logger = logging.getLogger("sis.sync")
+
+TOKEN_TTL = timedelta(days=7)
+PRUNE_GRACE = timedelta(days=1)  # events outlive tokens so transactions in flight at issue time stay covered
+MAX_CHANGED = 5000
+
+SNAPSHOT_XMIN_SQL = text("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+
+
+async def new_token(session):
+    """A token covering everything committed from now on"""
+    xmin = (await session.execute(SNAPSHOT_XMIN_SQL)).scalar_one()
+    return f"{xmin}.{int(time.time())}"
+
+
+def parse_token(since):
+    """The txid a token syncs from, or None when it must reset (empty or expired)"""
+    if not since:
+        return None
+    try:
+        xmin, issued = (int(part) for part in since.split("."))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid since token")
+    if issued < time.time() - TOKEN_TTL.total_seconds():
+        return None
+    return xmin
+
+
+async def changes_since(session, since_txid, keys):
+    """
+    Keys of rows changed since a token, per entity: `keys` maps a
+    change_events entity to the column naming the row the list cares about
+    ("entity_id", or "owner_id" for child rows such as enrollments).
+    Returns {entity: set of keys}, or None when too many rows changed.
+    """
+    changes = {entity: set() for entity in keys}
+    for entity, column in keys.items():
+        key = getattr(ChangeEvent, column)
+        rows = (await session.execute(
+            select(key)
+            .where(ChangeEvent.entity == entity, ChangeEvent.txid >= since_txid, key.isnot(None))
+            .distinct()
+            .limit(MAX_CHANGED + 1)
+        )).scalars().all()
+        changes[entity].update(rows)
+        if sum(len(found) for found in changes.values()) > MAX_CHANGED:
+            return None
+    return changes
+
+
+def uuids(keys):
+    return [uuid.UUID(key) for key in keys]
+
+
+def delta(token, items, changed_ids=None):
+    """
+    Sync response body. Without changed_ids the items are the full list;
+    otherwise changed rows missing from items are reported as removed.
+    """
+    if changed_ids is None:
+        return {"token": token, "reset": True, "items": items, "removed": []}
+    returned = {str(item["id"] if isinstance(item, dict) else item.id) for item in items}
+    return {
+        "token": token,
+        "reset": False,
+        "items": items,
+        "removed": sorted(changed_ids - returned),
+    }
+
+
+async def prune(session):
+    """Delete change events no live token can need; returns how many. Caller commits."""
+    cutoff = func.now() - (TOKEN_TTL + PRUNE_GRACE)
+    result = await session.execute(delete(ChangeEvent).where(ChangeEvent.created_at < cutoff))
+    return result.rowcount
+
+
+async def run_pruner(interval):
+    """Prune change events every `interval` seconds until cancelled"""
+    SessionLocal = get_sessionmaker()
+    while True:
+        try:
+            async with SessionLocal() as session:
+                pruned = await prune(session)
+                await session.commit()
+            if pruned:
+                logger.info("pruned %d change events", pruned)
+        except Exception:
+            logger.exception("change event pruning failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,97 @@
+# backend/app/tenancy.py
+"""
+School scoping.
+
+get_current_user puts the school from the user's UserRolePreference into a
+context variable for the rest of the request; a `school_id` query parameter
+takes its place when the user has an active role at that school or is an
+admin, and is otherwise ignored. While it is set, every ORM
+SELECT in that request gets WHERE criteria (with_loader_criteria, added in a
+do_orm_execute hook) limiting school-owned models to that school, so list
+queries use the school_id indexes and return only that school's rows:
+
+    Room, StudentAcademicRecord             school_id = the school
+    SpecialNeedsTagLibrary                  the school's tags and district-wide ones
+    Student                                 students with an academic record there
+
+UserRole is not scoped: a user's roles span schools, and login context,
+school switching and the dashboards read them across all of them.
+
+Admins can send `X-School-Scope: district` to run a request district-wide.
+Users without a preference, unauthenticated requests, background jobs and
+startup tasks are never scoped. Raw text() SQL is not affected. Writes that
+check rows of a school given in the request body (duplicate checks) run
+inside district_wide().
+
+In-process caches shared across requests must build inside district_wide(),
+or one user's scope would end up in what another user is served.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, with_loader_criteria
+
+from .models.room import Room
+from .models.special_needs_tag_library import SpecialNeedsTagLibrary
+from .models.student import Student
+from .models.student_academic_record import StudentAcademicRecord
+
+SCOPE_HEADER = "x-school-scope"
+DISTRICT_SCOPE = "district"
+
+_school_scope = ContextVar("school_scope", default=None)
+
+
+def current_school():
+    """The school the current request is scoped to, or None"""
+    return _school_scope.get()
+
+
+def scope_to_school(school_id):
+    _school_scope.set(school_id)
+
+
+@contextmanager
+def district_wide():
+    """Run the enclosed queries unscoped"""
+    token = _school_scope.set(None)
+    try:
+        yield
+    finally:
+        _school_scope.reset(token)
+
+
+def _school_criteria(school_id):
+    return (
+        with_loader_criteria(Room, lambda cls: cls.school_id == school_id, include_aliases=True),
+        with_loader_criteria(
+            StudentAcademicRecord, lambda cls: cls.school_id == school_id, include_aliases=True,
+        ),
+        with_loader_criteria(
+            SpecialNeedsTagLibrary,
+            lambda cls: (cls.school_id == None) | (cls.school_id == school_id),
+            include_aliases=True,
+        ),
+        with_loader_criteria(
+            Student,
+            lambda cls: cls.id.in_(
+                select(StudentAcademicRecord.student_id).where(StudentAcademicRecord.school_id == school_id)
+            ),
+            include_aliases=True,
+        ),
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _apply_school_scope(orm_execute_state):
+    school_id = _school_scope.get()
+    if (
+        school_id is None
+        or not orm_execute_state.is_select
+        or orm_execute_state.is_column_load
+        or orm_execute_state.is_relationship_load  # criteria already propagate to these
+    ):
+        return
+    orm_execute_state.statement = orm_execute_state.statement.options(*_school_criteria(school_id))
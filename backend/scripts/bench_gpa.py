@@ -0,0 +1,147 @@
+# backend/scripts/bench_gpa.py
+"""
+GPA Pipeline Benchmark
+Times the stages of the gpa_recompute job (app/services/gpa.py) on a
+synthetic district:
+
+    compute    NumPy section grades and per-student GPA/credits from the
+               per-category point rows SECTION_POINTS_SQL returns
+    params     building the UPDATE ... FROM (VALUES ...) chunks and params
+
+    python scripts/bench_gpa.py                      # 50k students
+    python scripts/bench_gpa.py --students 200000 --sections 8
+
+With --database the whole pipeline (query, compute, write) runs against the
+configured DATABASE_URL for every school in a year and is timed per school.
+The updates are rolled back unless --commit is given.
+
+    python scripts/bench_gpa.py --database --academic-year-id <uuid>
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+import uuid
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.gpa import compute, recompute_school, _write_sql, WRITE_CHUNK
+
+
+def synthetic_rows(students, sections, categories, seed):
+    """Columns shaped like SECTION_POINTS_SQL output, ordered by pair"""
+    rng = np.random.default_rng(seed)
+    n = students * sections * categories
+    student = np.repeat(np.arange(students), sections * categories)
+    pair = np.repeat(np.arange(students * sections), categories)
+    credits = np.repeat(rng.choice([0.5, 1.0, 1.0, 1.0], students * sections), categories)
+    weight = np.tile(rng.choice([10.0, 20.0, 30.0, 40.0], sections * categories), students)
+    section_weight = np.repeat(
+        np.add.reduceat(weight, np.arange(0, n, categories)), categories
+    )
+    possible = rng.choice([20.0, 50.0, 100.0, 200.0], n)
+    earned = np.round(possible * rng.beta(6, 1.5, n), 1)
+    record_ids = [uuid.uuid4() for _ in range(students)]
+    return [record_ids[i] for i in student], student, pair, credits, weight, section_weight, earned, possible
+
+
+def time_it(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times), result
+
+
+def build_params(academic_year_id, ids, gpas, credits):
+    statements = 0
+    for start in range(0, len(ids), WRITE_CHUNK):
+        chunk = range(start, min(start + WRITE_CHUNK, len(ids)))
+        params = {"academic_year_id": academic_year_id}
+        for i, row in enumerate(chunk):
+            params[f"id_{i}"] = ids[row]
+            params[f"gpa_{i}"] = float(gpas[row])
+            params[f"credits_{i}"] = float(credits[row])
+        _write_sql(len(chunk))
+        statements += 1
+    return statements
+
+
+def run_synthetic(args):
+    columns = synthetic_rows(args.students, args.sections, args.categories, args.seed)
+    print(f"📊 {args.students:,} students x {args.sections} sections x {args.categories} categories "
+          f"= {len(columns[1]):,} point rows")
+
+    best, median, (ids, gpas, credits) = time_it(lambda: compute(*columns), args.repeat)
+    print(f"  compute   best {best * 1e3:8.1f} ms   median {median * 1e3:8.1f} ms")
+    best, median, statements = time_it(lambda: build_params(uuid.uuid4(), ids, gpas, credits), args.repeat)
+    print(f"  params    best {best * 1e3:8.1f} ms   median {median * 1e3:8.1f} ms   ({statements} statements)")
+    print(f"  GPA mean {gpas.mean():.2f}, credits mean {credits.mean():.2f}, students written {len(ids):,}")
+
+
+async def run_database(args):
+    from sqlalchemy import select
+
+    from app.db import get_sessionmaker, get_engine
+    from app.models.academic_year import AcademicYear
+    from app.models.student_academic_record import StudentAcademicRecord
+
+    SessionLocal = get_sessionmaker()
+    async with SessionLocal() as session:
+        if args.academic_year_id:
+            year_id = uuid.UUID(args.academic_year_id)
+        else:
+            year_id = (await session.execute(
+                select(AcademicYear.id).where(AcademicYear.is_active == True)
+            )).scalar_one()
+        school_ids = (await session.execute(
+            select(StudentAcademicRecord.school_id)
+            .where(StudentAcademicRecord.academic_year_id == year_id)
+            .distinct()
+            .order_by(StudentAcademicRecord.school_id)
+        )).scalars().all()
+
+        total_start = time.perf_counter()
+        total_graded = 0
+        for school_id in school_ids:
+            start = time.perf_counter()
+            graded, changed = await recompute_school(session, year_id, school_id)
+            total_graded += graded
+            print(f"  school {school_id}: {graded:6,} students, {changed:6,} changed "
+                  f"in {(time.perf_counter() - start) * 1e3:8.1f} ms")
+            if args.commit:
+                await session.commit()
+        elapsed = time.perf_counter() - total_start
+        if not args.commit:
+            await session.rollback()
+        print(f"✅ {total_graded:,} students across {len(school_ids)} schools in {elapsed:.2f} s"
+              f"{'' if args.commit else ' (rolled back)'}")
+    await get_engine().dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GPA/credits pipeline")
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--sections", type=int, default=7, help="graded sections per student")
+    parser.add_argument("--categories", type=int, default=4, help="graded categories per section")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", action="store_true", help="run against DATABASE_URL instead of synthetic data")
+    parser.add_argument("--academic-year-id", help="with --database: year to run (default: the active year)")
+    parser.add_argument("--commit", action="store_true", help="with --database: keep the updates")
+    args = parser.parse_args()
+
+    if args.database:
+        asyncio.run(run_database(args))
+    else:
+        run_synthetic(args)
+
+
+if __name__ == "__main__":
+    main()
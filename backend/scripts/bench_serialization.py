@@ -0,0 +1,465 @@
+# backend/scripts/bench_serialization.py
+"""
+Serialization Micro-Benchmarks
+Splits response building for the list-style and dashboard endpoints into its
+stages and times each one on its own, over fixture data of 1k/10k/100k rows:
+
+    rows       Core select of the same columns (driver + row cost, the floor)
+    hydrate    ORM entity loading (select(Model) / eager-loaded relationships)
+    handler    the real route handler or app.read_models function, queries included
+    validate   pydantic v1 validation of its output against the response schema
+    encode     fastapi jsonable_encoder (what serialize_response does)
+    json       json.dumps the way starlette's JSONResponse renders
+    orjson     orjson.dumps of the handler output (skipped if orjson is missing)
+
+Handlers are called as the app calls them, with an AsyncSession stand-in over
+a sync Session, so the numbers follow the production code. The dashboard
+scenarios time admin_overview, and teacher_overview / parent_overview for a
+user holding that role.
+
+The /students and /classrooms lists are also timed end to end both ways:
+
+    orm_path   select(Model) + eager loads -> from_orm -> jsonable_encoder -> json
+    fast_path  app.read_models projection -> dicts -> orjson (FAST_JSON=true)
+
+Fixtures live in an in-memory SQLite database so the numbers measure Python
+work rather than network round trips.
+
+    python scripts/bench_serialization.py --save-baseline bench_baseline.json
+    python scripts/bench_serialization.py --compare bench_baseline.json
+
+With --compare, any stage whose best time is slower than the baseline by more
+than --threshold (default 20%) is reported and the script exits 1.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import os
+import time
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, select, insert, func, text
+from sqlalchemy.orm import Session, selectinload, joinedload
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+from app import read_models
+from app.db import Base
+from app.models.school import School
+from app.models.room import Room
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.models.academic_year import AcademicYear
+from app.models.subject import Subject
+from app.models.student import Student
+from app.models.student_academic_record import StudentAcademicRecord
+from app.models.classroom import Classroom
+from app.models.classroom_teacher_assignment import ClassroomTeacherAssignment
+from app.models.enrollment import Enrollment
+from app.permissions import permissions_for_role
+from app.routers import dashboard, rooms as rooms_router
+from app.schemas.room import RoomOut
+from app.schemas.user import UserOut
+from app.schemas.student import StudentOut
+from app.schemas.classroom import ClassroomOut
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+SIZES = (1_000, 10_000, 100_000)
+ROOM_TYPES = ("CLASSROOM", "CLASSROOM", "CLASSROOM", "SPECIAL", "MULTI_PURPOSE", "OUTDOOR")
+ROLES = ("teacher", "teacher", "teacher", "admin", "parent")
+GRADES = ("K", "1", "2", "3", "4", "5", "6", "7", "8")
+TABLES = (
+    School, Room, User, UserRole, AcademicYear, Subject, Student,
+    StudentAcademicRecord, Classroom, ClassroomTeacherAssignment, Enrollment,
+)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def make_engine(size, seed):
+    """
+    In-memory database holding `size` rooms, users, students and classrooms,
+    and the ids the scenarios run as: {"school_id", "teacher_id", "parent_id"}
+    """
+    rng = random.Random(seed)
+
+    def new_id():
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[m.__table__ for m in TABLES])
+    with engine.begin() as conn:
+        # created by the migrations rather than the models
+        conn.execute(text("CREATE INDEX ix_academic_records_student_year ON student_academic_records (student_id, academic_year_id)"))
+
+    school_ids = [new_id() for _ in range(max(1, size // 500))]
+    schools = [{"id": sid, "name": f"School {i}", "tz": "America/New_York"} for i, sid in enumerate(school_ids)]
+    rooms = [
+        {
+            "id": new_id(),
+            "name": f"Room {i}",
+            "room_code": f"R{i}"[:10],
+            "room_type": rng.choice(ROOM_TYPES),
+            "capacity": rng.randint(12, 40),
+            "has_projector": rng.random() < 0.6,
+            "has_computers": rng.random() < 0.3,
+            "has_smartboard": rng.random() < 0.4,
+            "has_sink": rng.random() < 0.2,
+            "is_bookable": True,
+            "is_active": True,
+            "school_id": rng.choice(school_ids),
+        }
+        for i in range(size)
+    ]
+    users, user_roles = [], []
+    for i in range(size):
+        user_id = new_id()
+        users.append({
+            "id": user_id,
+            "email": f"user{i}@district.example.com",
+            "hashed_password": "x",
+            "first_name": f"First{i}",
+            "last_name": f"Last{i % 997}",
+            "is_active": True,
+        })
+        roles = {rng.choice(ROLES)}
+        if rng.random() < 0.25:
+            roles.add(rng.choice(ROLES))
+        for role in sorted(roles):
+            user_roles.append({
+                "user_id": user_id,
+                "role": role,
+                "school_id": rng.choice(school_ids),
+                "is_active": True,
+                "permissions": int(permissions_for_role(role)),
+            })
+
+    year_id = new_id()
+    year = {
+        "id": year_id, "name": "2025-2026", "short_name": "25-26",
+        "start_date": date(2025, 8, 15), "end_date": date(2026, 6, 5), "is_active": True,
+    }
+    subjects = [
+        {
+            "id": new_id(), "name": name, "code": name[:4].upper(), "subject_type": "CORE",
+            "applies_to_elementary": True, "applies_to_middle": True, "is_homeroom_default": False,
+            "requires_specialist": False, "allows_cross_grade": False,
+            "is_system_core": True, "created_by_admin": False,
+        }
+        for name in ("Math", "Reading", "Science", "Social Studies", "Art", "Music")
+    ]
+    students, records = [], []
+    for i in range(size):
+        student_id = new_id()
+        students.append({
+            "id": student_id,
+            "first_name": f"Student{i}",
+            "last_name": f"Family{i % 1499}",
+            "email": None,
+            "date_of_birth": date(2012 + i % 8, 1 + i % 12, 1 + i % 28),
+            "student_id": f"S{i:07d}",
+            "entry_date": date(2020, 8, 15),
+            "entry_grade_level": "K",
+            "is_active": True,
+        })
+        records.append({
+            "id": new_id(), "student_id": student_id, "academic_year_id": year_id,
+            "school_id": rng.choice(school_ids), "grade_level": rng.choice(GRADES),
+            "program_type": "GENERAL", "promotion_status": "promoted",
+            "enrollment_date": date(2025, 8, 15), "is_active": True,
+        })
+    # Roughly a third of the rooms are assigned to a classroom of their school
+    classrooms = []
+    for i, room in enumerate(rooms):
+        placed = rng.random() < 0.35
+        classrooms.append({
+            "id": new_id(), "name": f"Class {i:06d}",
+            "school_id": room["school_id"] if placed else rng.choice(school_ids),
+            "subject_id": rng.choice(subjects)["id"],
+            "grade_level": rng.choice(GRADES), "classroom_type": "CORE",
+            "academic_year_id": year_id, "max_students": 25,
+            "room_id": room["id"] if placed else None, "is_active": True,
+        })
+    teacher_ids = sorted({r["user_id"] for r in user_roles if r["role"] == "teacher"}, key=str)
+    assignments = [
+        {
+            "id": new_id(), "classroom_id": classroom["id"], "teacher_user_id": rng.choice(teacher_ids),
+            "role_name": "Primary Teacher", "start_date": date(2025, 8, 15), "is_active": True,
+        }
+        for classroom in classrooms
+    ]
+    enrollments = [
+        {
+            "id": new_id(), "student_id": rng.choice(students)["id"],
+            "classroom_id": rng.choice(classrooms)["id"], "academic_year_id": year_id,
+            "enrollment_date": date(2025, 8, 15), "enrollment_status": "ACTIVE", "is_active": True,
+        }
+        for _ in range(size * 2)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(insert(School), schools)
+        conn.execute(insert(Room), rooms)
+        conn.execute(insert(User), users)
+        conn.execute(insert(UserRole), user_roles)
+        conn.execute(insert(AcademicYear), [year])
+        conn.execute(insert(Subject), subjects)
+        conn.execute(insert(Student), students)
+        conn.execute(insert(StudentAcademicRecord), records)
+        conn.execute(insert(Classroom), classrooms)
+        conn.execute(insert(ClassroomTeacherAssignment), assignments)
+        conn.execute(insert(Enrollment), enrollments)
+
+    parent_ids = [r["user_id"] for r in user_roles if r["role"] == "parent"]
+    return engine, {
+        "school_id": school_ids[0],
+        "teacher_id": assignments[0]["teacher_user_id"],
+        "parent_id": parent_ids[0] if parent_ids else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Calling the app's handlers
+# ---------------------------------------------------------------------------
+
+class SessionAdapter:
+    """The AsyncSession method the handlers use, over a sync Session"""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def execute(self, *args, **kwargs):
+        return self._session.execute(*args, **kwargs)
+
+
+def handler(engine, call):
+    """Stage fn running `call(session)` - a handler coroutine - on a fresh session"""
+    def run(_):
+        with Session(engine) as session:
+            return asyncio.run(call(SessionAdapter(session)))
+    return run
+
+
+def render_json(content):
+    """starlette.responses.JSONResponse.render"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def students_orm_path(engine):
+    """What GET /students did before app.read_models: entities validated through StudentOut"""
+    with Session(engine) as session:
+        students = session.scalars(
+            select(Student)
+            .options(selectinload(Student.academic_records).joinedload(StudentAcademicRecord.academic_year))
+            .where(Student.is_active == True)
+            .order_by(Student.last_name, Student.first_name)
+        ).all()
+        return render_json(jsonable_encoder([StudentOut.from_orm(s) for s in students]))
+
+
+def classrooms_orm_path(engine):
+    """What GET /classrooms did before app.read_models: entities validated through ClassroomOut"""
+    with Session(engine) as session:
+        classrooms = session.scalars(
+            select(Classroom)
+            .options(
+                joinedload(Classroom.subject),
+                joinedload(Classroom.academic_year),
+                selectinload(Classroom.teacher_assignments).joinedload(ClassroomTeacherAssignment.teacher),
+            )
+            .order_by(Classroom.name)
+        ).unique().all()
+        counts = dict(session.execute(
+            select(Enrollment.classroom_id, func.count())
+            .where(Enrollment.is_active == True)
+            .group_by(Enrollment.classroom_id)
+        ).all())
+        for classroom in classrooms:
+            classroom.enrollment_count = counts.get(classroom.id, 0)
+        return render_json(jsonable_encoder([ClassroomOut.from_orm(c) for c in classrooms]))
+
+
+def fast_path(engine, list_fn):
+    """What GET /students and /classrooms do with FAST_JSON on: read model dicts -> orjson"""
+    return orjson.dumps(handler(engine, list_fn)(None))
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+def measure(fn, repeat):
+    """Run fn `repeat` times; return (last result, list of timings)"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return result, timings
+
+
+def scenario_stages(engine, fixture):
+    """Ordered (scenario, stage, fn) triples; fn receives the previous stage's output"""
+
+    def load(stmt, unique=False):
+        def run(_):
+            with Session(engine) as session:
+                result = session.scalars(stmt)
+                return (result.unique() if unique else result).all()
+        return run
+
+    def rows(stmt):
+        def run(_):
+            with engine.connect() as conn:
+                return conn.execute(stmt).all()
+        return run
+
+    users_stmt = (
+        select(User)
+        .options(selectinload(User.user_roles).joinedload(UserRole.school))
+        .order_by(User.last_name, User.first_name)
+    )
+
+    school_id = str(fixture["school_id"])
+    teacher = SimpleNamespace(id=fixture["teacher_id"])
+    parent = SimpleNamespace(id=fixture["parent_id"]) if fixture["parent_id"] else None
+
+    def served(scenario, call, schema=None):
+        """handler -> (validate) -> encode -> json / orjson stages for one endpoint"""
+        return [
+            (scenario, "handler", handler(engine, call)),
+            (scenario, "validate", (lambda items: [schema.parse_obj(i) for i in items]) if schema else None),
+            (scenario, "encode", jsonable_encoder),
+            (scenario, "json", render_json),
+            (scenario, "orjson", orjson.dumps if orjson else None),
+        ]
+
+    stages = [
+        ("room_availability", "rows", rows(select(Room.__table__))),
+        ("room_availability", "hydrate", load(select(Room))),
+        ("room_availability", "validate", lambda rooms: [RoomOut.from_orm(r) for r in rooms]),
+        *served("room_availability", lambda session: rooms_router.get_room_availability(
+            school_id=school_id, session=session, _=None,
+        )),
+        *served("room_suggestions", lambda session: rooms_router.get_room_suggestions(
+            school_id=school_id, required_capacity=25, room_type="CLASSROOM", needs_projector=True,
+            needs_computers=False, needs_smartboard=False, needs_sink=False, session=session, _=None,
+        )),
+
+        ("list_users", "rows", rows(select(User.__table__).order_by(User.last_name, User.first_name))),
+        ("list_users", "hydrate", load(users_stmt)),
+        *served("list_users", read_models.list_users, UserOut),
+
+        ("list_students", "orm_path", lambda _: students_orm_path(engine)),
+        ("list_students", "fast_path", (lambda _: fast_path(engine, read_models.list_students)) if orjson else None),
+        ("list_classrooms", "orm_path", lambda _: classrooms_orm_path(engine)),
+        ("list_classrooms", "fast_path", (lambda _: fast_path(engine, read_models.list_classrooms)) if orjson else None),
+
+        *served("admin_overview", lambda session: dashboard.admin_overview(session=session, _=None)),
+        *served("teacher_overview", lambda session: dashboard.teacher_overview(
+            user=teacher, session=session, _=None, academic_year_id=None,
+        )),
+    ]
+    if parent is not None:
+        stages += served("parent_overview", lambda session: dashboard.parent_overview(
+            user=parent, session=session, _=None,
+        ))
+    return [(scenario, stage, fn) for scenario, stage, fn in stages if fn is not None]
+
+
+def run_size(size, repeat, seed):
+    engine, fixture = make_engine(size, seed)
+    results = {}
+    carried = {}  # scenario -> output fed to the next stage
+
+    for scenario, stage, fn in scenario_stages(engine, fixture):
+        output, timings = measure(lambda: fn(carried.get(scenario)), repeat)
+        # rows/validate are side branches and json/orjson are terminal: only
+        # hydrate (into validate) and handler -> encode feed forward
+        if stage in ("hydrate", "handler", "encode"):
+            carried[scenario] = output
+        results[f"{scenario}.{stage}.{size}"] = {
+            "best_ms": round(min(timings) * 1000, 3),
+            "median_ms": round(statistics.median(timings) * 1000, 3),
+            "per_row_us": round(min(timings) / size * 1e6, 3),
+        }
+        print(f"  {scenario:<18} {stage:<9} {size:>7} rows  best {min(timings) * 1000:>10.2f} ms")
+
+    for scenario in ("list_students", "list_classrooms"):
+        orm, fast = (results.get(f"{scenario}.{path}.{size}") for path in ("orm_path", "fast_path"))
+        if orm and fast:
+            print(f"  {scenario:<18} fast path is {orm['best_ms'] / fast['best_ms']:.1f}x faster end to end")
+
+    engine.dispose()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Keys whose best time regressed beyond threshold, as (key, baseline ms, current ms)"""
+    regressions = []
+    for key, current in results.items():
+        before = baseline.get(key)
+        if before and current["best_ms"] > before["best_ms"] * (1 + threshold):
+            regressions.append((key, before["best_ms"], current["best_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hydration, validation and JSON encoding stages")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage (best is compared)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-baseline", help="write results to this file")
+    parser.add_argument("--compare", help="compare against a baseline file written by --save-baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown before flagging (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("ℹ️  orjson not installed - skipping the orjson stage")
+
+    results = {}
+    for size in args.sizes:
+        print(f"📊 {size} rows")
+        results.update(run_size(size, args.repeat, args.seed))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2, sort_keys=True)
+        print(f"\n📝 Baseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than baseline by more than {args.threshold:.0%}:")
+            for key, before, after in regressions:
+                print(f"   {key}: {before:.2f} ms -> {after:.2f} ms ({after / before - 1:+.0%})")
+            sys.exit(1)
+        print(f"\n✅ No stage regressed by more than {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
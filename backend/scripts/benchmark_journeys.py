@@ -0,0 +1,253 @@
+# backend/scripts/benchmark_journeys.py
+
+"""
+User Journey Benchmark
+Drives realistic journeys against a running API loaded by
+scripts/generate_district.py and reports p50/p95/p99 latency and throughput.
+
+    uvicorn app.main:app --workers 4 &
+    python scripts/benchmark_journeys.py --concurrency 50 --iterations 500
+
+Journeys:
+    login_burst        many teachers logging in at once (bcrypt bound)
+    teacher_dashboard  /auth/context + teacher overview for a teacher
+    roster             classroom list for a grade + one classroom's detail
+    room_suggestions   room suggestions + availability for a school
+    attendance_burst   whole-section attendance submissions, as in the morning window
+
+The morning attendance target is p99 under 100 ms at 2,000 concurrent
+submissions:
+
+    python scripts/benchmark_journeys.py --journeys attendance_burst --concurrency 2000 --iterations 10000
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+# The dashboard router declares its own /dashboard prefix on top of main.py's
+TEACHER_OVERVIEW_PATH = "/dashboard/dashboard/teacher_overview"
+
+
+class Recorder:
+    """Latency samples and errors per request name"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def request(self, client, name, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.samples[name].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            return None
+        return response
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+async def login(client, recorder, email, password):
+    response = await recorder.request(
+        client, "POST /auth/login", "POST", "/auth/login",
+        data={"username": email, "password": password},
+    )
+    if response is None:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def login_burst(client, recorder, ctx, rng):
+    await login(client, recorder, rng.choice(ctx["teachers"]), ctx["password"])
+
+
+async def teacher_dashboard(client, recorder, ctx, rng):
+    headers = rng.choice(ctx["teacher_tokens"])
+    await recorder.request(client, "GET /auth/context", "GET", "/auth/context", headers=headers)
+    await recorder.request(client, "GET teacher_overview", "GET", TEACHER_OVERVIEW_PATH, headers=headers)
+
+
+async def roster(client, recorder, ctx, rng):
+    headers = ctx["admin_token"]
+    await recorder.request(
+        client, "GET /classrooms", "GET", "/classrooms",
+        params={"grade_level": rng.choice(ctx["grades"])}, headers=headers,
+    )
+    classroom_id = rng.choice(ctx["classrooms"])
+    await recorder.request(client, "GET /classrooms/{id}", "GET", f"/classrooms/{classroom_id}", headers=headers)
+
+
+async def room_suggestions(client, recorder, ctx, rng):
+    headers = ctx["admin_token"]
+    school_id = rng.choice(ctx["school_ids"])
+    await recorder.request(
+        client, "GET /rooms/suggestions", "GET", "/rooms/suggestions",
+        params={"school_id": school_id, "required_capacity": rng.choice((20, 25, 30))}, headers=headers,
+    )
+    await recorder.request(
+        client, "GET /rooms/availability", "GET", "/rooms/availability",
+        params={"school_id": school_id}, headers=headers,
+    )
+
+
+ATTENDANCE_STATUSES = ("PRESENT",) * 17 + ("ABSENT", "TARDY", "EXCUSED")
+
+
+async def attendance_burst(client, recorder, ctx, rng):
+    if not ctx["rosters"]:
+        return  # manifest predates rosters; regenerate the district
+    classroom_id = rng.choice(sorted(ctx["rosters"]))
+    records = [{"student_id": sid, "status": rng.choice(ATTENDANCE_STATUSES)} for sid in ctx["rosters"][classroom_id]]
+    await recorder.request(
+        client, "POST /attendance/sections", "POST", f"/attendance/sections/{classroom_id}",
+        json={"attendance_date": ctx["attendance_date"], "records": records}, headers=ctx["admin_token"],
+    )
+
+
+JOURNEYS = {
+    "login_burst": login_burst,
+    "teacher_dashboard": teacher_dashboard,
+    "roster": roster,
+    "room_suggestions": room_suggestions,
+    "attendance_burst": attendance_burst,
+}
+
+
+async def run_journey(client, ctx, journey, iterations, concurrency, seed):
+    recorder = Recorder()
+    rng = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await JOURNEYS[journey](client, recorder, ctx, rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(iterations)))
+    return recorder, time.perf_counter() - started
+
+
+def summarize(journey, recorder, wall):
+    rows = []
+    for name, samples in recorder.samples.items():
+        samples.sort()
+        rows.append({
+            "journey": journey,
+            "request": name,
+            "count": len(samples),
+            "errors": recorder.errors[name],
+            "p50_ms": round(percentile(samples, 50) * 1000, 1),
+            "p95_ms": round(percentile(samples, 95) * 1000, 1),
+            "p99_ms": round(percentile(samples, 99) * 1000, 1),
+            "rps": round(len(samples) / wall, 1),
+        })
+    return rows
+
+
+def print_table(rows):
+    header = f"{'journey':<18} {'request':<26} {'count':>7} {'err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['journey']:<18} {r['request']:<26} {r['count']:>7} {r['errors']:>5} "
+              f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} {r['rps']:>8}")
+
+
+def _attendance_date(manifest):
+    """Today, clamped into the generated academic year"""
+    start, end = manifest.get("academic_year_dates", (None, None))
+    today = date.today().isoformat()
+    if start and today < start:
+        return start
+    if end and today > end:
+        return end
+    return today
+
+
+async def prepare(client, manifest, teacher_logins):
+    """Log in once up front so journeys other than login_burst measure only their own requests"""
+    recorder = Recorder()
+    password = manifest["password"]
+    teachers = [email for school in manifest["schools"] for email in school["teachers"]]
+    admin_token = await login(client, recorder, manifest["admin_email"], password)
+    if admin_token is None:
+        return None
+
+    teacher_tokens = [
+        token for token in await asyncio.gather(*(
+            login(client, recorder, email, password) for email in teachers[:teacher_logins]
+        ))
+        if token
+    ]
+    return {
+        "password": password,
+        "teachers": teachers,
+        "admin_token": admin_token,
+        "teacher_tokens": teacher_tokens,
+        "school_ids": [school["id"] for school in manifest["schools"]],
+        "classrooms": [c for school in manifest["schools"] for c in school["classrooms"]],
+        "grades": ["K", "1", "2", "3", "4", "5", "6", "7", "8"],
+        "rosters": {c: r for school in manifest["schools"] for c, r in school.get("rosters", {}).items()},
+        "attendance_date": _attendance_date(manifest),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark user journeys against a running API")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--manifest", default="district_manifest.json")
+    parser.add_argument("--journeys", nargs="+", choices=sorted(JOURNEYS), default=list(JOURNEYS))
+    parser.add_argument("--iterations", type=int, default=200, help="journeys to run per journey type")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--teacher-logins", type=int, default=50, help="teacher sessions to spread dashboard load over")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        ctx = await prepare(client, manifest, args.teacher_logins)
+        if ctx is None:
+            print("❌ Admin login failed - is the API running against the generated district?")
+            sys.exit(1)
+
+        results = []
+        for journey in args.journeys:
+            print(f"🏃 {journey}: {args.iterations} runs at concurrency {args.concurrency}")
+            recorder, wall = await run_journey(client, ctx, journey, args.iterations, args.concurrency, args.seed)
+            results.extend(summarize(journey, recorder, wall))
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📝 Results written to {args.json}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
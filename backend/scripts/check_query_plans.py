@@ -0,0 +1,144 @@
+# backend/scripts/check_query_plans.py
+"""
+Query plan regression check.
+
+Runs EXPLAIN on the hot query shapes from auth, dashboard.py, classrooms.py
+and rooms.py against a seeded database and exits non-zero if any of them still
+needs a sequential scan on an indexed table.
+
+Seed data is small enough that Postgres would rightly prefer seq scans, so the
+plans are taken with enable_seqscan = off: a Seq Scan that survives that
+setting means no index can serve the query.
+
+This is a script rather than a test because the repo has no test suite to
+host it. It connects to the configured DATABASE_URL and exits 0 when every
+shape is indexed, 1 on a regression, 2 when the database isn't seeded and
+3 when it can't be reached, so CI can run it after migrations and treat
+3 as skipped.
+"""
+
+import asyncio
+import json
+import sys
+import os
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import select, text, func, and_
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects import postgresql
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.user_role import UserRole
+from app.models.classroom import Classroom
+from app.models.classroom_teacher_assignment import ClassroomTeacherAssignment
+from app.models.enrollment import Enrollment
+from app.models.room import Room
+from app.permissions import Permission, has_permission
+from app.config import get_settings
+
+WATCHED_TABLES = ("user_roles", "enrollments", "classrooms", "rooms", "classroom_teacher_assignments")
+
+
+def build_queries(sample):
+    """(label, statement) pairs mirroring the router queries"""
+    return [
+        ("auth roles for user", select(UserRole).where(
+            UserRole.user_id == sample["user_id"], UserRole.is_active == True
+        )),
+        ("dashboard.teacher_overview colleagues", select(UserRole.user_id).where(
+            UserRole.school_id.in_([sample["school_id"]]),
+            has_permission(UserRole.permissions, Permission.TEACHER),
+            UserRole.is_active == True,
+        )),
+        ("admin.list_teachers", select(UserRole.user_id).where(
+            has_permission(UserRole.permissions, Permission.TEACHER), UserRole.is_active == True
+        )),
+        ("classrooms.list_classrooms", select(Classroom).where(
+            Classroom.academic_year_id == sample["academic_year_id"],
+            Classroom.grade_level == sample["grade_level"],
+        )),
+        ("classrooms.list_classrooms enrollment counts", select(Enrollment.classroom_id, func.count()).where(
+            Enrollment.classroom_id.in_([sample["classroom_id"]]),
+            Enrollment.is_active == True,
+            Enrollment.academic_year_id == sample["academic_year_id"],
+        ).group_by(Enrollment.classroom_id)),
+        ("rooms in-use subquery", select(Classroom.room_id).where(
+            and_(Classroom.room_id.isnot(None), Classroom.is_active == True)
+        )),
+        ("rooms.create_room code check", select(Room).where(
+            Room.school_id == sample["school_id"],
+            Room.room_code == sample["room_code"],
+            Room.is_active == True,
+        )),
+        ("teacher classrooms", select(ClassroomTeacherAssignment.classroom_id).where(
+            ClassroomTeacherAssignment.teacher_user_id == sample["user_id"],
+            ClassroomTeacherAssignment.is_active == True,
+        )),
+    ]
+
+
+def seq_scans(plan):
+    """Yield relation names of Seq Scan nodes on watched tables (partitions included)"""
+    if plan.get("Node Type") == "Seq Scan":
+        relation = plan.get("Relation Name", "")
+        if any(relation == t or relation.startswith(f"{t}_") for t in WATCHED_TABLES):
+            yield relation
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+async def load_sample(session):
+    """Pick real ids from the seeded data so the planner sees realistic values"""
+    row = (await session.execute(text("""
+        SELECT ur.user_id, ur.school_id, c.academic_year_id, c.grade_level, c.id AS classroom_id,
+               (SELECT room_code FROM rooms WHERE school_id = ur.school_id LIMIT 1) AS room_code
+        FROM user_roles ur
+        CROSS JOIN LATERAL (SELECT * FROM classrooms WHERE academic_year_id IS NOT NULL LIMIT 1) c
+        WHERE ur.is_active
+        LIMIT 1
+    """))).mappings().first()
+    return dict(row) if row else None
+
+
+async def main():
+    engine = create_async_engine(get_settings().database_url, future=True)
+    Session = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    failures = []
+    async with Session() as session:
+        try:
+            sample = await load_sample(session)
+        except (OSError, DBAPIError) as e:
+            print(f"⚠️  Database unreachable, skipping: {e}")
+            await engine.dispose()
+            sys.exit(3)
+        if not sample:
+            print("❌ No seeded data found - run scripts/seed_phase_a_data.py first")
+            sys.exit(2)
+
+        for table in WATCHED_TABLES:
+            await session.execute(text(f"ANALYZE {table}"))
+        await session.execute(text("SET enable_seqscan = off"))
+
+        for label, stmt in build_queries(sample):
+            sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scans = sorted(set(seq_scans(plan[0]["Plan"])))
+            if scans:
+                failures.append(label)
+                print(f"❌ {label}: sequential scan on {', '.join(scans)}")
+            else:
+                print(f"✅ {label}")
+
+    await engine.dispose()
+
+    if failures:
+        print(f"\n{len(failures)} query shape(s) fell back to sequential scans")
+        sys.exit(1)
+    print("\nAll query shapes are served by indexes")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+# backend/scripts/reconcile_attendance.py
+"""
+Nightly Attendance Reconciliation
+Queues the attendance_reconcile job, which recomputes each student's
+attendance counters and rate from the raw records and fixes any that drifted.
+A job worker (the API process or scripts/run_job_worker.py) runs it. Run
+from cron after the school day:
+
+    0 2 * * *  cd /srv/sis/backend && python scripts/reconcile_attendance.py
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from app import job_handlers  # noqa: F401 - registers job handlers
+from app.db import get_sessionmaker, get_engine
+from app.jobs import enqueue, QUEUED, RUNNING
+from app.models.job import Job
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Queue a recount of attendance rollups")
+    parser.add_argument("--academic-year-id", help="year to reconcile (default: the active year)")
+    args = parser.parse_args()
+
+    params = {"academic_year_id": args.academic_year_id} if args.academic_year_id else {}
+    SessionLocal = get_sessionmaker()
+    async with SessionLocal() as session:
+        pending = (await session.execute(
+            select(Job.id).where(Job.kind == "attendance_reconcile", Job.status.in_((QUEUED, RUNNING))).limit(1)
+        )).scalar_one_or_none()
+        if pending:
+            print(f"⏭️  Reconciliation already pending (job {pending})")
+        else:
+            job = await enqueue(session, "attendance_reconcile", params)
+            await session.commit()
+            print(f"✅ Queued attendance reconciliation (job {job.id})")
+    await get_engine().dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
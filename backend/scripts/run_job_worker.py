@@ -0,0 +1,50 @@
+# backend/scripts/run_job_worker.py
+"""
+Background Job Worker
+Runs queued jobs (see app/jobs.py) outside the API process. Run any number of
+these alongside the API; they share the jobs table safely. Set
+JOB_RUNNER_IN_PROCESS=false on the API to leave all jobs to dedicated workers.
+
+    python scripts/run_job_worker.py --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import job_handlers  # noqa: F401 - registers job handlers
+from app.db import get_engine
+from app.jobs import JobRunner, HANDLERS
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run background jobs from the jobs table")
+    parser.add_argument("--concurrency", type=int, help="jobs to run at once (default: JOB_CONCURRENCY)")
+    parser.add_argument("--poll-interval", type=float, help="seconds between polls when idle")
+    parser.add_argument("--worker-id", help="name recorded on claimed jobs (default: host:pid)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    runner = JobRunner(concurrency=args.concurrency, poll_interval=args.poll_interval, worker_id=args.worker_id)
+    print(f"🔧 Worker {runner.worker_id} handling: {', '.join(sorted(HANDLERS))}")
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    runner.start()
+    await stop.wait()
+    print("🛑 Stopping - waiting for running jobs to finish")
+    await runner.stop()
+    await get_engine().dispose()
+    print("✅ Worker stopped")
+
+if __name__ == "__main__":
+    asyncio.run(main())